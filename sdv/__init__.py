@@ -8,9 +8,7 @@ __author__ = """MIT Data To AI Lab"""
 __email__ = 'dailabmit@gmail.com'
 __version__ = '0.4.1.dev0'
 
-from sdv.demo import get_available_demos, load_demo
-from sdv.metadata import Metadata
-from sdv.sdv import SDV
+import importlib
 
 __all__ = (
     'get_available_demos',
@@ -18,3 +16,25 @@ __all__ = (
     'Metadata',
     'SDV',
 )
+
+# The top-level symbols are imported on first access to keep ``import sdv`` fast.
+_LAZY_IMPORTS = {
+    'get_available_demos': 'sdv.demo',
+    'load_demo': 'sdv.demo',
+    'Metadata': 'sdv.metadata',
+    'SDV': 'sdv.sdv',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
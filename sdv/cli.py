@@ -0,0 +1,168 @@
+"""SDV Command Line Interface."""
+
+import argparse
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+DEFAULT_CHUNK_SIZE = 1000
+BLOCKS_PER_PROCESS = 4
+
+
+def _parse_model(value):
+    name, separator, path = value.partition('=')
+    if not separator or not name or not path:
+        raise argparse.ArgumentTypeError('Models must be given as `<name>=<path>`')
+
+    return name, path
+
+
+@contextmanager
+def _phase(name, timings):
+    start = time.time()
+    yield
+    timings[name] = time.time() - start
+    print('{}: {:.2f}s'.format(name, timings[name]))
+
+
+def _fit(args):
+    # Import here to keep the help fast
+    from sdv import SDV, Metadata
+
+    timings = dict()
+    with _phase('load', timings):
+        metadata = Metadata(args.metadata, args.root_path)
+        tables = metadata.load_tables()
+
+    with _phase('fit', timings):
+        sdv = SDV()
+        sdv.fit(metadata, tables, n_jobs=args.jobs)
+
+    with _phase('save', timings):
+        sdv.save(args.output, format=args.model_format)
+
+    return timings
+
+
+def _get_chunk_size(args):
+    if args.chunk_size is not None:
+        return args.chunk_size
+
+    if args.jobs is None:
+        return DEFAULT_CHUNK_SIZE
+
+    from sdv.sampler import Sampler
+    from sdv.utils import get_num_processes
+
+    # Give each process several blocks of every chunk to sample.
+    num_processes = get_num_processes(args.jobs)
+    return Sampler.RANDOM_BLOCK_SIZE * BLOCKS_PER_PROCESS * num_processes
+
+
+def _sample(args):
+    # Import here to keep the help fast
+    from sdv import SDV
+
+    timings = dict()
+    with _phase('load', timings):
+        sdv = SDV.load(args.model)
+
+    with _phase('sample', timings):
+        metadata_path = sdv.sample_to(
+            args.out, args.rows, format=args.format, chunk_size=_get_chunk_size(args),
+            random_state=args.random_state, n_jobs=args.jobs)
+
+    print('Sampled data written to {}'.format(metadata_path))
+    return timings
+
+
+def _serve(args):
+    # Import here to keep the help fast
+    from sdv.server import ModelServer, make_server
+
+    model_server = ModelServer.load(dict(args.models), batch_wait=args.batch_wait,
+                                    max_batch_rows=args.max_batch_rows)
+    server = make_server(model_server, args.host, args.port, args.socket)
+    address = args.socket or '{}:{}'.format(args.host, args.port)
+    print('Serving {} on {}'.format(', '.join(model_server.models), address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(description='SDV Command Line Interface')
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help='Be verbose. Use -vv for increased verbosity.')
+
+    subparsers = parser.add_subparsers(title='command', dest='command')
+    subparsers.required = True
+
+    fit = subparsers.add_parser('fit', help='Fit an SDV instance to a dataset and save it.')
+    fit.set_defaults(function=_fit)
+    fit.add_argument('metadata', help='Path to the metadata JSON file of the dataset.')
+    fit.add_argument('-o', '--output', required=True, help='Path where the model is saved.')
+    fit.add_argument('-r', '--root-path',
+                     help='Path to the dataset directory. Defaults to the metadata location.')
+    fit.add_argument('--model-format', choices=['pickle', 'compact'], default='pickle',
+                     help='Format in which the model is saved.')
+    fit.add_argument('-j', '--jobs', type=int,
+                     help='Number of processes to fit in. Use -1 for all the CPUs.')
+
+    sample = subparsers.add_parser('sample', help='Sample a dataset from a saved model.')
+    sample.set_defaults(function=_sample)
+    sample.add_argument('model', help='Path to the saved model.')
+    sample.add_argument('-o', '--out', required=True,
+                        help='Directory where the sampled tables are written.')
+    sample.add_argument('-n', '--rows', type=int,
+                        help='Number of rows of the tables without parents. '
+                        'Defaults to the size of the original tables.')
+    sample.add_argument('-c', '--chunk-size', type=int,
+                        help='Number of rows of the tables without parents sampled at a time. '
+                        'Defaults to {} rows, or to {} random blocks per process with '
+                        '--jobs.'.format(DEFAULT_CHUNK_SIZE, BLOCKS_PER_PROCESS))
+    sample.add_argument('-f', '--format', choices=['parquet', 'csv'], default='parquet',
+                        help='Format of the sampled tables.')
+    sample.add_argument('--random-state', type=int, help='Seed to sample reproducibly.')
+    sample.add_argument('-j', '--jobs', type=int,
+                        help='Number of processes to sample in. Use -1 for all the CPUs.')
+
+    serve = subparsers.add_parser('serve', help='Serve saved models over HTTP.')
+    serve.set_defaults(function=_serve)
+    serve.add_argument('models', nargs='+', type=_parse_model,
+                       help='Models to serve, as `<name>=<path>`.')
+    serve.add_argument('--host', default='127.0.0.1', help='Host to listen on.')
+    serve.add_argument('-p', '--port', type=int, default=8000, help='Port to listen on.')
+    serve.add_argument('-s', '--socket',
+                       help='Path of a Unix socket to listen on instead of a port.')
+    serve.add_argument('--batch-wait', type=float, default=0.01,
+                       help='Seconds to wait for more requests of a table before sampling.')
+    serve.add_argument('--max-batch-rows', type=int, default=10000,
+                       help='Maximum number of rows sampled in one batch.')
+
+    return parser
+
+
+def main(args=None):
+    """Run the SDV Command Line Interface.
+
+    Args:
+        args (list):
+            Command line arguments. Defaults to ``sys.argv[1:]``.
+    """
+    parser = _get_parser()
+    args = parser.parse_args(args)
+
+    log_level = (3 - min(args.verbose, 2)) * 10
+    logging.basicConfig(level=log_level, stream=sys.stderr,
+                        format='%(asctime)s %(name)s %(levelname)s %(message)s')
+
+    args.function(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,12 +3,9 @@
 import io
 import logging
 import os
-import urllib
-from zipfile import ZipFile
 
 import numpy as np
 import pandas as pd
-from faker import Faker
 
 from sdv.metadata import Metadata, Table
 
@@ -97,6 +94,10 @@ DATASETS_URL = 'https://sdv-datasets.s3.amazonaws.com/datasets.csv'
 
 
 def _download(dataset_name, data_path):
+    # Import here to keep ``import sdv`` fast
+    import urllib.request
+    from zipfile import ZipFile
+
     url = DATA_URL.format(dataset_name)
 
     LOGGER.info('Downloading dataset {} from {}'.format(dataset_name, url))
@@ -203,6 +204,9 @@ def load_demo(dataset_name=None, data_path=DATA_PATH, metadata=False):
 
 def _load_tabular_dummy():
     """Load a dummy tabular demo dataframe."""
+    # Import here to keep ``import sdv`` fast
+    from faker import Faker
+
     age = np.random.randint(30, 50, 12)
     age_when_joined = age - np.random.randint(0, 10, 12)
     faker = Faker()
@@ -1,7 +1,6 @@
 """Tools to evaluate the synthesized data."""
 
 import pandas as pd
-import sdmetrics
 
 from sdv.metadata import Metadata
 
@@ -97,6 +96,9 @@ def evaluate(synth, real=None, metadata=None, root_path=None, table_name=None, g
     Return:
         float or sdmetrics.MetricsReport
     """
+    # Import here to keep ``import sdv`` fast
+    import sdmetrics
+
     synth, real, metadata = _validate_arguments(synth, real, metadata, root_path, table_name)
 
     report = sdmetrics.evaluate(metadata, real, synth)
@@ -0,0 +1,283 @@
+"""Generators of primary key values.
+
+The generators produce the keys of a table as a deterministic sequence, so every
+call to ``generate`` continues where the previous one stopped and the keys are
+unique across calls. String keys follow the same sequence as ``exrex.generate``,
+but the regular expressions built only from literals, character classes and
+repetitions of a single character are generated with ``numpy`` operations,
+without iterating over the values one by one.
+"""
+
+import itertools
+
+import exrex
+import numpy as np
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+REPEAT_LIMIT = 20
+MAX_INDEX = np.iinfo(np.int64).max
+
+
+class IntegerKeyGenerator:
+    """Generate consecutive integers starting at ``0``."""
+
+    count = np.inf
+
+    def __init__(self):
+        self.offset = 0
+
+    def generate(self, num_rows):
+        """Generate the next ``num_rows`` keys.
+
+        Args:
+            num_rows (int):
+                Number of keys to generate.
+
+        Returns:
+            numpy.ndarray:
+                Generated keys.
+        """
+        values = np.arange(self.offset, self.offset + num_rows)
+        self.offset += num_rows
+        return values
+
+
+class ExrexKeyGenerator:
+    """Generate the strings that match a regular expression using ``exrex``.
+
+    Args:
+        regex (str):
+            Regular expression that the keys must match.
+    """
+
+    def __init__(self, regex):
+        self.regex = regex
+        self.count = exrex.count(regex)
+        self.offset = 0
+        self._generator = exrex.generate(regex)
+
+    def generate(self, num_rows):
+        """Generate the next ``num_rows`` keys.
+
+        Args:
+            num_rows (int):
+                Number of keys to generate.
+
+        Returns:
+            numpy.ndarray:
+                Generated keys.
+        """
+        values = list(itertools.islice(self._generator, num_rows))
+        self.offset += num_rows
+        return np.array(values, dtype=object)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_generator']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._generator = itertools.islice(exrex.generate(self.regex), self.offset, None)
+
+
+def _get_characters(item):
+    """Get the characters matched by a single character expression, in ``exrex`` order.
+
+    Returns ``None`` if the expression does not match a single character.
+    """
+    operator, value = item
+    if operator == sre_parse.LITERAL:
+        return [chr(value)]
+
+    if operator == sre_parse.CATEGORY:
+        return exrex.CATEGORIES.get(value)
+
+    if operator == sre_parse.ANY:
+        return exrex.CATEGORIES['category_any']
+
+    if operator == sre_parse.IN:
+        characters = list()
+        for sub_operator, sub_value in value:
+            if sub_operator == sre_parse.LITERAL:
+                characters.append(chr(sub_value))
+            elif sub_operator == sre_parse.RANGE:
+                characters.extend(chr(code) for code in range(sub_value[0], sub_value[1] + 1))
+            elif sub_operator == sre_parse.CATEGORY and sub_value in exrex.CATEGORIES:
+                characters.extend(exrex.CATEGORIES[sub_value])
+            else:
+                return None
+
+        return characters
+
+    return None
+
+
+def _parse(regex):
+    """Split a regular expression in blocks of repeated characters.
+
+    Each block is a tuple with the list of characters and the list of lengths
+    that it can take. Returns ``None`` if the expression has any other shape.
+    """
+    blocks = list()
+    for operator, value in sre_parse.parse(regex):
+        if operator == sre_parse.AT:
+            continue
+
+        if operator in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            minimum, maximum, items = value
+            if len(items) != 1:
+                return None
+
+            characters = _get_characters(items[0])
+            if maximum + 1 - minimum >= REPEAT_LIMIT:
+                lengths = range(minimum, minimum + REPEAT_LIMIT)
+            else:
+                lengths = range(minimum, maximum + 1)
+
+        else:
+            characters = _get_characters((operator, value))
+            lengths = range(1, 2)
+
+        if not characters:
+            return None
+
+        blocks.append((np.array([ord(character) for character in characters]), list(lengths)))
+
+    return blocks
+
+
+def _get_digits(values, stride, size):
+    """Compute ``values // stride % size`` for ``stride`` and ``size`` of any size."""
+    if stride > MAX_INDEX:
+        return np.zeros(len(values), dtype=np.int64)
+
+    values = values // stride
+    if size > MAX_INDEX:
+        return values
+
+    return values % size
+
+
+class RegexKeyGenerator:
+    """Generate the strings that match a simple regular expression using ``numpy``.
+
+    The expression must be a sequence of literals, character classes and repetitions
+    of a literal or character class, like ``ID_[0-9]{6}`` or ``[a-zA-Z]+``. The
+    strings are generated in the same order as ``exrex.generate``, so the key of
+    each position is computed directly from the position in mixed radix.
+
+    Args:
+        regex (str):
+            Regular expression that the keys must match.
+
+    Raises:
+        ValueError:
+            If the regular expression is not supported.
+    """
+
+    def __init__(self, regex):
+        blocks = _parse(regex)
+        if blocks is None:
+            raise ValueError('Unsupported regular expression `{}`'.format(regex))
+
+        self.regex = regex
+        self.offset = 0
+        self._blocks = list()
+        for characters, lengths in blocks:
+            counts = [len(characters) ** length for length in lengths]
+            self._blocks.append((characters, lengths, counts, sum(counts)))
+
+        self.count = 1
+        for block in self._blocks:
+            self.count *= block[3]
+
+        self._width = sum(block[1][-1] for block in self._blocks)
+
+    @staticmethod
+    def _fill_characters(codes, cursor, positions, characters, length, rows=None):
+        """Write the characters of ``length`` characters long values of one block."""
+        size = len(characters)
+        for character in reversed(range(length)):
+            if size == 1:
+                values = characters[0]
+            else:
+                positions, digits = np.divmod(positions, size)
+                values = characters[digits]
+
+            if rows is None:
+                codes[:, cursor + character] = values
+            else:
+                codes[rows, cursor + character] = values
+
+    def _fill_block(self, codes, cursor, positions, characters, lengths, counts):
+        """Write the characters of one block and return the cursor after it.
+
+        While all the previous blocks have a fixed length the cursor is an integer
+        and whole columns are written at once. Blocks with several possible lengths
+        are written separately for the rows of each length.
+        """
+        if len(lengths) == 1 and not isinstance(cursor, np.ndarray):
+            self._fill_characters(codes, cursor, positions, characters, lengths[0])
+            return cursor + lengths[0]
+
+        starts = np.array([min(sum(counts[:index]), MAX_INDEX) for index in range(len(counts))])
+        length_index = np.searchsorted(starts, positions, side='right') - 1
+        positions = positions - starts[length_index]
+        block_lengths = np.asarray(lengths)[length_index]
+
+        rows = np.arange(len(codes))
+        for length in np.unique(block_lengths):
+            selected = block_lengths == length
+            selected_cursor = cursor[selected] if isinstance(cursor, np.ndarray) else cursor
+            self._fill_characters(codes, selected_cursor, positions[selected], characters,
+                                  length, rows[selected])
+
+        return cursor + block_lengths
+
+    def generate(self, num_rows):
+        """Generate the next ``num_rows`` keys.
+
+        Args:
+            num_rows (int):
+                Number of keys to generate.
+
+        Returns:
+            numpy.ndarray:
+                Generated keys.
+        """
+        values = np.arange(self.offset, self.offset + num_rows, dtype=np.int64)
+        self.offset += num_rows
+
+        codes = np.zeros((num_rows, max(self._width, 1)), dtype=np.uint32)
+        cursor = 0
+        stride = self.count
+        for characters, lengths, counts, size in self._blocks:
+            stride //= size
+            positions = _get_digits(values, stride, size)
+            cursor = self._fill_block(codes, cursor, positions, characters, lengths, counts)
+
+        strings = codes.view('<U{}'.format(codes.shape[1])).ravel()
+        return strings.astype(object)
+
+
+def get_string_key_generator(regex):
+    """Get the fastest generator that supports the given regular expression.
+
+    Args:
+        regex (str):
+            Regular expression that the keys must match.
+
+    Returns:
+        RegexKeyGenerator or ExrexKeyGenerator:
+            ``RegexKeyGenerator`` if the expression is supported by it,
+            ``ExrexKeyGenerator`` otherwise.
+    """
+    try:
+        return RegexKeyGenerator(regex)
+    except ValueError:
+        return ExrexKeyGenerator(regex)
@@ -1,6 +1,7 @@
 """Metadata class."""
 
 import copy
+import importlib
 import json
 import logging
 import os
@@ -10,7 +11,6 @@ import numpy as np
 import pandas as pd
 from rdt import HyperTransformer, transformers
 
-from sdv.metadata import visualization
 from sdv.metadata.errors import MetadataError
 from sdv.metadata.table import Table
 
@@ -24,6 +24,14 @@ __all__ = [
 LOGGER = logging.getLogger(__name__)
 
 
+def __getattr__(name):
+    # ``visualization`` imports ``graphviz``, so it is only imported when used.
+    if name == 'visualization':
+        return importlib.import_module('sdv.metadata.visualization')
+
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
 def _read_csv_dtypes(table_meta):
     """Get the dtypes specification that needs to be passed to read_csv."""
     dtypes = dict()
@@ -63,6 +71,15 @@ def _load_csv(root_path, table_meta):
     return data
 
 
+def _load_parquet(root_path, table_meta):
+    """Load a Parquet file and then parse the columns."""
+    relative_path = os.path.join(root_path, table_meta['path'])
+    data = pd.read_parquet(relative_path)
+    data = _parse_dtypes(data, table_meta)
+
+    return data
+
+
 class Metadata:
     """Dataset Metadata.
 
@@ -350,6 +367,9 @@ class Metadata:
         """
         LOGGER.info('Loading table %s', table_name)
         table_meta = self.get_table_meta(table_name)
+        if table_meta.get('path', '').endswith('.parquet'):
+            return _load_parquet(self.root_path, table_meta)
+
         return _load_csv(self.root_path, table_meta)
 
     def load_tables(self, tables=None):
@@ -1011,4 +1031,6 @@ class Metadata:
                 just return the ``graphviz.Digraph`` object.
                 Defaults to ``None``.
         """
+        from sdv.metadata import visualization
+
         return visualization.visualize(self, path)
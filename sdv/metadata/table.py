@@ -3,11 +3,11 @@
 import copy
 import json
 import logging
+import re
 
 import numpy as np
 import pandas as pd
 import rdt
-from faker import Faker
 
 from sdv.constraints.base import Constraint
 from sdv.metadata.errors import MetadataError
@@ -145,6 +145,9 @@ class Table:
         else:
             args = tuple()
 
+        # Import here to keep ``import sdv`` fast
+        from faker import Faker
+
         try:
             faker_method = getattr(Faker(), category)
 
@@ -458,23 +461,144 @@ class Table:
 
         return self._hyper_transformer.transform(data)
 
-    def reverse_transform(self, data):
+    def transform_conditions(self, conditions):
+        """Transform the values of some fields on their own.
+
+        This is only possible when none of the constraints transforms the data,
+        since those can combine several fields into each modeled column.
+
+        Args:
+            conditions (dict):
+                Dictionary with field names as keys and their values.
+
+        Returns:
+            dict or None:
+                Dictionary with the transformed column names as keys and their values,
+                or ``None`` if the given fields cannot be transformed on their own.
+
+        Raises:
+            ValueError:
+                If a value cannot be transformed, such as a category that was
+                not seen during ``fit``.
+        """
+        for constraint in self._constraints:
+            if constraint.transform != constraint._identity:
+                return None
+
+        transformers = self._hyper_transformer._transformers
+        transformed = dict()
+        for name, value in conditions.items():
+            transformer = transformers.get(name)
+            if transformer is None:
+                return None
+
+            error = 'Invalid value {!r} for field {!r} in conditions'.format(value, name)
+            try:
+                values = np.asarray(transformer.transform(pd.Series([value])))
+            except (KeyError, ValueError) as transform_error:
+                raise ValueError(error) from transform_error
+
+            if pd.isnull(values).any():
+                raise ValueError(error)
+
+            if values.ndim == 2:
+                for index, column_value in enumerate(values[0]):
+                    transformed['{}#{}'.format(name, index)] = column_value
+            else:
+                transformed[name] = values[0]
+
+        return transformed
+
+    def get_required_fields(self, field_names):
+        """Get the fields needed to sample the given fields and validate them.
+
+        The constraints can depend on and combine any fields of the table,
+        so if there are constraints all the fields are needed.
+
+        Args:
+            field_names (set[str]):
+                Names of the fields to sample.
+
+        Returns:
+            list[str]:
+                Names of the fields, in the order of the table.
+        """
+        if self._constraints:
+            return list(self._field_names)
+
+        return [name for name in self._field_names if name in field_names]
+
+    @staticmethod
+    def get_field_columns(columns, field_names):
+        """Select the transformed columns that encode the given fields.
+
+        The transformers that output several columns name them ``<field>#<index>``.
+
+        Args:
+            columns (list[str]):
+                Names of the transformed columns.
+            field_names (list[str]):
+                Names of the fields.
+
+        Returns:
+            list[str]:
+                Names of the matching columns, in their original order.
+        """
+        patterns = [
+            re.compile(r'{}(#[0-9]+)?$'.format(re.escape(name)))
+            for name in field_names
+        ]
+        return [
+            column for column in columns
+            if any(pattern.match(column) for pattern in patterns)
+        ]
+
+    def _reverse_transform_fields(self, data, field_names):
+        transformers = self._hyper_transformer._transformers
+        reversed_data = pd.DataFrame(index=data.index)
+        for name in field_names:
+            transformer = transformers.get(name)
+            if transformer is not None:
+                columns = self.get_field_columns(data.columns, [name])
+                if len(columns) == 1:
+                    values = data[columns[0]].to_numpy()
+                else:
+                    values = data[columns].to_numpy()
+
+                reversed_data[name] = transformer.reverse_transform(values)
+
+        return reversed_data
+
+    def reverse_transform(self, data, field_names=None):
         """Reverse the transformed data to the original format.
 
         Args:
             data (pandas.DataFrame):
                 Data to be reverse transformed.
+            field_names (list[str]):
+                Names of the fields to reverse transform. Only the transformers of these
+                fields are used, unless there are constraints. If ``None``, reverse
+                transform all the fields. Defaults to ``None``.
 
         Returns:
             pandas.DataFrame
         """
-        reversed_data = self._hyper_transformer.reverse_transform(data)
+        if field_names is None or self._constraints:
+            reversed_data = self._hyper_transformer.reverse_transform(data)
+            for constraint in self._constraints:
+                reversed_data = constraint.reverse_transform(reversed_data)
 
-        for constraint in self._constraints:
-            reversed_data = constraint.reverse_transform(reversed_data)
+        else:
+            reversed_data = self._reverse_transform_fields(data, field_names)
+
+        if field_names is None:
+            field_names = self._field_names
 
         fields = self._fields_metadata
         for name, dtype in self.get_dtypes(ids=True).items():
+            if name not in field_names:
+                continue
+
             field_type = fields[name]['type']
             if field_type == 'id':
                 field_data = pd.Series(np.arange(len(reversed_data)))
@@ -483,7 +607,7 @@ class Table:
 
             reversed_data[name] = field_data.dropna().astype(dtype)
 
-        return reversed_data[self._field_names]
+        return reversed_data[field_names]
 
     def filter_valid(self, data):
         """Filter the data using the constraints and return only the valid rows.
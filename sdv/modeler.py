@@ -1,13 +1,107 @@
 """SDV Modeler."""
 
+import contextlib
 import logging
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+import numpy as np
 import pandas as pd
 
 from sdv.models.copulas import GaussianCopula
+from sdv.models.statistics import GroupedStatistics
+from sdv.utils import get_num_processes, get_pool_context
 
 LOGGER = logging.getLogger(__name__)
 
+_WORKER_STATE = dict()
+
+
+def _fit_extension_rows(child_table, start, stops, model, model_kwargs):
+    """Fit one model to each contiguous block of rows of the child table.
+
+    Args:
+        child_table (pandas.DataFrame):
+            Child table rows sorted by foreign key.
+        start (int):
+            Position of the first row of the first block.
+        stops (list[int]):
+            Position after the last row of each block.
+        model (type):
+            Class of model to use.
+        model_kwargs (dict):
+            Keyword arguments to pass to the model.
+
+    Returns:
+        list[tuple]:
+            Names and values of the flatten parameters of each block, including
+            the number of rows.
+    """
+    extension_rows = list()
+    for stop in stops:
+        child_rows = child_table.iloc[start:stop].copy()
+        model_instance = model(**model_kwargs)
+        model_instance.fit(child_rows)
+        if isinstance(model_instance, GaussianCopula):
+            names = model_instance.get_parameter_names()
+            values = model_instance.get_parameter_vector().tolist()
+        else:
+            parameters = model_instance.get_parameters()
+            names = tuple(parameters)
+            values = list(parameters.values())
+
+        extension_rows.append((names + ('child_rows', ), values + [stop - start]))
+        start = stop
+
+    return extension_rows
+
+
+def _initialize_worker(child_table, model, model_kwargs):
+    """Keep the child table in the worker process so it is shipped only once."""
+    _WORKER_STATE['child_table'] = child_table
+    _WORKER_STATE['model'] = model
+    _WORKER_STATE['model_kwargs'] = model_kwargs
+
+
+def _fit_extension_chunk(bounds):
+    """Fit the models of a chunk of foreign key values inside a worker process."""
+    start, stops = bounds
+    return _fit_extension_rows(
+        _WORKER_STATE['child_table'],
+        start,
+        stops,
+        _WORKER_STATE['model'],
+        _WORKER_STATE['model_kwargs']
+    )
+
+
+class MemoryStats:
+    """Memory allocated while modeling a dataset.
+
+    The memory is measured with ``tracemalloc``, so only the memory allocated
+    through Python, which includes the ``numpy`` arrays, is accounted for.
+
+    Attributes:
+        peak_memory (dict):
+            Peak memory allocated while modeling each table, including its children,
+            in bytes.
+        total_peak_memory (int):
+            Peak memory allocated while modeling the whole dataset, in bytes.
+    """
+
+    def __init__(self):
+        self.peak_memory = dict()
+        self.total_peak_memory = 0
+        self._peaks = list()
+
+    def __repr__(self):
+        tables = ', '.join(
+            '{}={:.1f}MB'.format(table_name, peak / 2 ** 20)
+            for table_name, peak in self.peak_memory.items()
+        )
+        return 'MemoryStats(total_peak_memory={:.1f}MB, {})'.format(
+            self.total_peak_memory / 2 ** 20, tables)
+
 
 class Modeler:
     """Modeler class.
@@ -22,14 +116,63 @@ class Modeler:
             Class of model to use. Defaults to ``sdv.models.copulas.GaussianCopula``.
         model_kwargs (dict):
             Keyword arguments to pass to the model. Defaults to ``None``.
+        n_jobs (int):
+            Number of workers to use. Independent subtrees of the dataset are
+            modeled concurrently in this number of threads, and the models of the
+            different foreign key values are fitted in a single pool of this number
+            of processes, shared by all the threads, when they cannot be fitted in
+            a single vectorized pass.
+            If ``-1``, use all the available CPUs. Defaults to ``None``, which
+            models everything sequentially in the current process.
+        incremental (bool):
+            Whether to keep the sufficient statistics of the tables while modeling
+            them, so the models can later be updated with new rows using ``update``.
+            Only supported for ``GaussianCopula`` models with ``GaussianUnivariate``
+            marginals. Defaults to ``False``.
+        low_memory (bool):
+            Whether to reduce each child table to the extensions of its parents as soon
+            as it is modeled, instead of keeping the whole child table until its parents
+            are modeled, and to track the peak memory allocated while modeling each table
+            in ``memory_stats``. Defaults to ``False``.
+
+    Raises:
+        ValueError:
+            If ``incremental`` is ``True`` and the model does not support it.
     """
 
-    def __init__(self, metadata, model=GaussianCopula, model_kwargs=None):
+    incremental = False
+    low_memory = False
+    _pool = None
+
+    def __init__(self, metadata, model=GaussianCopula, model_kwargs=None, n_jobs=None,
+                 incremental=False, low_memory=False):
         self.models = dict()
         self.metadata = metadata
         self.model = model
         self.model_kwargs = dict() if model_kwargs is None else model_kwargs
         self.table_sizes = dict()
+        self.n_jobs = n_jobs
+        self.incremental = incremental
+        self.low_memory = low_memory
+        self.memory_stats = MemoryStats()
+        self.statistics = dict()
+        self.extension_statistics = dict()
+        self._transformed = dict()
+
+        if incremental:
+            model_instance = self.model(**self.model_kwargs)
+            if not (isinstance(model_instance, GaussianCopula) and model_instance.is_gaussian()):
+                raise ValueError('Incremental modeling requires a GaussianCopula model '
+                                 'with GaussianUnivariate marginals')
+
+    def _get_num_processes(self):
+        """Get the number of processes to use based on ``n_jobs``."""
+        return get_num_processes(self.n_jobs)
+
+    @staticmethod
+    def _fits_grouped(model):
+        """Whether the models of all the foreign key values can be fitted at once."""
+        return isinstance(model, GaussianCopula) and model.is_gaussian()
 
     def _get_extension(self, child_name, child_table, foreign_key):
         """Generate list of extension for child tables.
@@ -41,6 +184,9 @@ class Modeler:
         The values for a given index are generated by flattening a model fitted with
         the related data to that index in the children table.
 
+        If the model supports it, the models of all the indexes are fitted at once
+        in a single vectorized pass using ``get_grouped_parameters``.
+
         Args:
             parent (str):
                 Name of the parent table.
@@ -52,90 +198,547 @@ class Modeler:
         Returns:
             pandas.DataFrame
         """
-        extension_rows = list()
-        foreign_key_values = child_table[foreign_key].unique()
-        child_table = child_table.set_index(foreign_key)
         child_primary = self.metadata.get_primary_key(child_name)
+        model = self.model(**self.model_kwargs)
+        if self._fits_grouped(model):
+            fields = [
+                column for column in child_table.columns
+                if column not in (foreign_key, child_primary)
+            ]
+            foreign_key_values = child_table[foreign_key]
+            extension = model.get_grouped_parameters(child_table[fields], foreign_key_values)
+            extension['child_rows'] = foreign_key_values.value_counts()
+            extension.columns = '__' + child_name + '__' + extension.columns
+            return extension
+
+        codes, foreign_key_values = pd.factorize(child_table[foreign_key])
+        order = np.argsort(codes, kind='mergesort')
+        drop = [column for column in (foreign_key, child_primary) if column in child_table]
+        child_table = child_table.iloc[order].drop(drop, axis=1)
+        stops = np.cumsum(np.bincount(codes)).tolist()
+
+        num_processes = min(self._get_num_processes(), len(stops))
+        if num_processes > 1:
+            chunks = np.array_split(np.arange(len(stops)), num_processes * 4)
+            bounds = [
+                (stops[chunk[0] - 1] if chunk[0] else 0, stops[chunk[0]:chunk[-1] + 1])
+                for chunk in chunks if len(chunk)
+            ]
+            if self._pool is not None:
+                # Ship to the shared pool only the rows of each chunk.
+                arguments = [
+                    (child_table.iloc[start:stops[-1]], 0, [stop - start for stop in stops],
+                     self.model, self.model_kwargs)
+                    for start, stops in bounds
+                ]
+                chunk_rows = self._pool.starmap(_fit_extension_rows, arguments)
+            else:
+                initargs = (child_table, self.model, self.model_kwargs)
+                context = get_pool_context()
+                with context.Pool(num_processes, _initialize_worker, initargs) as pool:
+                    chunk_rows = pool.map(_fit_extension_chunk, bounds)
+
+            extension_rows = [row for rows in chunk_rows for row in rows]
+        else:
+            extension_rows = _fit_extension_rows(
+                child_table, 0, stops, self.model, self.model_kwargs)
+
+        names = extension_rows[0][0] if extension_rows else ()
+        if all(row_names == names for row_names, _ in extension_rows):
+            extension = pd.DataFrame(
+                [row_values for _, row_values in extension_rows],
+                index=foreign_key_values,
+                columns=list(names)
+            )
+        else:
+            # The univariates chosen for each block have different parameters.
+            extension = pd.DataFrame(
+                [dict(zip(row_names, row_values)) for row_names, row_values in extension_rows],
+                index=foreign_key_values
+            )
 
-        for foreign_key_value in foreign_key_values:
-            child_rows = child_table.loc[[foreign_key_value]]
-            if child_primary in child_rows.columns:
-                del child_rows[child_primary]
+        extension.columns = '__' + child_name + '__' + extension.columns
+        return extension
 
-            num_child_rows = len(child_rows)
+    def _get_child_extension(self, table_name, child_name, tables, extended_children):
+        """Model a child of the table and get its extension.
 
-            model = self.model(**self.model_kwargs)
-            model.fit(child_rows)
-            row = model.get_parameters()
-            row['child_rows'] = num_child_rows
+        Args:
+            table_name (str):
+                Name of the parent table.
+            child_name (str):
+                Name of the child table.
+            tables (dict):
+                Dict of original tables.
+            extended_children (dict):
+                Results of ``cpa`` for the children of the table, or ``None`` to model
+                the child recursively.
 
-            row = pd.Series(row)
-            row.index = '__' + child_name + '__' + row.index
-            extension_rows.append(row)
+        Returns:
+            pandas.DataFrame:
+                Extension of the child, indexed by the foreign key values.
+        """
+        child_key = self.metadata.get_foreign_key(table_name, child_name)
+        if extended_children is None:
+            child_table = self.cpa(child_name, tables, child_key)
+        else:
+            child_table = extended_children[child_name]
 
-        return pd.DataFrame(extension_rows, index=foreign_key_values)
+        if self.low_memory:
+            # The child has already been reduced to its extensions.
+            return child_table[child_key]
 
-    def cpa(self, table_name, tables, foreign_key=None):
+        if extended_children is not None:
+            child_table = self._get_child_table(table_name, child_name, child_table)
+
+        return self._get_extension(child_name, child_table, child_key)
+
+    def cpa(self, table_name, tables, foreign_key=None, extended_children=None):
         """Run the CPA algorithm over the indicated table and its children.
 
+        The children are modeled before the table is loaded and transformed, so
+        only the extensions of the children are kept in memory at the same time
+        as the table, and all of them are added to the table in a single step.
+
         Args:
             table_name (str):
                 Name of the table to model.
             tables (dict):
                 Dict of original tables.
-            foreign_key (str):
-                Name of the foreign key that references this table. Used only when applying
+            foreign_key (str or list[str]):
+                Name of the foreign key that references this table, or list of names
+                if it references more than one parent. Used only when applying
                 CPA on a child table.
+            extended_children (dict):
+                Optional. Results of ``cpa`` for the children of this table,
+                including the foreign keys to all their parents. If not given,
+                the children are modeled recursively.
 
         Returns:
-            pandas.DataFrame:
+            pandas.DataFrame or dict:
                 table data with the extensions created while modeling its children.
+                In ``low_memory`` mode, the table is reduced to its extension for
+                each of the given foreign keys instead, and a dict with the foreign
+                key names as keys and the extensions as values is returned.
         """
         LOGGER.info('Modeling %s', table_name)
 
-        if tables:
-            table = tables[table_name]
-        else:
-            table = self.metadata.load_table(table_name)
+        with self._track_memory(table_name):
+            primary_key = self.metadata.get_primary_key(table_name)
+            extensions = list()
+            if primary_key:
+                for child_name in self.metadata.get_children(table_name):
+                    extension = self._get_child_extension(
+                        table_name, child_name, tables, extended_children)
+                    extensions.append((child_name, extension))
+
+            if tables:
+                table = tables[table_name]
+            else:
+                table = self.metadata.load_table(table_name)
+
+            self.table_sizes[table_name] = len(table)
 
-        self.table_sizes[table_name] = len(table)
+            extended = self.metadata.transform(table_name, table)
+            transformed_columns = list(extended.columns)
 
-        extended = self.metadata.transform(table_name, table)
+            if primary_key:
+                extended.index = table[primary_key]
+                if extensions:
+                    extended = self._extend_table(extended, extensions)
+                    del extensions
 
+            if self.incremental:
+                self._collect_statistics(table_name, extended, table)
+                if self.metadata.get_children(table_name):
+                    transformed = extended[transformed_columns].copy()
+                    for key in self._get_foreign_keys(table_name):
+                        transformed[key] = table[key].values
+
+                    self._transformed[table_name] = transformed
+
+            model = self.model(**self.model_kwargs)
+            model.fit(extended)
+            self.models[table_name] = model
+
+            foreign_keys = [foreign_key] if isinstance(foreign_key, str) else foreign_key or []
+            if self.low_memory and foreign_keys:
+                return self._reduce_table(table_name, extended, table, foreign_keys)
+
+            if primary_key:
+                extended.reset_index(inplace=True)
+
+            for key in foreign_keys:
+                extended[key] = table[key]
+
+            return extended
+
+    @staticmethod
+    def _extend_table(extended, extensions):
+        """Add the extensions of the children to the table.
+
+        The extensions are aligned to the table rows and concatenated all at once,
+        so the table is copied only once regardless of the number of children.
+        """
+        aligned = [extended]
+        for child_name, extension in extensions:
+            extension = extension.reindex(extended.index)
+            child_rows = '__' + child_name + '__child_rows'
+            extension[child_rows] = extension[child_rows].fillna(0)
+            aligned.append(extension)
+
+        return pd.concat(aligned, axis=1)
+
+    def _reduce_table(self, table_name, extended, table, foreign_keys):
+        """Reduce a modeled child table to its extension for each of its parents.
+
+        Args:
+            table_name (str):
+                Name of the table.
+            extended (pandas.DataFrame):
+                Extended table. It is released as soon as the extensions are built.
+            table (pandas.DataFrame):
+                Original table, which contains the foreign keys.
+            foreign_keys (list[str]):
+                Foreign keys for which to build the extensions.
+
+        Returns:
+            dict:
+                Extension of the table for each foreign key.
+        """
+        extended.reset_index(drop=True, inplace=True)
+        extensions = dict()
+        for key in foreign_keys:
+            extended[key] = table[key].values
+            extensions[key] = self._get_extension(table_name, extended, key)
+            del extended[key]
+
+        return extensions
+
+    @contextlib.contextmanager
+    def _track_memory(self, table_name):
+        """Record the peak memory allocated while modeling the table and its children.
+
+        The memory is only tracked if ``tracemalloc`` is tracing. The peak of each
+        table can only be isolated if ``tracemalloc.reset_peak`` is available and
+        the tables are modeled sequentially, so otherwise only the overall peak
+        since modeling started is recorded.
+        """
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        isolate = hasattr(tracemalloc, 'reset_peak') and self._get_num_processes() == 1
+        peaks = self.memory_stats._peaks
+        if isolate:
+            if peaks:
+                peaks[-1] = max(peaks[-1], tracemalloc.get_traced_memory()[1])
+
+            tracemalloc.reset_peak()
+
+        peaks.append(0)
+        try:
+            yield
+        finally:
+            peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if isolate and peaks:
+                peaks[-1] = max(peaks[-1], peak)
+
+            self.memory_stats.peak_memory[table_name] = peak
+            self.memory_stats.total_peak_memory = max(self.memory_stats.total_peak_memory, peak)
+
+    def _get_blocks(self, table_name, columns):
+        """Get the block of each column of an extended table.
+
+        The transformed columns and the number of child rows are always observed,
+        so they go to block ``0``, while the extension columns of each child are
+        missing together in the rows without children, so each child gets its own block.
+        """
+        prefixes = [
+            '__' + child_name + '__'
+            for child_name in sorted(self.metadata.get_children(table_name))
+        ]
+        blocks = list()
+        for column in columns:
+            block = 0
+            for position, prefix in enumerate(prefixes):
+                if column.startswith(prefix) and column != prefix + 'child_rows':
+                    block = position + 1
+
+            blocks.append(block)
+
+        return blocks
+
+    def _collect_statistics(self, table_name, extended, table):
+        """Compute the sufficient statistics of an extended table.
+
+        The statistics of the whole table are used to rebuild its model, and the
+        statistics of its rows grouped by each foreign key are used to rebuild the
+        extensions of its parents.
+
+        Args:
+            table_name (str):
+                Name of the table.
+            extended (pandas.DataFrame):
+                Extended table, before imputing its missing values.
+            table (pandas.DataFrame):
+                Table that contains the foreign keys of the rows of ``extended``.
+        """
+        values = extended.values.astype(float)
+        observed = ~np.isnan(values)
+        shift = np.where(observed, values, 0).sum(axis=0) / np.maximum(observed.sum(axis=0), 1)
+        blocks = self._get_blocks(table_name, extended.columns)
+
+        statistics = GroupedStatistics(extended.columns, blocks, shift)
+        statistics.add(values)
+        self.statistics[table_name] = statistics
+
+        for parent_name in self.metadata.get_parents(table_name):
+            foreign_key = self.metadata.get_foreign_key(parent_name, table_name)
+            statistics = GroupedStatistics(extended.columns, blocks, shift)
+            statistics.add(values, table[foreign_key].values)
+            self.extension_statistics[(parent_name, table_name)] = statistics
+
+    def _get_statistics_extension(self, table_name, child_name):
+        """Build the extension of a child from its sufficient statistics.
+
+        The result has the same format as the one returned by ``_get_extension``.
+        """
+        statistics = self.extension_statistics[(table_name, child_name)]
+        impute = self.statistics[child_name].get_means()[0]
+        loc, scale, correlation = statistics.get_gaussian_parameters(impute)
+
+        model = self.model(**self.model_kwargs)
+        extension = model.flatten_gaussian_parameters(
+            statistics.columns, loc, scale, correlation, statistics.keys)
+        extension['child_rows'] = statistics.get_sizes()
+        extension.columns = '__' + child_name + '__' + extension.columns
+        return extension
+
+    def _update_table(self, table_name, new_rows):
+        """Fold the new rows of a table into its statistics and rebuild its model.
+
+        The children of the table must have been updated before. Tables without
+        children only need to fold the new rows in, while the extended rows of the
+        other tables are rebuilt from their transformed values and the statistics
+        of their children, since the extension of any row may have changed.
+
+        Args:
+            table_name (str):
+                Name of the table to update.
+            new_rows (pandas.DataFrame or None):
+                New rows of the table, if any.
+        """
+        LOGGER.info('Updating %s', table_name)
+
+        statistics = self.statistics[table_name]
         primary_key = self.metadata.get_primary_key(table_name)
-        if primary_key:
-            extended.index = table[primary_key]
+        transformed = None
+        if new_rows is not None:
+            self.table_sizes[table_name] += len(new_rows)
+            transformed = self.metadata.transform(table_name, new_rows)
+            if primary_key:
+                transformed.index = new_rows[primary_key]
+
+        foreign_keys = self._get_foreign_keys(table_name)
+        if table_name not in self._transformed:
+            if transformed is not None:
+                values = transformed[statistics.columns].values
+                statistics.add(values)
+                for parent_name in self.metadata.get_parents(table_name):
+                    foreign_key = self.metadata.get_foreign_key(parent_name, table_name)
+                    self.extension_statistics[(parent_name, table_name)].add(
+                        values, new_rows[foreign_key].values)
+
+        else:
+            table = self._transformed[table_name]
+            if transformed is not None:
+                for key in foreign_keys:
+                    transformed[key] = new_rows[key].values
+
+                table = pd.concat([table, transformed[table.columns]])
+                self._transformed[table_name] = table
+
+            extended = table.drop(foreign_keys, axis=1)
             for child_name in self.metadata.get_children(table_name):
-                child_key = self.metadata.get_foreign_key(table_name, child_name)
-                child_table = self.cpa(child_name, tables, child_key)
-                extension = self._get_extension(child_name, child_table, child_key)
+                extension = self._get_statistics_extension(table_name, child_name)
                 extended = extended.merge(extension, how='left',
                                           right_index=True, left_index=True)
                 extended['__' + child_name + '__child_rows'].fillna(0, inplace=True)
 
+            self._collect_statistics(table_name, extended[statistics.columns], table)
+            statistics = self.statistics[table_name]
+
+        loc, scale, correlation = statistics.get_gaussian_parameters()
         model = self.model(**self.model_kwargs)
-        model.fit(extended)
+        model.set_gaussian_parameters(statistics.columns, loc[0], scale[0], correlation[0])
         self.models[table_name] = model
 
-        if primary_key:
-            extended.reset_index(inplace=True)
+    def update(self, tables):
+        """Update the models of the dataset with new rows.
 
-        if foreign_key:
-            extended[foreign_key] = table[foreign_key]
+        The new rows are folded into the sufficient statistics kept while modeling,
+        so the tables are not processed again. Only the tables with new rows and
+        their ancestors are updated, children before parents.
+
+        The new rows are appended to the tables: existing rows cannot be modified
+        or deleted, but new child rows can reference existing parent rows.
+
+        Args:
+            tables (dict):
+                Dictionary with the table names as keys and ``pandas.DataFrame``
+                instances with the new rows of each table as values.
+
+        Raises:
+            ValueError:
+                If the Modeler was not created with ``incremental=True`` or has not
+                modeled the dataset yet.
+        """
+        if not self.incremental or not self.statistics:
+            raise ValueError('Only Modelers fitted with incremental=True can be updated')
+
+        order = list()
+
+        def visit(table_name):
+            if table_name not in order:
+                for child_name in sorted(self.metadata.get_children(table_name)):
+                    visit(child_name)
+
+                order.append(table_name)
+
+        for table_name in self.metadata.get_tables():
+            visit(table_name)
 
-        return extended
+        updated = set()
+        for table_name in order:
+            new_rows = tables.get(table_name)
+            if new_rows is not None and new_rows.empty:
+                new_rows = None
+
+            children = self.metadata.get_children(table_name)
+            if new_rows is not None or updated.intersection(children):
+                self._update_table(table_name, new_rows)
+                updated.add(table_name)
+
+        LOGGER.info('Update Complete')
+
+    def _get_foreign_keys(self, table_name, exclude=None):
+        """Get the foreign keys of a table, optionally excluding one of its parents."""
+        return [
+            self.metadata.get_foreign_key(parent_name, table_name)
+            for parent_name in sorted(self.metadata.get_parents(table_name))
+            if parent_name != exclude
+        ]
+
+    def _get_child_table(self, table_name, child_name, child_table):
+        """Drop from a modeled child the foreign keys to parents other than the given one."""
+        other_keys = self._get_foreign_keys(child_name, exclude=table_name)
+        if other_keys:
+            child_table = child_table.drop(other_keys, axis=1)
+
+        return child_table
+
+    def _model_database_concurrently(self, tables, num_workers):
+        """Run the CPA algorithm on all the tables using a pool of threads.
+
+        The tables are modeled bottom-up following the dependency graph defined in
+        the metadata: a table is scheduled as soon as all its children have been
+        modeled, so independent subtrees are modeled concurrently and every table
+        is modeled only once, even if it has more than one parent.
+
+        If the models of the children cannot be fitted in a single vectorized pass,
+        a pool of ``num_workers`` processes is started before the threads and shared
+        by all of them, so there are never more than ``num_workers`` processes.
+
+        Args:
+            tables (dict):
+                Dict of original tables, or ``None`` to load them from the metadata.
+            num_workers (int):
+                Number of threads to use.
+        """
+        table_names = self.metadata.get_tables()
+        pending_children = {
+            table_name: set(self.metadata.get_children(table_name))
+            for table_name in table_names
+        }
+        pending_parents = {
+            table_name: set(self.metadata.get_parents(table_name))
+            for table_name in table_names
+        }
+        extended_tables = dict()
+
+        with contextlib.ExitStack() as stack:
+            if not self._fits_grouped(self.model(**self.model_kwargs)):
+                # Start the pool from this thread, where forking is safe.
+                self._pool = stack.enter_context(get_pool_context().Pool(num_workers))
+                stack.callback(setattr, self, '_pool', None)
+
+            executor = stack.enter_context(ThreadPoolExecutor(num_workers))
+            futures = dict()
+
+            def submit(table_name):
+                extended_children = {
+                    child_name: extended_tables[child_name]
+                    for child_name in self.metadata.get_children(table_name)
+                }
+                foreign_keys = self._get_foreign_keys(table_name)
+                future = executor.submit(
+                    self.cpa, table_name, tables, foreign_keys, extended_children)
+                futures[future] = table_name
+
+            for table_name in table_names:
+                if not pending_children[table_name]:
+                    submit(table_name)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table_name = futures.pop(future)
+                    if pending_parents[table_name]:
+                        extended_tables[table_name] = future.result()
+                    else:
+                        future.result()
+
+                    for child_name in self.metadata.get_children(table_name):
+                        pending_parents[child_name].discard(table_name)
+                        if not pending_parents[child_name]:
+                            # All the parents are done, so release the child table.
+                            del extended_tables[child_name]
+
+                    for parent_name in self.metadata.get_parents(table_name):
+                        pending_children[parent_name].discard(table_name)
+                        if not pending_children[parent_name]:
+                            submit(parent_name)
 
     def model_database(self, tables=None):
         """Run CPA algorithm on all the tables of this dataset.
 
+        If ``n_jobs`` allows more than one worker, independent subtrees of
+        the dataset are modeled concurrently. In ``low_memory`` mode, the memory
+        allocated while modeling is traced with ``tracemalloc`` and recorded in
+        ``memory_stats``.
+
         Args:
             tables (dict):
                 Optional. Dictinary containing the tables of this dataset.
                 If not given, the tables will be loaded using the dataset
                 metadata specification.
         """
-        for table_name in self.metadata.get_tables():
-            if not self.metadata.get_parents(table_name):
-                self.cpa(table_name, tables)
+        start_tracing = self.low_memory and not tracemalloc.is_tracing()
+        if start_tracing:
+            tracemalloc.start()
+
+        try:
+            num_workers = self._get_num_processes()
+            if num_workers > 1:
+                self._model_database_concurrently(tables, num_workers)
+            else:
+                for table_name in self.metadata.get_tables():
+                    if not self.metadata.get_parents(table_name):
+                        self.cpa(table_name, tables)
+
+        finally:
+            if start_tracing:
+                tracemalloc.stop()
 
         LOGGER.info('Modeling Complete')
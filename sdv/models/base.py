@@ -17,12 +17,15 @@ class SDVModel:
         """
         raise NotImplementedError
 
-    def sample(self, num_samples):
+    def sample(self, num_samples, random_state=None):
         """Sample ``num_samples`` rows from the model.
 
         Args:
             num_samples (int):
                 Amount of rows to sample.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
 
         Returns:
             pandas.DataFrame:
@@ -1,14 +1,19 @@
 """Wrappers around copulas models."""
 
+import functools
+import sys
+
 import numpy as np
-from copulas import EPSILON
+import pandas as pd
+from copulas import EPSILON, get_instance, get_qualified_name
 from copulas.multivariate import GaussianMultivariate
-from copulas.univariate import GaussianUnivariate
+from copulas.univariate import GaussianUnivariate, Univariate
+from scipy import stats
 
 from sdv.models.base import SDVModel
 from sdv.tabular.utils import (
-    check_matrix_symmetric_positive_definite, flatten_dict, impute, make_positive_definite,
-    square_matrix, unflatten_dict)
+    _key_order, check_matrix_symmetric_positive_definite, flatten_dict, get_random_state, impute,
+    make_positive_definite, sample_multivariate, square_matrix, unflatten_dict)
 
 
 class GaussianCopula(SDVModel):
@@ -34,6 +39,10 @@ class GaussianCopula(SDVModel):
     """
 
     DISTRIBUTION = GaussianUnivariate
+    MAX_CONDITION_NUMBER = 1.0 / sys.float_info.epsilon
+    CONDITION_BLOCK_SIZE = 1000000
+    SAMPLE_BLOCK_SIZE = 1000000
+    LIKELIHOOD_BLOCK_SIZE = 1000000
     distribution = None
     model = None
 
@@ -53,18 +62,24 @@ class GaussianCopula(SDVModel):
         self.model = GaussianMultivariate(distribution=self.distribution)
         self.model.fit(table_data)
 
-    def sample(self, num_samples):
+    def sample(self, num_samples, random_state=None):
         """Sample ``num_samples`` rows from the model.
 
         Args:
             num_samples (int):
                 Amount of rows to sample.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
 
         Returns:
             pandas.DataFrame:
                 Sampled data with the number of rows specified in ``num_samples``.
         """
-        return self.model.sample(num_samples)
+        if random_state is None:
+            return self.model.sample(num_samples)
+
+        return sample_multivariate(self.model, num_samples, random_state)
 
     def get_parameters(self):
         """Get copula model parameters.
@@ -76,14 +91,11 @@ class GaussianCopula(SDVModel):
             dict:
                 Copula flatten parameters.
         """
-        values = list()
-        triangle = np.tril(self.model.covariance)
-
-        for index, row in enumerate(triangle.tolist()):
-            values.append(row[:index + 1])
-
-        self.model.covariance = np.array(values)
         params = self.model.to_dict()
+        params['covariance'] = [
+            row[:index + 1]
+            for index, row in enumerate(params['covariance'])
+        ]
         univariates = dict()
         for name, univariate in zip(params.pop('columns'), params['univariates']):
             univariates[name] = univariate
@@ -98,6 +110,583 @@ class GaussianCopula(SDVModel):
 
         return flatten_dict(params)
 
+    def get_parameter_names(self):
+        """Get the names of the values returned by ``get_parameter_vector``.
+
+        These are the same names and in the same order as the keys returned by
+        ``get_parameters``: the lower triangle of the covariance matrix, row by row,
+        followed by the parameters of the univariate distribution of each column.
+
+        Returns:
+            tuple[str]:
+                Names of the parameters.
+
+        Raises:
+            NotImplementedError:
+                If any univariate distribution has parameters that are not scalars.
+        """
+        tril_rows, tril_columns = np.tril_indices(len(self.model.columns))
+        names = ['covariance__{}__{}'.format(row, column)
+                 for row, column in zip(tril_rows, tril_columns)]
+        for column, univariate in zip(self.model.columns, self.model.univariates):
+            for name, value in univariate._get_params().items():
+                if np.ndim(value):
+                    raise NotImplementedError(
+                        'Parameter vectors require univariates with scalar parameters')
+
+                names.append('univariates__{}__{}'.format(column, name))
+
+        return tuple(names)
+
+    def get_parameter_vector(self):
+        """Get copula model parameters as an array.
+
+        The values are the same as the ones returned by ``get_parameters``, in the
+        order given by ``get_parameter_names``, so the scales of the univariate
+        distributions are in log space.
+
+        Returns:
+            numpy.ndarray:
+                Flatten parameters.
+        """
+        covariance = np.asarray(self.model.covariance, dtype=float)
+        tril_rows, tril_columns = np.tril_indices(len(covariance))
+        values = covariance[tril_rows, tril_columns].tolist()
+        for univariate in self.model.univariates:
+            for name, value in univariate._get_params().items():
+                if name == 'scale':
+                    value = np.log(value or EPSILON)
+
+                values.append(value)
+
+        return np.array(values, dtype=float)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _get_parameter_schema(names):
+        """Locate the parameters of the model within a parameter vector.
+
+        The names are parsed once per vector layout and the positions are reused
+        by all the vectors with the same names. Names other than the ones of the
+        covariance and the univariates, like ``child_rows``, are ignored.
+
+        The columns are sorted like ``unflatten_dict`` sorts the keys, so the
+        covariance rows are matched with the same columns as in ``set_parameters``.
+
+        Args:
+            names (tuple[str]):
+                Names of the values of the vector.
+
+        Returns:
+            tuple:
+                Names of the columns, positions of the covariance triangle values,
+                row and column indices of the triangle and, for each column, the
+                names and positions of its univariate parameters.
+        """
+        covariance = list()
+        tril_rows = list()
+        tril_columns = list()
+        univariates = dict()
+        for position, name in enumerate(names):
+            if name.startswith('covariance__'):
+                _, row, column = name.split('__')
+                covariance.append(position)
+                tril_rows.append(int(row))
+                tril_columns.append(int(column))
+
+            elif name.startswith('univariates__'):
+                column, parameter = name[len('univariates__'):].rsplit('__', 1)
+                parameter_names, positions = univariates.setdefault(column, ([], []))
+                parameter_names.append(parameter)
+                positions.append(position)
+
+        columns = sorted(univariates, key=lambda column: _key_order((column, None)))
+        return (columns, np.array(covariance, dtype=int), np.array(tril_rows, dtype=int),
+                np.array(tril_columns, dtype=int), [univariates[column] for column in columns])
+
+    def set_parameter_vector(self, values, names):
+        """Set copula model parameters from an array.
+
+        The result is the same as calling ``set_parameters`` with a dict built from
+        the given names and values, but the layout of the vector is parsed only once
+        per distinct ``names``, and the covariance matrix is rebuilt with array indexing.
+
+        Args:
+            values (numpy.ndarray):
+                Flatten parameters, in the same format as ``get_parameter_vector``.
+            names (tuple[str]):
+                Names of the values, like the ones returned by ``get_parameter_names``.
+                Other values, like ``child_rows``, are ignored.
+        """
+        schema = self._get_parameter_schema(tuple(names))
+        columns, covariance_positions, tril_rows, tril_columns, univariate_positions = schema
+        values = np.asarray(values, dtype=float)
+
+        covariance = np.zeros((len(columns), len(columns)))
+        covariance[tril_rows, tril_columns] = values[covariance_positions]
+        covariance[tril_columns, tril_rows] = values[covariance_positions]
+        if not check_matrix_symmetric_positive_definite(covariance):
+            covariance = make_positive_definite(covariance)
+
+        univariates = list()
+        for parameter_names, positions in univariate_positions:
+            parameters = dict(zip(parameter_names, values[positions].tolist()))
+            if 'scale' in parameters:
+                parameters['scale'] = np.exp(parameters['scale'])
+
+            univariate = get_instance(self.distribution)
+            univariate._set_params(parameters)
+            univariate.fitted = True
+            univariates.append(univariate)
+
+        self.model = GaussianMultivariate(distribution=self.distribution)
+        self.model.columns = list(columns)
+        self.model.univariates = univariates
+        self.model.covariance = covariance
+        self.model.fitted = True
+
+    def is_gaussian(self):
+        """Tell whether this model uses ``GaussianUnivariate`` marginals.
+
+        Returns:
+            bool:
+                ``True`` if the marginal distributions are ``GaussianUnivariate``.
+        """
+        distribution = self.distribution
+        if isinstance(distribution, str):
+            distribution = get_instance(distribution)
+
+        if not isinstance(distribution, type):
+            distribution = type(distribution)
+
+        return distribution is GaussianUnivariate
+
+    def _get_singular(self, correlation, tril_rows, tril_columns):
+        """Find which of the given correlation triangles are ill-conditioned.
+
+        The matrices are rebuilt and evaluated in blocks to keep the memory
+        usage bounded regardless of the number of groups.
+
+        Args:
+            correlation (numpy.ndarray):
+                Lower triangles of the correlation matrices, one per row.
+            tril_rows (numpy.ndarray):
+                Row index of each triangle value.
+            tril_columns (numpy.ndarray):
+                Column index of each triangle value.
+
+        Returns:
+            numpy.ndarray:
+                Boolean array indicating which matrices are ill-conditioned.
+        """
+        num_columns = tril_rows.max() + 1
+        block_size = max(self.CONDITION_BLOCK_SIZE // num_columns ** 2, 1)
+        singular = np.zeros(len(correlation), dtype=bool)
+        for start in range(0, len(correlation), block_size):
+            block = correlation[start:start + block_size]
+            matrices = np.zeros((len(block), num_columns, num_columns))
+            matrices[:, tril_rows, tril_columns] = block
+            matrices[:, tril_columns, tril_rows] = block
+            with np.errstate(divide='ignore', invalid='ignore'):
+                condition = np.linalg.cond(matrices)
+
+            singular[start:start + block_size] = ~(condition <= self.MAX_CONDITION_NUMBER)
+
+        return singular
+
+    def get_grouped_parameters(self, table_data, groups):
+        """Get the parameters of a model fitted to each group of rows.
+
+        The result is equivalent to fitting a new model to the rows of each group
+        and calling ``get_parameters`` on it, but all the groups are processed at
+        once with vectorized operations over the rows sorted by group, without
+        building any intermediate model.
+
+        This is only supported for models that use ``GaussianUnivariate`` marginals.
+
+        Args:
+            table_data (pandas.DataFrame):
+                Data to be fitted.
+            groups (pandas.Series or numpy.ndarray):
+                Group to which each row of ``table_data`` belongs.
+
+        Returns:
+            pandas.DataFrame:
+                Flatten parameters of each group, indexed by the group values
+                in order of appearance.
+
+        Raises:
+            NotImplementedError:
+                If the model does not use ``GaussianUnivariate`` marginals.
+        """
+        if not self.is_gaussian():
+            raise NotImplementedError('Grouped fitting requires GaussianUnivariate marginals')
+
+        codes, uniques = pd.factorize(np.asarray(groups))
+        num_columns = len(table_data.columns)
+        tril_rows, tril_columns = np.tril_indices(num_columns)
+        if not len(uniques) or not num_columns:
+            names = self._get_parameter_names(table_data.columns)
+            return pd.DataFrame(index=uniques, columns=names, dtype=float)
+
+        order = np.argsort(codes, kind='mergesort')
+        codes = codes[order]
+        counts = np.bincount(codes)[:, np.newaxis]
+        starts = np.concatenate([[0], np.cumsum(counts[:-1])])
+        values = table_data.values.astype(float)[order]
+
+        # Impute missing values with the mean of the group
+        missing = np.isnan(values)
+        present = np.add.reduceat(~missing, starts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = np.add.reduceat(np.where(missing, 0.0, values), starts) / present
+
+        values = np.where(missing, means[codes], values)
+
+        # Fit the GaussianUnivariate marginals
+        lows = np.minimum.reduceat(values, starts)
+        constant = (lows == np.maximum.reduceat(values, starts)) | (present == 0)
+        loc = np.add.reduceat(values, starts) / counts
+        deviations = values - loc[codes]
+        scale = np.sqrt(np.add.reduceat(deviations ** 2, starts) / counts)
+        loc = np.where(constant, lows, loc)
+        scale = np.where(constant, 0.0, scale)
+
+        # Transform to standard normal and compute the correlation triangles
+        row_scale = np.where(constant, 1.0, scale)[codes]
+        cdf = np.clip(stats.norm.cdf(deviations / row_scale), EPSILON, 1 - EPSILON)
+        normal = np.where(constant[codes], 0.0, stats.norm.ppf(cdf))
+        normal -= (np.add.reduceat(normal, starts) / counts)[codes]
+
+        cross = np.empty((len(uniques), len(tril_rows)))
+        position = 0
+        for row in range(num_columns):
+            products = normal[:, :row + 1] * normal[:, row:row + 1]
+            cross[:, position:position + row + 1] = np.add.reduceat(products, starts)
+            position += row + 1
+
+        diagonal = (tril_rows == tril_columns)
+        variances = cross[:, diagonal]
+        denominator = np.sqrt(variances[:, tril_rows] * variances[:, tril_columns])
+        valid = denominator > 0
+        correlation = np.where(valid, cross / np.where(valid, denominator, 1.0), 0.0)
+
+        columns = table_data.columns
+        return self.flatten_gaussian_parameters(columns, loc, scale, correlation, uniques)
+
+    @staticmethod
+    def _get_parameter_names(columns):
+        """Get the names of the flatten parameters of a model fitted to the given columns."""
+        tril_rows, tril_columns = np.tril_indices(len(columns))
+        names = ['covariance__{}__{}'.format(row, column)
+                 for row, column in zip(tril_rows, tril_columns)]
+        for column in columns:
+            names.append('univariates__{}__loc'.format(column))
+            names.append('univariates__{}__scale'.format(column))
+
+        return names
+
+    def flatten_gaussian_parameters(self, columns, loc, scale, correlation, index):
+        """Build the flatten parameters of several models from their arrays.
+
+        Args:
+            columns (list):
+                Names of the modeled columns.
+            loc (numpy.ndarray):
+                Location of each column, with one row per model.
+            scale (numpy.ndarray):
+                Scale of each column, with one row per model.
+            correlation (numpy.ndarray):
+                Lower triangle of the correlation matrix of each model.
+            index (pandas.Index):
+                Index of the output.
+
+        Returns:
+            pandas.DataFrame:
+                Flatten parameters of each model, in the same format as ``get_parameters``.
+        """
+        names = self._get_parameter_names(columns)
+        if not len(index) or not len(columns):
+            return pd.DataFrame(index=index, columns=names, dtype=float)
+
+        tril_rows, tril_columns = np.tril_indices(len(columns))
+        correlation = correlation.copy()
+        singular = self._get_singular(correlation, tril_rows, tril_columns)
+        correlation[np.ix_(singular, tril_rows == tril_columns)] += EPSILON
+
+        univariates = np.empty((len(index), 2 * len(columns)))
+        univariates[:, 0::2] = loc
+        univariates[:, 1::2] = np.log(np.where(scale == 0, EPSILON, scale))
+
+        parameters = np.concatenate([correlation, univariates], axis=1)
+        return pd.DataFrame(parameters, index=index, columns=names)
+
+    def set_gaussian_parameters(self, columns, loc, scale, correlation):
+        """Build the model from the parameters of its ``GaussianUnivariate`` marginals.
+
+        The result is equivalent to fitting the model to a table whose columns
+        have the given means, standard deviations and correlation.
+
+        Args:
+            columns (list):
+                Names of the modeled columns.
+            loc (numpy.ndarray):
+                Location of each column.
+            scale (numpy.ndarray):
+                Scale of each column. Columns with a scale of ``0`` are constant.
+            correlation (numpy.ndarray):
+                Lower triangle of the correlation matrix.
+        """
+        tril_rows, tril_columns = np.tril_indices(len(columns))
+        covariance = np.zeros((len(columns), len(columns)))
+        covariance[tril_rows, tril_columns] = correlation
+        covariance[tril_columns, tril_rows] = correlation
+        singular = self._get_singular(correlation[np.newaxis], tril_rows, tril_columns)
+        if len(columns) and singular[0]:
+            covariance = covariance + np.identity(len(columns)) * EPSILON
+
+        univariates = list()
+        for column_loc, column_scale in zip(loc, scale):
+            if column_scale == 0:
+                univariate = GaussianUnivariate()
+                univariate.fit(np.array([column_loc]))
+            else:
+                univariate = Univariate.from_dict({
+                    'type': get_qualified_name(GaussianUnivariate),
+                    'loc': column_loc,
+                    'scale': column_scale,
+                })
+
+            univariates.append(univariate)
+
+        self.model = GaussianMultivariate(distribution=self.distribution)
+        self.model.columns = list(columns)
+        self.model.univariates = univariates
+        self.model.covariance = covariance
+        self.model.fitted = True
+
+    def _get_cholesky_factors(self, covariance):
+        """Get the Cholesky factors of a stack of sampled covariance matrices.
+
+        Matrices that are not positive-definite are replaced with the closest
+        positive-definite matrix, as ``_prepare_sampled_covariance`` does.
+
+        Args:
+            covariance (numpy.ndarray):
+                Array of shape ``(num_groups, num_columns, num_columns)``.
+
+        Returns:
+            numpy.ndarray:
+                Lower triangular factors, with the same shape as ``covariance``.
+        """
+        covariance = np.nan_to_num(covariance)
+        invalid = ~(np.linalg.eigvalsh(covariance)[:, 0] > 0)
+        for position in np.flatnonzero(invalid):
+            covariance[position] = make_positive_definite(covariance[position])
+
+        try:
+            return np.linalg.cholesky(covariance)
+        except np.linalg.LinAlgError:
+            # Some matrices are numerically too close to singular, so fix them one by one.
+            factors = np.empty_like(covariance)
+            for position, matrix in enumerate(covariance):
+                if not check_matrix_symmetric_positive_definite(matrix):
+                    matrix = make_positive_definite(matrix)
+
+                factors[position] = np.linalg.cholesky(matrix)
+
+            return factors
+
+    def sample_grouped(self, parameters, num_rows, random_state=None):
+        """Sample rows from the models described by several rows of flatten parameters.
+
+        The result is equivalent to calling ``set_parameters`` and ``sample`` once for
+        each row of ``parameters``, but the parameters of all the models are stacked
+        in arrays and all the rows are drawn at once using the Cholesky factor of
+        the covariance matrix of each model.
+
+        This is only supported for models that use ``GaussianUnivariate`` marginals.
+
+        Args:
+            parameters (pandas.DataFrame):
+                Flatten parameters of each model, in the same format as the ones
+                returned by ``get_grouped_parameters``. Other columns are ignored.
+            num_rows (numpy.ndarray):
+                Number of rows to sample from each model.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled rows of all the models, in order.
+
+        Raises:
+            NotImplementedError:
+                If the model does not use ``GaussianUnivariate`` marginals.
+        """
+        if not self.is_gaussian():
+            raise NotImplementedError('Grouped sampling requires GaussianUnivariate marginals')
+
+        columns, loc, scale, factors = self._get_grouped_arrays(parameters)
+        num_rows = np.asarray(num_rows, dtype=int)
+        if not columns:
+            return pd.DataFrame(index=range(num_rows.sum()))
+
+        num_columns = len(columns)
+        groups = np.repeat(np.arange(len(loc)), num_rows)
+        random_state = get_random_state(random_state)
+        samples = random_state.standard_normal((len(groups), num_columns))
+        block_size = max(self.SAMPLE_BLOCK_SIZE // num_columns ** 2, 1)
+        for start in range(0, len(groups), block_size):
+            block = slice(start, start + block_size)
+            samples[block] = np.einsum('nij,nj->ni', factors[groups[block]], samples[block])
+
+        samples = loc[groups] + scale[groups] * samples
+
+        return pd.DataFrame(samples, columns=columns)
+
+    def _get_grouped_arrays(self, parameters):
+        """Stack the parameters of several models given as rows of flatten parameters.
+
+        Args:
+            parameters (pandas.DataFrame):
+                Flatten parameters of each model. Other columns are ignored.
+
+        Returns:
+            tuple:
+                Names of the modeled columns, location and scale of each column with one
+                row per model, and Cholesky factors of the covariance matrix of each model.
+        """
+        columns = [
+            name[len('univariates__'):-len('__loc')]
+            for name in parameters.columns
+            if name.startswith('univariates__') and name.endswith('__loc')
+        ]
+        num_columns = len(columns)
+        if not num_columns:
+            return columns, None, None, None
+
+        names = self._get_parameter_names(columns)
+        values = parameters[names].values.astype(float)
+        num_covariance = num_columns * (num_columns + 1) // 2
+        loc = values[:, num_covariance::2]
+        scale = np.exp(values[:, num_covariance + 1::2])
+
+        tril_rows, tril_columns = np.tril_indices(num_columns)
+        covariance = np.zeros((len(values), num_columns, num_columns))
+        covariance[:, tril_rows, tril_columns] = values[:, :num_covariance]
+        covariance[:, tril_columns, tril_rows] = values[:, :num_covariance]
+        factors = self._get_cholesky_factors(covariance)
+
+        return columns, loc, scale, factors
+
+    def sample_groups(self, parameters, table_data, weights, random_state=None):
+        """Choose one of several models for each row, proportionally to its likelihood.
+
+        The likelihood of each row under each model is the density used by
+        ``copulas.multivariate.GaussianMultivariate.probability_density``, except that
+        the normal scores of the values are not clipped to ``copulas.EPSILON``.
+
+        Log-densities are evaluated in blocks of rows and models, with a single matrix
+        product per block against the stacked inverse Cholesky factors of the models.
+        The choice is streamed over the blocks of models: a candidate is drawn from
+        each block using its cumulative weights, and replaces the current choice of the
+        row with probability equal to the share of the block in the total likelihood
+        seen so far. This way the matrix of likelihoods of all the rows under all the
+        models is never built.
+
+        Models whose parameters are not valid get the mean likelihood of the valid
+        ones, and if no model is valid the rows are assigned using the given ``weights``.
+
+        This is only supported for models that use ``GaussianUnivariate`` marginals.
+
+        Args:
+            parameters (pandas.DataFrame):
+                Flatten parameters of each model. Other columns are ignored.
+            table_data (pandas.DataFrame):
+                Rows for which to choose a model.
+            weights (numpy.ndarray):
+                Fallback weight of each model.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
+
+        Returns:
+            numpy.ndarray:
+                Position of the model chosen for each row.
+
+        Raises:
+            NotImplementedError:
+                If the model does not use ``GaussianUnivariate`` marginals.
+        """
+        if not self.is_gaussian():
+            raise NotImplementedError('Grouped likelihoods require GaussianUnivariate marginals')
+
+        random_state = get_random_state(random_state)
+        num_rows = len(table_data)
+        num_groups = len(parameters)
+        columns, loc, scale, factors = self._get_grouped_arrays(parameters)
+        if columns:
+            diagonal = np.diagonal(factors, axis1=1, axis2=2)
+            valid = np.isfinite(factors).all(axis=(1, 2)) & (diagonal > 0).all(axis=1)
+            valid &= np.isfinite(loc).all(axis=1) & np.isfinite(scale).all(axis=1)
+            valid &= (scale > 0).all(axis=1)
+        else:
+            valid = np.zeros(num_groups, dtype=bool)
+
+        valid_groups = np.flatnonzero(valid)
+        if not len(valid_groups):
+            weights = np.asarray(weights, dtype=float)
+            return random_state.choice(num_groups, size=num_rows, p=weights / weights.sum())
+
+        # The solved normal scores are transform @ values - offset for each model.
+        num_columns = len(columns)
+        transform = np.linalg.inv(factors[valid]) / scale[valid][:, np.newaxis, :]
+        offset = np.einsum('gij,gj->gi', transform, loc[valid])
+        transform = transform.reshape(-1, num_columns).T
+        log_norm = -np.log(diagonal[valid]).sum(axis=1) - num_columns * np.log(2 * np.pi) / 2
+        values = table_data[columns].values.astype(float)
+
+        chosen = np.zeros(num_rows, dtype=int)
+        log_total = np.full(num_rows, -np.inf)
+        group_block = max(min(len(valid_groups), self.LIKELIHOOD_BLOCK_SIZE // num_columns), 1)
+        row_block = max(self.LIKELIHOOD_BLOCK_SIZE // (group_block * num_columns), 1)
+        for row_start in range(0, num_rows, row_block):
+            rows = slice(row_start, row_start + row_block)
+            for group_start in range(0, len(valid_groups), group_block):
+                groups = slice(group_start, group_start + group_block)
+                columns_block = slice(group_start * num_columns,
+                                      (group_start + group_block) * num_columns)
+                solved = np.dot(values[rows], transform[:, columns_block])
+                solved = solved.reshape(len(solved), -1, num_columns) - offset[groups]
+                log_density = log_norm[groups] - (solved ** 2).sum(axis=2) / 2
+
+                block_max = log_density.max(axis=1, keepdims=True)
+                cumulative = np.cumsum(np.exp(log_density - block_max), axis=1)
+                block_total = cumulative[:, -1]
+                threshold = random_state.uniform(size=len(cumulative)) * block_total
+                position = (cumulative < threshold[:, np.newaxis]).sum(axis=1)
+                position = np.minimum(position, cumulative.shape[1] - 1)
+
+                block_log_total = np.log(block_total) + block_max[:, 0]
+                new_log_total = np.logaddexp(log_total[rows], block_log_total)
+                replace = random_state.uniform(size=len(cumulative)) < np.exp(
+                    block_log_total - new_log_total)
+                chosen[rows] = np.where(
+                    replace, valid_groups[group_start + position], chosen[rows])
+                log_total[rows] = new_log_total
+
+        invalid_groups = np.flatnonzero(~valid)
+        if len(invalid_groups):
+            # The invalid models get the mean likelihood of the valid ones, so together
+            # they take the same share of the total likelihood of every row.
+            share = len(invalid_groups) / num_groups
+            replace = random_state.uniform(size=num_rows) < share
+            chosen[replace] = random_state.choice(invalid_groups, size=replace.sum())
+
+        return chosen
+
     def _prepare_sampled_covariance(self, covariance):
         """Prepare a covariance matrix.
 
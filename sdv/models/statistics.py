@@ -0,0 +1,203 @@
+"""Sufficient statistics of gaussian copula models."""
+
+import numpy as np
+import pandas as pd
+
+
+def _reduce(values, codes, num_groups):
+    """Sum the rows of ``values`` that belong to each group.
+
+    Args:
+        values (numpy.ndarray):
+            Values to add, with one row per element.
+        codes (numpy.ndarray):
+            Group position of each row.
+        num_groups (int):
+            Total number of groups.
+
+    Returns:
+        numpy.ndarray:
+            Array with one row per group.
+    """
+    result = np.zeros((num_groups, ) + values.shape[1:])
+    if len(values):
+        order = np.argsort(codes, kind='mergesort')
+        codes = codes[order]
+        starts = np.flatnonzero(np.concatenate([[True], codes[1:] != codes[:-1]]))
+        result[codes[starts]] = np.add.reduceat(values[order], starts, axis=0)
+
+    return result
+
+
+class GroupedStatistics:
+    """Sufficient statistics of a table, optionally split in groups of rows.
+
+    For each group, the number of rows, the sums and the cross products of the
+    columns are kept so new rows can be folded in at any time and the parameters
+    of a ``GaussianCopula`` with ``GaussianUnivariate`` marginals fitted to the rows
+    of each group can be derived without looking at the rows again.
+
+    Missing values are supported as long as they follow the structure of the
+    extended tables built by the ``Modeler``: the columns are split in blocks, and
+    the columns of a block are either all observed or all missing in each row.
+    Block ``0`` contains the columns which are always observed. Missing values are
+    imputed when the parameters are computed, which allows changing the imputation
+    values after the rows have been folded in.
+
+    Args:
+        columns (list):
+            Names of the columns.
+        blocks (list[int]):
+            Block of each column.
+        shift (numpy.ndarray):
+            Reference value of each column, subtracted before accumulating the
+            values to keep the sums numerically stable.
+    """
+
+    CONSTANT_TOLERANCE = 1e-9
+
+    def __init__(self, columns, blocks, shift):
+        self.columns = list(columns)
+        self.blocks = np.asarray(blocks, dtype=int)
+        self.shift = np.asarray(shift, dtype=float)
+        self.keys = pd.Index([])
+
+        num_columns = len(self.columns)
+        num_blocks = self.blocks.max() + 1 if num_columns else 1
+        self._first = np.array([
+            np.flatnonzero(self.blocks == block)[0] if block else -1
+            for block in range(num_blocks)
+        ])
+        self.tril_rows, self.tril_columns = np.tril_indices(num_columns)
+        self.counts = np.zeros((0, num_blocks, num_blocks))
+        self.sums = np.zeros((0, num_columns, num_blocks))
+        self.cross = np.zeros((0, len(self.tril_rows)))
+
+    @staticmethod
+    def _extend(values, num_groups):
+        """Add the given number of empty groups at the end of the array."""
+        return np.concatenate([values, np.zeros((num_groups, ) + values.shape[1:])])
+
+    def _get_positions(self, groups):
+        """Get the position of each group, adding the ones that are new."""
+        keys = pd.Index(pd.unique(groups))
+        new_keys = keys[self.keys.get_indexer(keys) < 0]
+        if len(new_keys):
+            self.keys = self.keys.append(new_keys)
+            self.counts = self._extend(self.counts, len(new_keys))
+            self.sums = self._extend(self.sums, len(new_keys))
+            self.cross = self._extend(self.cross, len(new_keys))
+
+        return self.keys.get_indexer(groups)
+
+    def add(self, values, groups=None):
+        """Fold new rows into the statistics of their groups.
+
+        Args:
+            values (numpy.ndarray):
+                Values of the rows, with one column per column of the statistics.
+            groups (numpy.ndarray):
+                Group of each row. If not given, all the rows belong to a single group.
+        """
+        values = np.asarray(values, dtype=float)
+        if groups is None:
+            groups = np.zeros(len(values), dtype=int)
+
+        codes = self._get_positions(np.asarray(groups))
+        num_groups = len(self.keys)
+
+        observed = np.ones((len(values), len(self._first)), dtype=bool)
+        observed[:, 1:] = ~np.isnan(values[:, self._first[1:]])
+        observed_pairs = observed[:, :, np.newaxis] & observed[:, np.newaxis, :]
+        self.counts += _reduce(observed_pairs.astype(float), codes, num_groups)
+
+        values = np.where(np.isnan(values), 0.0, values - self.shift)
+        for block in range(observed.shape[1]):
+            products = values * observed[:, block:block + 1]
+            self.sums[:, :, block] += _reduce(products, codes, num_groups)
+
+        position = 0
+        for row in range(values.shape[1]):
+            products = values[:, :row + 1] * values[:, row:row + 1]
+            self.cross[:, position:position + row + 1] += _reduce(products, codes, num_groups)
+            position += row + 1
+
+    def get_sizes(self):
+        """Get the number of rows of each group.
+
+        Returns:
+            pandas.Series:
+                Number of rows indexed by group.
+        """
+        return pd.Series(self.counts[:, 0, 0].astype(int), index=self.keys)
+
+    def get_means(self):
+        """Get the mean of the observed values of each column in each group.
+
+        Returns:
+            numpy.ndarray:
+                Array of shape ``(num_groups, num_columns)``.
+        """
+        columns = np.arange(len(self.columns))
+        observed = self.counts[:, self.blocks, self.blocks]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.sums[:, columns, self.blocks] / observed + self.shift
+
+    def get_gaussian_parameters(self, impute=None):
+        """Get the parameters of a gaussian copula fitted to each group.
+
+        Missing values are replaced with the ``impute`` values before fitting,
+        which by default are the means of the observed values of each group.
+
+        The correlation is computed over the values of each column, which is
+        equivalent to computing it over their normal scores as long as no value
+        lies further than ``copulas.EPSILON`` from the ends of the marginals.
+
+        Args:
+            impute (numpy.ndarray):
+                Value to use for the missing values of each column.
+
+        Returns:
+            tuple[numpy.ndarray]:
+                Location and scale of each column and lower triangle of the
+                correlation matrix, with one row per group.
+        """
+        if impute is None:
+            impute = self.get_means()
+        else:
+            impute = np.broadcast_to(impute, (len(self.keys), len(self.columns)))
+
+        impute = impute - self.shift
+        columns = np.arange(len(self.columns))
+        rows, cols = self.tril_rows, self.tril_columns
+        row_blocks, col_blocks = self.blocks[rows], self.blocks[cols]
+
+        sizes = self.counts[:, 0, 0, np.newaxis]
+        observed = self.counts[:, self.blocks, self.blocks]
+        observed_sums = self.sums[:, columns, self.blocks]
+        sums = observed_sums + (sizes - observed) * impute
+        means = sums / sizes
+
+        # Add the products that involve imputed values, using the number of rows
+        # and the sums over the rows where only one or none of the columns is observed
+        both_missing = (
+            sizes - observed[:, rows] - observed[:, cols] + self.counts[:, row_blocks, col_blocks])
+        cross = self.cross + impute[:, rows] * impute[:, cols] * both_missing
+        cross += impute[:, cols] * (observed_sums[:, rows] - self.sums[:, rows, col_blocks])
+        cross += impute[:, rows] * (observed_sums[:, cols] - self.sums[:, cols, row_blocks])
+        covariance = cross - sizes * means[:, rows] * means[:, cols]
+
+        diagonal = rows == cols
+        variances = covariance[:, diagonal]
+        with np.errstate(invalid='ignore'):
+            constant = ~(variances > self.CONSTANT_TOLERANCE * cross[:, diagonal])
+
+        variances = np.where(constant, 0.0, variances)
+        denominator = np.sqrt(variances[:, rows] * variances[:, cols])
+        valid = denominator > 0
+        correlation = np.where(valid, covariance / np.where(valid, denominator, 1.0), 0.0)
+
+        loc = means + self.shift
+        scale = np.sqrt(variances / sizes)
+
+        return loc, scale, correlation
@@ -1,11 +1,107 @@
 """SDV Sampler."""
 
-import itertools
+import contextlib
+import functools
 
-import exrex
 import numpy as np
 import pandas as pd
 
+from sdv.keys import IntegerKeyGenerator, get_string_key_generator
+from sdv.models.copulas import GaussianCopula
+from sdv.tabular.utils import get_random_state
+from sdv.utils import get_num_processes, get_pool_context
+
+
+def _get_seed_sequence(random_state):
+    """Get a ``numpy.random.SeedSequence`` from a seed, sequence or generator.
+
+    Generators are advanced to draw the entropy of the new sequence.
+    """
+    if isinstance(random_state, np.random.SeedSequence):
+        return random_state
+
+    if isinstance(random_state, np.random.Generator):
+        random_state = int(random_state.integers(2 ** 63))
+
+    return np.random.SeedSequence(random_state)
+
+
+_WORKER_STATE = dict()
+
+
+def _initialize_worker(sampler):
+    """Keep the sampler in the worker process so the models are shipped only once."""
+    _WORKER_STATE['sampler'] = sampler
+
+
+def _sample_partition(partition):
+    """Sample a partition of blocks of a table inside a worker process.
+
+    The primary keys are replaced with their positions in the sequence of keys of
+    each table within the partition, so the parent process can assign the final
+    keys once the number of keys used by all the partitions is known.
+
+    Returns:
+        tuple:
+            Sampled tables and number of keys used for each table.
+    """
+    table_name, num_rows, seed_sequence, first_block = partition
+    sampler = _WORKER_STATE['sampler']
+    sampler._reset_primary_keys_generators()
+    for name in sampler.metadata.get_tables():
+        if sampler.metadata.get_primary_key(name):
+            sampler.primary_key[name] = IntegerKeyGenerator()
+            sampler.remaining_primary_key[name] = np.inf
+
+    sampled_data = sampler._sample_blocks(table_name, num_rows, seed_sequence, first_block)
+    num_keys = {
+        name: generator.offset
+        for name, generator in sampler.primary_key.items()
+    }
+
+    return sampled_data, num_keys
+
+
+@functools.lru_cache(maxsize=256)
+def _get_extension_index(columns, table_name):
+    """Locate the extension columns of a child table within the columns of its parent.
+
+    The result only depends on the columns of the parent rows, which are the same for
+    all the rows sampled from the parent model, so it is computed once per parent and
+    child pair and reused afterwards.
+
+    Args:
+        columns (tuple[str]):
+            Columns of the parent rows.
+        table_name (str):
+            Name of the child table.
+
+    Returns:
+        tuple[numpy.ndarray, tuple[str]]:
+            Positions of the extension columns and names of the parameters
+            stored in them.
+    """
+    prefix = '__{}__'.format(table_name)
+    positions = [
+        position for position, column in enumerate(columns)
+        if column.startswith(prefix)
+    ]
+    names = tuple(columns[position][len(prefix):] for position in positions)
+    return np.array(positions, dtype=int), names
+
+
+def _spawn(seed_sequence, *keys):
+    """Get the child of a ``numpy.random.SeedSequence`` identified by ``keys``.
+
+    Unlike ``SeedSequence.spawn``, the child only depends on the parent and the keys,
+    so the same stream can be rebuilt in any order and from any process.
+    """
+    return np.random.SeedSequence(
+        seed_sequence.entropy,
+        spawn_key=tuple(seed_sequence.spawn_key) + keys,
+        pool_size=seed_sequence.pool_size,
+    )
+
 
 class Sampler:
     """Sampler class.
@@ -23,10 +119,13 @@ class Sampler:
             Dict indicating the sizes of the tables in the orignal dataset.
     """
 
+    RANDOM_BLOCK_SIZE = 1000
+
     metadata = None
     models = None
     primary_key = None
     remaining_primary_key = None
+    _random_state = None
 
     def __init__(self, metadata, models, model, model_kwargs, table_sizes):
         self.metadata = metadata
@@ -110,12 +209,12 @@ class Sampler:
 
                 subtype = field.get('subtype', 'integer')
                 if subtype == 'integer':
-                    generator = itertools.count()
-                    remaining = np.inf
+                    generator = IntegerKeyGenerator()
+                    remaining = generator.count
                 elif subtype == 'string':
                     regex = field.get('regex', r'^[a-zA-Z]+$')
-                    generator = exrex.generate(regex)
-                    remaining = exrex.count(regex)
+                    generator = get_string_key_generator(regex)
+                    remaining = generator.count
                 elif subtype == 'datetime':
                     raise NotImplementedError('Datetime ids are not yet supported')
                 else:
@@ -134,7 +233,7 @@ class Sampler:
                 )
 
             self.remaining_primary_key[table_name] -= num_rows
-            primary_key_values = pd.Series([x for i, x in zip(range(num_rows), generator)])
+            primary_key_values = pd.Series(generator.generate(num_rows))
 
         return primary_key, primary_key_values
 
@@ -146,12 +245,32 @@ class Sampler:
                 A generated parent row.
             table_name (str):
                 Name of the table to make the model for.
+
+        Returns:
+            tuple[tuple[str], numpy.ndarray]:
+                Names and values of the flatten parameters.
         """
-        prefix = '__{}__'.format(table_name)
-        keys = [key for key in parent_row.keys() if key.startswith(prefix)]
-        new_keys = {key: key[len(prefix):] for key in keys}
-        flat_parameters = parent_row[keys]
-        return flat_parameters.rename(new_keys).to_dict()
+        positions, names = _get_extension_index(tuple(parent_row.index), table_name)
+        return names, parent_row.values[positions].astype(float)
+
+    @staticmethod
+    def _get_extension_parameters(parent_rows, table_name):
+        """Get the params of a child table from all the given parent rows.
+
+        Args:
+            parent_rows (pandas.DataFrame):
+                Generated parent rows.
+            table_name (str):
+                Name of the child table.
+
+        Returns:
+            pandas.DataFrame:
+                Flatten parameters of the child table model of each parent row.
+        """
+        positions, names = _get_extension_index(tuple(parent_rows.columns), table_name)
+        parameters = parent_rows.iloc[:, positions]
+        parameters.columns = names
+        return parameters
 
     def _sample_rows(self, model, num_rows, table_name):
         """Sample ``num_rows`` from ``model``.
@@ -170,26 +289,115 @@ class Sampler:
         """
         primary_key_name, primary_key_values = self._get_primary_keys(table_name, num_rows)
 
-        sampled = model.sample(num_rows)
+        if self._random_state is None:
+            sampled = model.sample(num_rows)
+        else:
+            sampled = model.sample(num_rows, random_state=self._random_state)
         if primary_key_name:
             sampled[primary_key_name] = primary_key_values
 
         return sampled
 
+    def _get_grouped_model(self):
+        """Get a model able to sample the children of many parent rows at once.
+
+        Returns:
+            GaussianCopula or None:
+                A model instance, or ``None`` if the model class does not support it.
+        """
+        model = self.model(**self.model_kwargs)
+        if isinstance(model, GaussianCopula) and model.is_gaussian():
+            return model
+
+        return None
+
     def _sample_children(self, table_name, sampled_data, table_rows=None):
         if table_rows is None:
             table_rows = sampled_data[table_name]
 
+        grouped_model = self._get_grouped_model()
         for child_name in self.metadata.get_children(table_name):
-            for _, row in table_rows.iterrows():
-                self._sample_child_rows(child_name, table_name, row, sampled_data)
+            if grouped_model is not None:
+                self._sample_grouped_child_rows(
+                    grouped_model, child_name, table_name, table_rows, sampled_data)
+            else:
+                for _, row in table_rows.iterrows():
+                    self._sample_child_rows(child_name, table_name, row, sampled_data)
 
-    def _sample_child_rows(self, table_name, parent_name, parent_row, sampled_data):
-        parameters = self._extract_parameters(parent_row, table_name)
+    def _sample_grouped_child_rows(self, model, table_name, parent_name, parent_rows,
+                                   sampled_data):
+        """Sample the child rows of all the given parent rows at once.
+
+        The extension columns of the parent rows are passed as stacked parameters to
+        ``model.sample_grouped``, and the sampled rows are added to ``sampled_data``
+        in a single step before sampling their own children.
+
+        Args:
+            model (GaussianCopula):
+                Model instance used to sample the rows.
+            table_name (str):
+                Name of the child table.
+            parent_name (str):
+                Name of the parent table.
+            parent_rows (pandas.DataFrame):
+                Sampled parent rows, including their extension columns.
+            sampled_data (dict):
+                Tables sampled so far.
+        """
+        if parent_rows.empty:
+            return
+
+        parameters = self._get_extension_parameters(parent_rows, table_name)
+        num_rows = np.maximum(np.round(parameters['child_rows'].values), 0).astype(int)
+
+        table_rows = model.sample_grouped(parameters, num_rows, random_state=self._random_state)
+        primary_key_name, primary_key_values = self._get_primary_keys(table_name, len(table_rows))
+        if primary_key_name:
+            table_rows[primary_key_name] = primary_key_values
+
+        parent_key = self.metadata.get_primary_key(parent_name)
+        foreign_key = self.metadata.get_foreign_key(parent_name, table_name)
+        table_rows[foreign_key] = np.repeat(parent_rows[parent_key].values, num_rows)
+
+        previous = sampled_data.get(table_name)
+        if previous is None:
+            sampled_data[table_name] = table_rows
+        else:
+            sampled_data[table_name] = pd.concat([previous, table_rows]).reset_index(drop=True)
+
+        self._sample_children(table_name, sampled_data, table_rows)
+
+    def _get_child_model(self, table_name, names, values):
+        """Get a model of a child table set up with the parameters of a parent row.
+
+        ``GaussianCopula`` models get the values as an array through
+        ``set_parameter_vector``, and other models as a dict through ``set_parameters``.
 
+        Args:
+            table_name (str):
+                Name of the child table.
+            names (tuple[str]):
+                Names of the flatten parameters extracted from the parent row.
+            values (numpy.ndarray):
+                Values of the flatten parameters extracted from the parent row.
+
+        Returns:
+            SDVModel:
+                Model instance with the given parameters.
+        """
         model = self.model(**self.model_kwargs)
-        model.set_parameters(parameters)
-        num_rows = max(round(parameters['child_rows']), 0)
+        if isinstance(model, GaussianCopula):
+            model.set_parameter_vector(np.asarray(values, dtype=float), names)
+        else:
+            model.set_parameters(dict(zip(names, values)))
+
+        return model
+
+    def _sample_child_rows(self, table_name, parent_name, parent_row, sampled_data):
+        names, values = self._extract_parameters(parent_row, table_name)
+
+        model = self._get_child_model(table_name, names, values)
+        num_rows = max(round(values[names.index('child_rows')]), 0)
 
         table_rows = self._sample_rows(model, num_rows, table_name)
 
@@ -206,7 +414,7 @@ class Sampler:
         self._sample_children(table_name, sampled_data, table_rows)
 
     @staticmethod
-    def _find_parent_id(likelihoods, num_rows):
+    def _find_parent_id(likelihoods, num_rows, random_state=None):
         mean = likelihoods.mean()
         if (likelihoods == 0).all():
             # All rows got 0 likelihood, fallback to num_rows
@@ -223,14 +431,15 @@ class Sampler:
 
         weights = likelihoods.values / likelihoods.sum()
 
-        return np.random.choice(likelihoods.index, p=weights)
+        return get_random_state(random_state).choice(likelihoods.index, p=weights)
 
     def _get_likelihoods(self, table_rows, parent_rows, table_name):
+        positions, names = _get_extension_index(tuple(parent_rows.columns), table_name)
+        values = parent_rows.iloc[:, positions].values.astype(float)
+
         likelihoods = dict()
-        for parent_id, row in parent_rows.iterrows():
-            parameters = self._extract_parameters(row, table_name)
-            model = self.model(**self.model_kwargs)
-            model.set_parameters(parameters)
+        for parent_id, row_values in zip(parent_rows.index, values):
+            model = self._get_child_model(table_name, names, row_values)
             try:
                 likelihoods[parent_id] = model.model.probability_density(table_rows)
             except np.linalg.LinAlgError:
@@ -252,11 +461,213 @@ class Sampler:
         parent_rows = parent_rows.set_index(primary_key)
         num_rows = parent_rows['__' + table_name + '__child_rows'].clip(0)
 
+        grouped_model = self._get_grouped_model()
+        if grouped_model is not None:
+            parameters = self._get_extension_parameters(parent_rows, table_name)
+            positions = grouped_model.sample_groups(
+                parameters, table_rows, num_rows.values, random_state=self._random_state)
+            return pd.Series(parent_rows.index[positions], index=table_rows.index)
+
         likelihoods = self._get_likelihoods(table_rows, parent_rows, table_name)
-        return likelihoods.apply(self._find_parent_id, axis=1, num_rows=num_rows)
+        return likelihoods.apply(self._find_parent_id, axis=1, num_rows=num_rows,
+                                 random_state=self._random_state)
+
+    def _sample_table(self, table_name, num_rows, sample_children):
+        model = self.models[table_name]
+        table_rows = self._sample_rows(model, num_rows, table_name)
+
+        if sample_children:
+            sampled_data = {
+                table_name: table_rows
+            }
+
+            self._sample_children(table_name, sampled_data)
+            return self._finalize(sampled_data)
+
+        else:
+            return self._finalize({table_name: table_rows})[table_name]
+
+    def _sample_blocks(self, table_name, num_rows, seed_sequence, first_block=0,
+                       sample_children=True):
+        """Sample one table in blocks of rows that draw from their own random streams.
+
+        The rows of the table are split in blocks of ``RANDOM_BLOCK_SIZE`` rows, and
+        each block is sampled, together with its children, using a generator built
+        from the child of ``seed_sequence`` identified by the position of the table
+        and the position of the block. This way the output of a block only depends
+        on the seed, its position and the state of the primary key generators, and
+        sampling the blocks in several calls gives the same rows as a single call.
+
+        Args:
+            table_name (str):
+                Table name to sample.
+            num_rows (int):
+                Amount of rows to sample.
+            seed_sequence (numpy.random.SeedSequence):
+                Seed from which the streams of the blocks are spawned.
+            first_block (int):
+                Position of the first block to sample. Defaults to ``0``.
+            sample_children (bool):
+                Whether or not sample child tables. Defaults to ``True``.
+
+        Returns:
+            dict or pandas.DataFrame:
+                Same as ``sample``.
+        """
+        table_seed = _spawn(seed_sequence, self.metadata.get_tables().index(table_name))
+        block_size = self.RANDOM_BLOCK_SIZE
+
+        sampled = list()
+        starts = range(0, max(num_rows, 1), block_size)
+        for block, start in enumerate(starts, first_block):
+            self._random_state = np.random.default_rng(_spawn(table_seed, block))
+            try:
+                sampled.append(self._sample_table(
+                    table_name, min(block_size, num_rows - start), sample_children))
+            finally:
+                self._random_state = None
+
+        if not sample_children:
+            return pd.concat(sampled, ignore_index=True)
+
+        return self._concat_sampled(sampled)
+
+    @staticmethod
+    def _concat_sampled(sampled):
+        """Concatenate, table by table, a list of dicts of sampled tables."""
+        sampled_data = dict()
+        for block_data in sampled:
+            for name, data in block_data.items():
+                sampled_data.setdefault(name, list()).append(data)
+
+        return {
+            name: pd.concat(blocks, ignore_index=True)
+            for name, blocks in sampled_data.items()
+        }
+
+    def _map_keys(self, sampled_data, table_name, keys):
+        """Replace the key positions of a table, and the foreign keys to it, with keys."""
+        primary_key = self.metadata.get_primary_key(table_name)
+        if table_name in sampled_data:
+            table = sampled_data[table_name]
+            table[primary_key] = keys[table[primary_key].values.astype(int)]
+
+        for child_name in self.metadata.get_children(table_name):
+            if child_name in sampled_data:
+                child = sampled_data[child_name]
+                foreign_key = self.metadata.get_foreign_key(table_name, child_name)
+                child[foreign_key] = keys[child[foreign_key].values.astype(int)]
+
+    def _get_pool(self, num_processes, table_name=None):
+        """Start a pool of worker processes that hold a copy of this sampler.
+
+        Args:
+            num_processes (int):
+                Number of worker processes.
+            table_name (str):
+                Name of the table that the workers will sample. If ``None``, they
+                can sample any table. Defaults to ``None``.
+
+        Returns:
+            multiprocessing.pool.Pool
+        """
+        # Load the tables once here instead of in every worker.
+        self.prefetch(table_name)
+        return get_pool_context().Pool(num_processes, _initialize_worker, (self, ))
+
+    def _sample_parallel(self, table_name, num_rows, seed_sequence, num_processes,
+                         first_block=0, pool=None):
+        """Sample the blocks of a table in several processes.
+
+        The blocks are split in contiguous partitions that are sampled in worker
+        processes, which get a copy of this sampler, and merged in order. Each worker
+        samples its partition with keys that indicate positions in the key space
+        of each table. Afterwards, every partition gets the range of keys that
+        follows the range of the previous one, so the result is identical to
+        calling ``_sample_blocks`` on all the blocks in this process.
+
+        Args:
+            table_name (str):
+                Table name to sample.
+            num_rows (int):
+                Amount of rows to sample.
+            seed_sequence (numpy.random.SeedSequence):
+                Seed from which the streams of the blocks are spawned.
+            num_processes (int):
+                Number of worker processes.
+            first_block (int):
+                Position of the first block to sample. Defaults to ``0``.
+            pool (multiprocessing.pool.Pool):
+                Pool built with ``_get_pool`` to sample in. If ``None``, a new pool
+                is started and closed afterwards. Defaults to ``None``.
+
+        Returns:
+            dict:
+                Sampled tables.
+        """
+        block_size = self.RANDOM_BLOCK_SIZE
+        num_blocks = max(-(-num_rows // block_size), 1)
+        partitions = [
+            (table_name, min(num_rows, (blocks[-1] + 1) * block_size) - blocks[0] * block_size,
+             seed_sequence, first_block + blocks[0])
+            for blocks in np.array_split(np.arange(num_blocks), num_processes * 4)
+            if len(blocks)
+        ]
+
+        if pool is None:
+            num_processes = min(num_processes, len(partitions))
+            with self._get_pool(num_processes, table_name) as pool:
+                results = pool.map(_sample_partition, partitions)
+
+        else:
+            results = pool.map(_sample_partition, partitions)
+
+        for name in self.metadata.get_tables():
+            total_keys = sum(num_keys.get(name, 0) for _, num_keys in results)
+            if not total_keys:
+                continue
+
+            _, keys = self._get_primary_keys(name, total_keys)
+            keys = keys.values
+            start = 0
+            for sampled_data, num_keys in results:
+                stop = start + num_keys[name]
+                self._map_keys(sampled_data, name, keys[start:stop])
+                start = stop
+
+        return self._concat_sampled([sampled_data for sampled_data, _ in results])
+
+    def prefetch(self, table_name=None):
+        """Load the models and hyper transformers needed to sample the given table.
+
+        These are the ones of the table, its descendants and the parents of all
+        of them, which are sampled to find the foreign keys of the sampled rows.
+        This only has an effect when they are held in ``LazyDict`` instances, which
+        build them on first access.
+
+        Args:
+            table_name (str):
+                Name of the table whose subtree will be sampled. If ``None``,
+                load all the tables. Defaults to ``None``.
+        """
+        if table_name is None:
+            table_names = set(self.metadata.get_tables())
+        else:
+            table_names = set()
+            pending = [table_name]
+            while pending:
+                name = pending.pop()
+                table_names.add(name)
+                table_names.update(self.metadata.get_parents(name))
+                pending.extend(self.metadata.get_children(name))
+
+        for name in sorted(table_names):
+            self.models[name]
+            # Tables without fitted transformers are missing, so do not index them.
+            self.metadata._hyper_transformers.get(name)
 
     def sample(self, table_name, num_rows=None, reset_primary_keys=False,
-               sample_children=True, sample_parents=True):
+               sample_children=True, sample_parents=True, random_state=None):
         """Sample one table.
 
         Child tables will be sampled when ``sample_children`` is ``True``.
@@ -275,6 +686,11 @@ class Sampler:
                 Whether or not sample child tables. Defaults to ``True``.
             sample_parents (bool):
                 Whether or not sample parent tables. Defaults to ``True``.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If given, the rows
+                are sampled in blocks of ``RANDOM_BLOCK_SIZE`` rows with a random stream
+                spawned for each block. If ``None``, the global ``numpy`` random state
+                is used.
 
         Returns:
             dict or pandas.DataFrame:
@@ -288,21 +704,15 @@ class Sampler:
         if num_rows is None:
             num_rows = self.table_sizes[table_name]
 
-        model = self.models[table_name]
-        table_rows = self._sample_rows(model, num_rows, table_name)
-
-        if sample_children:
-            sampled_data = {
-                table_name: table_rows
-            }
+        if random_state is None:
+            return self._sample_table(table_name, num_rows, sample_children)
 
-            self._sample_children(table_name, sampled_data)
-            return self._finalize(sampled_data)
-
-        else:
-            return self._finalize({table_name: table_rows})[table_name]
+        seed_sequence = _get_seed_sequence(random_state)
+        return self._sample_blocks(
+            table_name, num_rows, seed_sequence, sample_children=sample_children)
 
-    def sample_all(self, num_rows=None, reset_primary_keys=False):
+    def sample_all(self, num_rows=None, reset_primary_keys=False, random_state=None,
+                   n_jobs=None):
         """Sample the entire dataset.
 
         ``sample_all`` returns a dictionary with all the tables of the dataset sampled.
@@ -318,6 +728,16 @@ class Sampler:
                 sample the same number of rows as in the original tables.
             reset_primary_keys (bool):
                 Whether or not reset the primary key generators.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If ``None``, the
+                global ``numpy`` random state is used.
+            n_jobs (int):
+                Number of processes to sample in. The blocks of ``RANDOM_BLOCK_SIZE``
+                rows of the first parent tables are split in partitions which are
+                sampled, with all their descendants, in separate processes. The output
+                is identical to sampling with the same ``random_state`` in a single
+                process. If ``-1``, use all the available CPUs. Defaults to ``None``,
+                which samples everything in this process.
 
         Returns:
             dict:
@@ -327,9 +747,121 @@ class Sampler:
         if reset_primary_keys:
             self._reset_primary_keys_generators()
 
+        num_processes = get_num_processes(n_jobs)
+        if num_processes > 1 and random_state is None:
+            # The workers cannot share the global random state, so use fresh entropy.
+            random_state = np.random.SeedSequence()
+
+        if random_state is not None:
+            random_state = _get_seed_sequence(random_state)
+
         sampled_data = dict()
         for table in self.metadata.get_tables():
             if not self.metadata.get_parents(table):
-                sampled_data.update(self.sample(table, num_rows))
+                if num_processes > 1:
+                    table_rows = self.table_sizes[table] if num_rows is None else num_rows
+                    sampled_data.update(self._sample_parallel(
+                        table, table_rows, random_state, num_processes))
+                else:
+                    sampled_data.update(self.sample(table, num_rows, random_state=random_state))
 
         return sampled_data
+
+    def sample_iter(self, num_rows=None, chunk_size=1000, reset_primary_keys=False,
+                    random_state=None, n_jobs=None):
+        """Sample the entire dataset in chunks.
+
+        The tables without parents are sampled in chunks of at most ``chunk_size``
+        rows, and for each chunk all its descendant tables are sampled and finalized
+        before yielding it. The primary key generators are shared by all the chunks,
+        so the primary keys are unique across the whole output.
+
+        If ``random_state`` or ``n_jobs`` are given, ``chunk_size`` must be a multiple
+        of ``RANDOM_BLOCK_SIZE`` and the concatenation of the chunks is identical
+        to the output of ``sample_all`` with the same ``random_state``.
+
+        Args:
+            num_rows (int):
+                Number of rows to be sampled on the first parent tables. If ``None``,
+                sample the same number of rows as in the original tables.
+            chunk_size (int):
+                Maximum number of rows of the first parent tables to sample in each
+                chunk. Defaults to ``1000``.
+            reset_primary_keys (bool):
+                Whether or not reset the primary key generators before sampling.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If ``None``, the
+                global ``numpy`` random state is used.
+            n_jobs (int):
+                Number of processes in which to sample the blocks of each chunk, like in
+                ``sample_all``. One pool of processes is shared by all the chunks, and
+                the blocks of each chunk are split among them, so the chunks should have
+                several blocks per process. If ``-1``, use all the available CPUs.
+                Defaults to ``None``, which samples in this process.
+
+        Yields:
+            dict:
+                A dictionary containing as keys the names of the tables sampled in the
+                chunk and as values the sampled rows as ``pandas.DataFrame``.
+
+        Raises:
+            ValueError:
+                If ``random_state`` or ``n_jobs`` are given and ``chunk_size`` is not
+                a multiple of ``RANDOM_BLOCK_SIZE``.
+        """
+        num_processes = get_num_processes(n_jobs)
+        if num_processes > 1 and random_state is None:
+            # The workers cannot share the global random state, so use fresh entropy.
+            random_state = np.random.SeedSequence()
+
+        if random_state is not None:
+            if chunk_size % self.RANDOM_BLOCK_SIZE:
+                raise ValueError('chunk_size must be a multiple of {} to use a random_state '
+                                 'or n_jobs'.format(self.RANDOM_BLOCK_SIZE))
+
+            random_state = _get_seed_sequence(random_state)
+
+        if reset_primary_keys:
+            self._reset_primary_keys_generators()
+
+        roots = [
+            table for table in self.metadata.get_tables()
+            if not self.metadata.get_parents(table)
+        ]
+
+        # Like in ``sample_all``, a table reachable from several roots is only
+        # kept from the last one that samples it.
+        owners = dict()
+        for root in roots:
+            pending = [root]
+            while pending:
+                table = pending.pop()
+                owners[table] = root
+                pending.extend(self.metadata.get_children(table))
+
+        with contextlib.ExitStack() as stack:
+            pool = None
+            if num_processes > 1:
+                pool = stack.enter_context(self._get_pool(num_processes))
+
+            for root in roots:
+                table_rows = self.table_sizes[root] if num_rows is None else num_rows
+                for start in range(0, table_rows, chunk_size):
+                    chunk_rows = min(chunk_size, table_rows - start)
+                    if random_state is None:
+                        sampled_data = self.sample(root, chunk_rows)
+                    else:
+                        first_block = start // self.RANDOM_BLOCK_SIZE
+                        if pool is None:
+                            sampled_data = self._sample_blocks(
+                                root, chunk_rows, random_state, first_block)
+                        else:
+                            sampled_data = self._sample_parallel(
+                                root, chunk_rows, random_state, num_processes, first_block,
+                                pool)
+
+                    yield {
+                        table: data
+                        for table, data in sampled_data.items()
+                        if owners[table] == root
+                    }
@@ -2,14 +2,17 @@
 
 """Main SDV module."""
 
+import os
 import pickle
 
 from copulas.univariate import GaussianUnivariate
 
+from sdv import serialization
 from sdv.metadata import Metadata
 from sdv.modeler import Modeler
 from sdv.models.copulas import GaussianCopula
 from sdv.sampler import Sampler
+from sdv.writers import get_writer
 
 DEFAULT_MODEL = GaussianCopula
 DEFAULT_MODEL_KWARGS = {
@@ -45,7 +48,8 @@ class SDV:
         else:
             self.model_kwargs = model_kwargs
 
-    def fit(self, metadata, tables=None, root_path=None):
+    def fit(self, metadata, tables=None, root_path=None, n_jobs=None, incremental=False,
+            low_memory=False):
         """Fit this SDV instance to the dataset data.
 
         Args:
@@ -59,6 +63,20 @@ class SDV:
                 Path to the dataset directory. If ``None`` and metadata is
                 a path, the metadata location is used. If ``None`` and
                 metadata is a dict, the current working directory is used.
+            n_jobs (int):
+                Number of workers to use to model independent subtrees of the dataset
+                and to fit the child models of the different foreign key values.
+                If ``-1``, use all the available CPUs. Defaults to ``None``, which
+                models everything sequentially.
+            incremental (bool):
+                Whether to keep the sufficient statistics of the dataset so the models
+                can later be updated with new rows using ``update``. Only supported
+                for ``GaussianCopula`` models with ``GaussianUnivariate`` marginals.
+                Defaults to ``False``.
+            low_memory (bool):
+                Whether to release the child tables as soon as they are reduced to the
+                extensions of their parents, and to record the peak memory allocated while
+                modeling each table in ``self.modeler.memory_stats``. Defaults to ``False``.
         """
         if isinstance(metadata, Metadata):
             self.metadata = metadata
@@ -67,12 +85,39 @@ class SDV:
 
         self.metadata.validate(tables)
 
-        self.modeler = Modeler(self.metadata, self.model, self.model_kwargs)
+        self.modeler = Modeler(self.metadata, self.model, self.model_kwargs, n_jobs=n_jobs,
+                               incremental=incremental, low_memory=low_memory)
         self.modeler.model_database(tables)
         self.sampler = Sampler(self.metadata, self.modeler.models, self.model,
                                self.model_kwargs, self.modeler.table_sizes)
 
-    def sample(self, table_name, num_rows=None, sample_children=True, reset_primary_keys=False):
+    def update(self, tables):
+        """Update this SDV instance with new rows, without fitting it again.
+
+        The new rows are appended to the tables that this instance was fitted on
+        and the models are updated from the statistics collected while fitting,
+        so the tables do not need to be processed again.
+        This requires the instance to have been fitted with ``incremental=True``.
+
+        Args:
+            tables (dict):
+                Dictionary with the table names as key and ``pandas.DataFrame`` instances
+                with the new rows of each table as values.
+
+        Raises:
+            NotFittedError:
+                A ``NotFittedError`` is raised when the ``SDV`` instance has not been fitted yet.
+            ValueError:
+                A ``ValueError`` is raised when the ``SDV`` instance was not fitted with
+                ``incremental=True``.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
+
+        self.modeler.update(tables)
+
+    def sample(self, table_name, num_rows=None, sample_children=True, reset_primary_keys=False,
+               random_state=None):
         """Sample ``num_rows`` rows from the indicated table.
 
         Args:
@@ -85,6 +130,9 @@ class SDV:
                 Whether or not to sample children tables. Defaults to ``True``.
             reset_primary_keys (bool):
                 Wheter or not reset the primary key generators. Defaults to ``False``.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from, which makes the
+                output reproducible. If ``None``, the global ``numpy`` random state is used.
 
         Returns:
             pandas.DataFrame:
@@ -101,10 +149,12 @@ class SDV:
             table_name,
             num_rows,
             sample_children=sample_children,
-            reset_primary_keys=reset_primary_keys
+            reset_primary_keys=reset_primary_keys,
+            random_state=random_state
         )
 
-    def sample_all(self, num_rows=None, reset_primary_keys=False):
+    def sample_all(self, num_rows=None, reset_primary_keys=False, random_state=None,
+                   n_jobs=None):
         """Sample the entire dataset.
 
         Args:
@@ -113,6 +163,14 @@ class SDV:
                 sample the same number of rows as in the original tables.
             reset_primary_keys (bool):
                 Wheter or not reset the primary key generators. Defaults to ``False``.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from, which makes the
+                output reproducible. If ``None``, the global ``numpy`` random state is used.
+            n_jobs (int):
+                Number of processes in which to sample partitions of the rows of the first
+                parent tables. The output is identical to sampling with the same
+                ``random_state`` in a single process. If ``-1``, use all the available
+                CPUs. Defaults to ``None``, which samples everything in this process.
 
         Returns:
             dict:
@@ -125,25 +183,198 @@ class SDV:
         if self.sampler is None:
             raise NotFittedError('SDV instance has not been fitted')
 
-        return self.sampler.sample_all(num_rows, reset_primary_keys=reset_primary_keys)
+        return self.sampler.sample_all(num_rows, reset_primary_keys=reset_primary_keys,
+                                       random_state=random_state, n_jobs=n_jobs)
+
+    def sample_iter(self, num_rows=None, chunk_size=1000, reset_primary_keys=False,
+                    random_state=None, n_jobs=None):
+        """Sample the entire dataset in chunks.
 
-    def save(self, path):
-        """Save this SDV instance to the given path using pickle.
+        Each chunk contains up to ``chunk_size`` rows of the tables without parents
+        together with all their sampled descendants, so the dataset can be processed
+        or written to disk without holding all of it in memory.
+        The primary keys are unique across all the chunks.
+
+        Args:
+            num_rows (int):
+                Number of rows to be sampled on the first parent tables. If ``None``,
+                sample the same number of rows as in the original tables.
+            chunk_size (int):
+                Maximum number of rows of the first parent tables in each chunk.
+                Defaults to ``1000``.
+            reset_primary_keys (bool):
+                Wheter or not reset the primary key generators. Defaults to ``False``.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If given, ``chunk_size``
+                must be a multiple of ``Sampler.RANDOM_BLOCK_SIZE`` and the concatenation
+                of the chunks is identical to the output of ``sample_all`` with the same
+                ``random_state``. If ``None``, the global ``numpy`` random state is used.
+            n_jobs (int):
+                Number of processes in which to sample the blocks of each chunk. If given,
+                ``chunk_size`` must be a multiple of ``Sampler.RANDOM_BLOCK_SIZE``.
+                If ``-1``, use all the available CPUs. Defaults to ``None``, which
+                samples everything in this process.
+
+        Returns:
+            generator:
+                Generator that yields dictionaries with the tables sampled in each chunk.
+
+        Raises:
+            NotFittedError:
+                A ``NotFittedError`` is raised when the ``SDV`` instance has not been fitted yet.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
+
+        return self.sampler.sample_iter(num_rows, chunk_size=chunk_size,
+                                        reset_primary_keys=reset_primary_keys,
+                                        random_state=random_state, n_jobs=n_jobs)
+
+    def sample_to(self, path, num_rows=None, format='parquet', chunk_size=1000,
+                  reset_primary_keys=False, random_state=None, n_jobs=None):
+        """Sample the entire dataset and write it to disk as it is sampled.
+
+        The dataset is sampled in chunks of ``chunk_size`` rows of the tables without
+        parents, and the rows of each chunk are appended to one file per table before
+        sampling the next one, so only one chunk is held in memory at any time.
+        Parquet files get one row group per chunk.
+
+        A ``metadata.json`` file pointing at the written files is stored next to them,
+        so the output can be loaded back with ``Metadata('<path>/metadata.json')``.
+
+        Args:
+            path (str):
+                Directory where the files are written. It is created if it does not exist.
+            num_rows (int):
+                Number of rows to be sampled on the first parent tables. If ``None``,
+                sample the same number of rows as in the original tables.
+            format (str):
+                Format of the files, ``'parquet'`` or ``'csv'``. Defaults to ``'parquet'``.
+            chunk_size (int):
+                Maximum number of rows of the first parent tables in each chunk.
+                Defaults to ``1000``.
+            reset_primary_keys (bool):
+                Wheter or not reset the primary key generators. Defaults to ``False``.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. See ``sample_iter``.
+            n_jobs (int):
+                Number of processes in which to sample the blocks of each chunk.
+                See ``sample_iter``.
+
+        Returns:
+            str:
+                Path of the ``metadata.json`` file.
+
+        Raises:
+            NotFittedError:
+                A ``NotFittedError`` is raised when the ``SDV`` instance has not been fitted yet.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
+
+        os.makedirs(path, exist_ok=True)
+        writer = get_writer(format, path, self.metadata)
+        chunks = self.sampler.sample_iter(num_rows, chunk_size=chunk_size,
+                                          reset_primary_keys=reset_primary_keys,
+                                          random_state=random_state, n_jobs=n_jobs)
+        try:
+            for chunk in chunks:
+                for table_name, data in chunk.items():
+                    writer.write(table_name, data)
+        finally:
+            writer.close()
+
+        metadata = self.metadata.to_dict()
+        for table_name, table_meta in metadata['tables'].items():
+            table_meta['path'] = writer.get_file_name(table_name)
+
+        metadata_path = os.path.join(path, 'metadata.json')
+        Metadata(metadata).to_json(metadata_path)
+
+        return metadata_path
+
+    def prefetch(self, table_name=None):
+        """Load the models and transformers needed to sample the given table.
+
+        This is only useful for instances loaded with ``lazy=True``, which load
+        the model and the transformers of each table when it is first used.
+
+        Args:
+            table_name (str):
+                Name of the table whose subtree will be sampled. If ``None``,
+                load all the tables. Defaults to ``None``.
+
+        Raises:
+            NotFittedError:
+                A ``NotFittedError`` is raised when the ``SDV`` instance has not been fitted yet.
+        """
+        if self.sampler is None:
+            raise NotFittedError('SDV instance has not been fitted')
+
+        self.sampler.prefetch(table_name)
+
+    def save(self, path, format='pickle'):
+        """Save this SDV instance to the given path.
+
+        With the ``'compact'`` format the covariance matrices and the parameters of the
+        univariate distributions are stored as ``.npy`` arrays and the metadata and the
+        state of the transformers as JSON, together with a format version. The files are
+        written to a directory, or to a single zip file if ``path`` ends with ``.zip``.
+        See ``sdv.serialization`` for the details.
 
         Args:
             path (str):
                 Path where the SDV instance will be serialized.
+            format (str):
+                ``'pickle'`` to pickle the whole instance or ``'compact'`` to use the
+                compact format, which only supports ``GaussianCopula`` models and
+                produces instances that can sample but cannot be updated after
+                loading them. Defaults to ``'pickle'``.
+
+        Raises:
+            NotFittedError:
+                A ``NotFittedError`` is raised when saving an ``SDV`` instance that has
+                not been fitted yet in the compact format.
+            ValueError:
+                A ``ValueError`` is raised when the format is unknown.
         """
-        with open(path, 'wb') as output:
-            pickle.dump(self, output)
+        if format == 'compact':
+            if self.sampler is None:
+                raise NotFittedError('SDV instance has not been fitted')
+
+            serialization.save(self, path)
+
+        elif format == 'pickle':
+            with open(path, 'wb') as output:
+                pickle.dump(self, output)
+
+        else:
+            raise ValueError('Unknown format `{}`. Use `pickle` or `compact`'.format(format))
 
     @classmethod
-    def load(cls, path):
+    def load(cls, path, mmap_mode='r', lazy=False):
         """Load a SDV instance from a given path.
 
+        The format of the stored instance is detected automatically.
+
         Args:
             path (str):
                 Path from which to load the SDV instance.
+            mmap_mode (str or None):
+                Memory-map mode used to load the arrays of instances stored in the
+                compact format in a directory. Defaults to ``'r'``.
+            lazy (bool):
+                Whether to load the model and the transformers of each table of an
+                instance stored in the compact format only when the table is first
+                used. Use ``prefetch`` to load the tables needed to sample a table
+                beforehand. Defaults to ``False``.
+
+        Returns:
+            SDV:
+                The loaded instance.
         """
+        if serialization.is_compact(path):
+            return serialization.load(cls, path, mmap_mode=mmap_mode, lazy=lazy)
+
         with open(path, 'rb') as f:
             return pickle.load(f)
@@ -0,0 +1,462 @@
+"""Compact, versioned storage format for fitted SDV instances.
+
+Instead of pickling the whole ``SDV`` instance, the compact format stores:
+
+    * ``metadata.json``: the dataset metadata, loadable with ``Metadata``.
+    * ``model.json``: the format version, the model class and arguments, the
+      number of rows of each table, the fitted state of the transformers and
+      the structure of the univariate distributions of each table model.
+    * ``arrays/<index>_covariance.npy`` and ``arrays/<index>_univariates.npy``:
+      the covariance matrix and the numerical parameters of the univariate
+      distributions of the model of each table.
+
+The files are either written to a directory, where the arrays can be loaded
+with ``mmap_mode``, or to a single zip file. Only classes from the ``sdv``,
+``copulas`` and ``rdt`` packages and a few builtin types can be referenced by
+the stored files, so loading them does not execute arbitrary code.
+
+Since the model and the transformers of each table are stored separately,
+they can also be loaded lazily, when each table is first used.
+"""
+
+import importlib
+import io
+import json
+import os
+import zipfile
+from collections.abc import MutableMapping
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from copulas import get_qualified_name
+from copulas.multivariate import GaussianMultivariate
+from rdt import HyperTransformer
+
+from sdv import __version__
+from sdv.metadata import Metadata
+from sdv.modeler import Modeler
+from sdv.models.copulas import GaussianCopula
+from sdv.sampler import Sampler
+
+FORMAT_VERSION = 1
+METADATA_FILE = 'metadata.json'
+MODEL_FILE = 'model.json'
+ARRAY_FILE = 'arrays/{}_{}.npy'
+ALLOWED_PACKAGES = ('sdv', 'copulas', 'rdt')
+ALLOWED_BUILTINS = {
+    'builtins.bool': bool,
+    'builtins.float': float,
+    'builtins.int': int,
+    'builtins.object': object,
+    'builtins.str': str,
+}
+
+
+def _import_class(qualified_name):
+    """Import a class by its qualified name, only from the allowed packages.
+
+    Args:
+        qualified_name (str):
+            Qualified name of the class, like ``copulas.univariate.GaussianUnivariate``.
+
+    Returns:
+        type:
+            The imported class.
+
+    Raises:
+        ValueError:
+            If the class does not belong to any of the allowed packages.
+    """
+    if qualified_name in ALLOWED_BUILTINS:
+        return ALLOWED_BUILTINS[qualified_name]
+
+    module_name, class_name = qualified_name.rsplit('.', 1)
+    if module_name.split('.')[0] not in ALLOWED_PACKAGES:
+        raise ValueError('Class `{}` cannot be loaded from a compact model'.format(
+            qualified_name))
+
+    class_ = getattr(importlib.import_module(module_name), class_name)
+    if not isinstance(class_, type):
+        raise ValueError('`{}` is not a class'.format(qualified_name))
+
+    return class_
+
+
+def _encode(value):
+    """Encode the given value as a JSON serializable structure.
+
+    Builtin values are kept as they are, while tuples, dicts with keys that are
+    not strings, ``numpy`` arrays and dtypes, timestamps, classes and instances of
+    the allowed packages are encoded as dicts with a single ``__<kind>__`` key.
+
+    Raises:
+        ValueError:
+            If the value cannot be encoded.
+    """
+    if value is None or isinstance(value, (bool, str)):
+        return value
+
+    if isinstance(value, np.generic):
+        return _encode(value.item())
+
+    if isinstance(value, (int, float)):
+        return value
+
+    if isinstance(value, type):
+        return {'__type__': get_qualified_name(value)}
+
+    if isinstance(value, np.dtype):
+        return {'__dtype__': value.str}
+
+    if isinstance(value, np.ndarray):
+        return {'__array__': _encode(value.tolist()), 'dtype': value.dtype.str}
+
+    if isinstance(value, pd.Timestamp):
+        return {'__timestamp__': value.isoformat()}
+
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item) for item in value]}
+
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and not key.startswith('__') for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+
+        return {'__dict__': [[_encode(key), _encode(item)] for key, item in value.items()]}
+
+    qualified_name = get_qualified_name(value)
+    if qualified_name.split('.')[0] in ALLOWED_PACKAGES and hasattr(value, '__dict__'):
+        return {'__object__': qualified_name, 'state': _encode(vars(value))}
+
+    raise ValueError('Values of type `{}` cannot be stored in a compact model'.format(
+        type(value).__name__))
+
+
+def _decode(value):
+    """Decode a structure built by ``_encode``."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+
+    if isinstance(value, float) and np.isnan(value):
+        return np.nan
+
+    if not isinstance(value, dict):
+        return value
+
+    if '__type__' in value:
+        return _import_class(value['__type__'])
+
+    if '__dtype__' in value:
+        return np.dtype(value['__dtype__'])
+
+    if '__array__' in value:
+        return np.array(_decode(value['__array__']), dtype=value['dtype'])
+
+    if '__timestamp__' in value:
+        return pd.Timestamp(value['__timestamp__'])
+
+    if '__tuple__' in value:
+        return tuple(_decode(item) for item in value['__tuple__'])
+
+    if '__dict__' in value:
+        return {_decode(key): _decode(item) for key, item in value['__dict__']}
+
+    if '__object__' in value:
+        class_ = _import_class(value['__object__'])
+        instance = class_.__new__(class_)
+        instance.__dict__.update(_decode(value['state']))
+        return instance
+
+    return {key: _decode(item) for key, item in value.items()}
+
+
+def _encode_univariate(univariate, values):
+    """Split the parameters of a univariate into a JSON structure and a list of numbers.
+
+    The numerical parameters are appended to ``values`` and referenced by their
+    position in it, while the rest of them are encoded with ``_encode``.
+    """
+    parameters = univariate.to_dict()
+    encoded = {'type': parameters.pop('type'), 'arrays': dict(), 'values': dict()}
+    for name, parameter in parameters.items():
+        array = np.asarray(parameter)
+        if array.dtype.kind in 'biuf':
+            start = len(values)
+            values.extend(array.ravel().tolist())
+            encoded['arrays'][name] = [start, len(values), list(array.shape)]
+        else:
+            encoded['values'][name] = _encode(parameter)
+
+    return encoded
+
+
+def _decode_univariate(encoded, values):
+    """Rebuild a univariate from the output of ``_encode_univariate``."""
+    parameters = _decode(encoded['values'])
+    for name, (start, stop, shape) in encoded['arrays'].items():
+        array = np.asarray(values[start:stop]).reshape(shape)
+        parameters[name] = array.item() if not shape else array
+
+    univariate = _import_class(encoded['type'])()
+    univariate._set_params(parameters)
+    univariate.fitted = True
+    return univariate
+
+
+def _encode_transformers(metadata):
+    """Encode the fitted transformers of each table of the metadata."""
+    transformers = dict()
+    for table_name, hyper_transformer in metadata._hyper_transformers.items():
+        transformers[table_name] = {
+            column: _encode(transformer)
+            for column, transformer in hyper_transformer._transformers.items()
+        }
+
+    return transformers
+
+
+def _decode_hyper_transformer(encoded):
+    """Rebuild the fitted ``HyperTransformer`` of a table."""
+    transformers = {column: _decode(value) for column, value in encoded.items()}
+    hyper_transformer = HyperTransformer(transformers=transformers)
+    hyper_transformer._transformers = transformers
+    return hyper_transformer
+
+
+def _to_bytes(array):
+    output = io.BytesIO()
+    np.save(output, array, allow_pickle=False)
+    return output.getvalue()
+
+
+def save(instance, path):
+    """Store a fitted ``SDV`` instance in the compact format.
+
+    If ``path`` ends with ``.zip`` a single zip file is written. Otherwise, the
+    files are written to a directory, which is created if it does not exist.
+
+    Args:
+        instance (SDV):
+            Fitted ``SDV`` instance.
+        path (str):
+            Path of the directory or zip file to write.
+
+    Raises:
+        ValueError:
+            If the instance does not use ``GaussianCopula`` models or holds
+            values that cannot be stored in the compact format.
+    """
+    if not (isinstance(instance.model, type) and issubclass(instance.model, GaussianCopula)):
+        raise ValueError('Only SDV instances that use GaussianCopula models can be stored '
+                         'in the compact format')
+
+    files = dict()
+    tables = list()
+    for index, (table_name, model) in enumerate(instance.sampler.models.items()):
+        values = list()
+        univariates = [
+            _encode_univariate(univariate, values)
+            for univariate in model.model.univariates
+        ]
+        tables.append({
+            'name': table_name,
+            'columns': list(model.model.columns),
+            'univariates': univariates,
+        })
+        covariance = np.asarray(model.model.covariance, dtype=float)
+        files[ARRAY_FILE.format(index, 'covariance')] = _to_bytes(covariance)
+        files[ARRAY_FILE.format(index, 'univariates')] = _to_bytes(np.array(values, dtype=float))
+
+    model_spec = {
+        'format_version': FORMAT_VERSION,
+        'sdv_version': __version__,
+        'model': get_qualified_name(instance.model),
+        'model_kwargs': _encode(instance.model_kwargs),
+        'table_sizes': _encode(instance.sampler.table_sizes),
+        'transformers': _encode_transformers(instance.metadata),
+        'tables': tables,
+    }
+    files[MODEL_FILE] = json.dumps(model_spec, indent=4).encode()
+    files[METADATA_FILE] = json.dumps(instance.metadata.to_dict(), indent=4).encode()
+
+    if path.endswith('.zip'):
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for name, content in files.items():
+                zip_file.writestr(name, content)
+
+    else:
+        os.makedirs(os.path.join(path, 'arrays'), exist_ok=True)
+        for name, content in files.items():
+            with open(os.path.join(path, name), 'wb') as output:
+                output.write(content)
+
+
+def is_compact(path):
+    """Tell whether the given path contains a model stored in the compact format.
+
+    Args:
+        path (str):
+            Path to a directory or file.
+
+    Returns:
+        bool:
+            ``True`` if the path is a directory or zip file with a ``model.json`` file.
+    """
+    if os.path.isdir(path):
+        return os.path.exists(os.path.join(path, MODEL_FILE))
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zip_file:
+            return MODEL_FILE in zip_file.namelist()
+
+    return False
+
+
+def _read(path, name):
+    """Read a file of a model stored in a directory or zip file."""
+    if os.path.isdir(path):
+        with open(os.path.join(path, name), 'rb') as input_file:
+            return input_file.read()
+
+    with zipfile.ZipFile(path) as zip_file:
+        return zip_file.read(name)
+
+
+def _load_array(path, name, mmap_mode):
+    """Load an array of a model stored in a directory or zip file."""
+    if os.path.isdir(path):
+        return np.load(os.path.join(path, name), mmap_mode=mmap_mode, allow_pickle=False)
+
+    return np.load(io.BytesIO(_read(path, name)), allow_pickle=False)
+
+
+def _load_table_model(path, index, table, model, model_kwargs, mmap_mode):
+    """Rebuild the model of one table from its arrays and its entry of ``model.json``."""
+    values = _load_array(path, ARRAY_FILE.format(index, 'univariates'), mmap_mode)
+    multivariate = GaussianMultivariate(distribution=model_kwargs.get('distribution'))
+    multivariate.columns = table['columns']
+    multivariate.univariates = [
+        _decode_univariate(univariate, values)
+        for univariate in table['univariates']
+    ]
+    multivariate.covariance = _load_array(path, ARRAY_FILE.format(index, 'covariance'), mmap_mode)
+    multivariate.fitted = True
+
+    table_model = model(**model_kwargs)
+    table_model.model = multivariate
+    return table_model
+
+
+class LazyDict(MutableMapping):
+    """Dictionary whose values are built by calling a loader on first access.
+
+    The loaders must be picklable, like ``functools.partial`` objects of module
+    level functions, so the values that have not been loaded yet can be shipped
+    to other processes without loading them.
+
+    Args:
+        loaders (dict):
+            Dictionary with the keys as keys and functions without arguments that
+            build the corresponding values as values.
+    """
+
+    def __init__(self, loaders):
+        self._loaders = dict(loaders)
+        self._values = dict()
+
+    def is_loaded(self, key):
+        """Tell whether the value of the given key has already been built."""
+        return key in self._values
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            loader = self._loaders[key]
+            self._values[key] = loader()
+            del self._loaders[key]
+
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        self._loaders.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        if key in self._values:
+            del self._values[key]
+        else:
+            del self._loaders[key]
+
+    def __iter__(self):
+        yield from self._values
+        yield from list(self._loaders)
+
+    def __len__(self):
+        return len(self._values) + len(self._loaders)
+
+
+def load(cls, path, mmap_mode='r', lazy=False):
+    """Load an ``SDV`` instance stored in the compact format.
+
+    Args:
+        cls (type):
+            ``SDV`` class to instantiate.
+        path (str):
+            Path of the directory or zip file to load.
+        mmap_mode (str or None):
+            Memory-map mode passed to ``numpy.load`` when loading the arrays of a
+            directory. Defaults to ``'r'``, which reads the values from disk only
+            when they are used. The arrays of zip files are always read in memory.
+        lazy (bool):
+            Whether to build the model and the transformers of each table only when
+            they are first used, using ``LazyDict`` instances for the models of the
+            sampler and the hyper transformers of the metadata. Defaults to ``False``.
+
+    Returns:
+        SDV:
+            The loaded instance, which can sample but cannot be updated.
+
+    Raises:
+        ValueError:
+            If the files were written with a newer version of the format.
+    """
+    model_spec = json.loads(_read(path, MODEL_FILE).decode())
+    format_version = model_spec.get('format_version')
+    if not isinstance(format_version, int) or format_version > FORMAT_VERSION:
+        raise ValueError('Unsupported compact model format version `{}`. Upgrade SDV to '
+                         'load this model.'.format(format_version))
+
+    metadata = Metadata(json.loads(_read(path, METADATA_FILE).decode()))
+    model = _import_class(model_spec['model'])
+    model_kwargs = _decode(model_spec['model_kwargs'])
+
+    transformer_loaders = {
+        table_name: partial(_decode_hyper_transformer, encoded)
+        for table_name, encoded in model_spec['transformers'].items()
+    }
+    model_loaders = {
+        table['name']: partial(_load_table_model, path, index, table, model, model_kwargs,
+                               mmap_mode)
+        for index, table in enumerate(model_spec['tables'])
+    }
+    if lazy:
+        metadata._hyper_transformers = LazyDict(transformer_loaders)
+        models = LazyDict(model_loaders)
+    else:
+        metadata._hyper_transformers = {
+            table_name: loader()
+            for table_name, loader in transformer_loaders.items()
+        }
+        models = {table_name: loader() for table_name, loader in model_loaders.items()}
+
+    table_sizes = _decode(model_spec['table_sizes'])
+    instance = cls(model, model_kwargs)
+    instance.metadata = metadata
+    instance.modeler = Modeler(metadata, model, model_kwargs)
+    instance.modeler.models = models
+    instance.modeler.table_sizes = table_sizes
+    instance.sampler = Sampler(metadata, models, model, model_kwargs, table_sizes)
+
+    return instance
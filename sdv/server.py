@@ -0,0 +1,398 @@
+"""Local sampling service that keeps fitted models in memory.
+
+The service loads one or more saved ``SDV`` or ``BaseTabularModel`` instances once
+and serves sampling requests over HTTP, either on a TCP port or on a Unix socket:
+
+    * ``GET /models``: JSON description of the loaded models and their tables.
+    * ``GET /sample?model=<name>&table=<table>&num_rows=<n>&format=<csv|arrow>``:
+      rows of one table, without children. ``table`` is only used with ``SDV`` models.
+    * ``GET /sample_all?model=<name>&num_rows=<n>&format=<csv|arrow>``: all the
+      tables of an ``SDV`` model, in a zip file with one file per table.
+
+Both sampling endpoints accept an optional ``random_state`` integer. Concurrent
+requests for a few rows of the same table that arrive within ``batch_wait``
+seconds are sampled together in one call to the model and split afterwards.
+"""
+
+import http.server
+import io
+import json
+import logging
+import os
+import pickle
+import socketserver
+import threading
+import time
+import zipfile
+from concurrent.futures import Future
+from urllib.parse import parse_qs, urlparse
+
+from sdv import serialization
+from sdv.sdv import SDV
+
+LOGGER = logging.getLogger(__name__)
+
+FORMATS = {
+    'csv': 'text/csv',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+STREAM_CHUNK_SIZE = 10000
+
+
+def load_model(path):
+    """Load a saved ``SDV`` or ``BaseTabularModel`` instance.
+
+    Args:
+        path (str):
+            Path to a pickle file or to an ``SDV`` instance stored in the compact format.
+
+    Returns:
+        SDV or BaseTabularModel:
+            The loaded model.
+    """
+    if serialization.is_compact(path):
+        return SDV.load(path)
+
+    with open(path, 'rb') as input_file:
+        return pickle.load(input_file)
+
+
+class _Batch:
+    """Requests for rows of the same table that are sampled together."""
+
+    def __init__(self):
+        self.requests = list()
+        self.num_rows = 0
+
+
+class ModelServer:
+    """Sample from several fitted models, batching concurrent small requests.
+
+    The models are not thread safe, so all the calls to the same model are
+    serialized with a lock.
+
+    Args:
+        models (dict):
+            Dictionary with the model names as keys and fitted ``SDV`` or
+            ``BaseTabularModel`` instances as values.
+        batch_wait (float):
+            Seconds to wait for other requests of the same table before sampling
+            a batch. Defaults to ``0.01``.
+        max_batch_rows (int):
+            Maximum number of rows of a batch. Requests for more rows, and requests
+            with a ``random_state``, are sampled on their own. Defaults to ``10000``.
+    """
+
+    def __init__(self, models, batch_wait=0.01, max_batch_rows=10000):
+        self.models = models
+        self.batch_wait = batch_wait
+        self.max_batch_rows = max_batch_rows
+        self._locks = {name: threading.Lock() for name in models}
+        self._batches = dict()
+        self._batches_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, paths, **kwargs):
+        """Load the models from disk and build a ``ModelServer`` with them.
+
+        Args:
+            paths (dict):
+                Dictionary with the model names as keys and their paths as values.
+            **kwargs:
+                Additional arguments for the ``ModelServer``.
+
+        Returns:
+            ModelServer
+        """
+        models = dict()
+        for name, path in paths.items():
+            start = time.time()
+            models[name] = load_model(path)
+            LOGGER.info('Loaded model %s from %s in %.2fs', name, path, time.time() - start)
+
+        return cls(models, **kwargs)
+
+    def _get_model(self, model_name):
+        model = self.models.get(model_name)
+        if model is None:
+            raise KeyError('Unknown model `{}`'.format(model_name))
+
+        return model
+
+    def describe(self):
+        """Describe the loaded models.
+
+        Returns:
+            dict:
+                Dictionary with the model names as keys and dicts with the type
+                of the model and the names of its tables as values.
+        """
+        description = dict()
+        for name, model in self.models.items():
+            if isinstance(model, SDV):
+                description[name] = {'type': 'SDV', 'tables': model.metadata.get_tables()}
+            else:
+                description[name] = {'type': type(model).__name__, 'tables': []}
+
+        return description
+
+    def _sample_direct(self, model_name, table_name, num_rows, random_state=None):
+        model = self._get_model(model_name)
+        with self._locks[model_name]:
+            if isinstance(model, SDV):
+                if table_name is None:
+                    raise ValueError('A table is required to sample from an SDV model')
+
+                return model.sample(table_name, num_rows, sample_children=False,
+                                    random_state=random_state)
+
+            return model.sample(num_rows, random_state=random_state)
+
+    def _run_batch(self, key, batch):
+        with self._batches_lock:
+            if self._batches.get(key) is batch:
+                del self._batches[key]
+
+        try:
+            sampled = self._sample_direct(key[0], key[1], batch.num_rows)
+        except Exception as error:
+            for _, future in batch.requests:
+                future.set_exception(error)
+
+            return
+
+        start = 0
+        for num_rows, future in batch.requests:
+            rows = sampled.iloc[start:start + num_rows].reset_index(drop=True)
+            future.set_result(rows)
+            start += num_rows
+
+    def sample(self, model_name, table_name=None, num_rows=None, random_state=None):
+        """Sample rows of one table of a model.
+
+        Requests for up to ``max_batch_rows`` rows without a ``random_state`` are
+        added to the pending batch of the same table. The first request of a batch
+        waits ``batch_wait`` seconds and then samples the rows of all of them.
+
+        Args:
+            model_name (str):
+                Name of the model to sample from.
+            table_name (str):
+                Name of the table to sample. Required for ``SDV`` models.
+            num_rows (int):
+                Number of rows to sample. If ``None``, sample the same number of
+                rows as in the original table.
+            random_state (int):
+                Seed to draw the random numbers from. Defaults to ``None``.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled rows.
+
+        Raises:
+            KeyError:
+                If the model does not exist.
+            ValueError:
+                If no table is given for an ``SDV`` model.
+        """
+        self._get_model(model_name)
+        if random_state is not None or num_rows is None or num_rows > self.max_batch_rows:
+            return self._sample_direct(model_name, table_name, num_rows, random_state)
+
+        key = (model_name, table_name)
+        future = Future()
+        with self._batches_lock:
+            batch = self._batches.get(key)
+            leader = batch is None or batch.num_rows + num_rows > self.max_batch_rows
+            if leader:
+                batch = _Batch()
+                self._batches[key] = batch
+
+            batch.requests.append((num_rows, future))
+            batch.num_rows += num_rows
+
+        if leader:
+            time.sleep(self.batch_wait)
+            self._run_batch(key, batch)
+
+        return future.result()
+
+    def sample_all(self, model_name, num_rows=None, random_state=None):
+        """Sample all the tables of an ``SDV`` model.
+
+        Args:
+            model_name (str):
+                Name of the model to sample from.
+            num_rows (int):
+                Number of rows to be sampled on the first parent tables. If ``None``,
+                sample the same number of rows as in the original tables.
+            random_state (int):
+                Seed to draw the random numbers from. Defaults to ``None``.
+
+        Returns:
+            dict:
+                Tables sampled.
+
+        Raises:
+            KeyError:
+                If the model does not exist.
+            ValueError:
+                If the model is not an ``SDV`` instance.
+        """
+        model = self._get_model(model_name)
+        if not isinstance(model, SDV):
+            raise ValueError('Model `{}` has a single table, use `sample`'.format(model_name))
+
+        with self._locks[model_name]:
+            return model.sample_all(num_rows, random_state=random_state)
+
+
+def _write_csv(data, output):
+    for start in range(0, max(len(data), 1), STREAM_CHUNK_SIZE):
+        chunk = data.iloc[start:start + STREAM_CHUNK_SIZE]
+        output.write(chunk.to_csv(index=False, header=start == 0).encode())
+
+
+def _write_arrow(data, output):
+    # Import here to make pyarrow an optional dependency
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    with pa.ipc.new_stream(output, table.schema) as writer:
+        writer.write_table(table, max_chunksize=STREAM_CHUNK_SIZE)
+
+
+WRITERS = {
+    'csv': _write_csv,
+    'arrow': _write_arrow,
+}
+
+
+class SamplingRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Handle the HTTP requests of a ``ModelServer``."""
+
+    def address_string(self):
+        """Return the address of the client, or ``'unix'`` for Unix sockets."""
+        # The clients of Unix sockets have no address.
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def _send_json(self, status, content):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _get_format(self, params):
+        file_format = params.get('format', 'csv')
+        if file_format not in WRITERS:
+            raise ValueError('Unknown format `{}`. Use one of {}'.format(
+                file_format, sorted(WRITERS)))
+
+        if file_format == 'arrow':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError('The `arrow` format requires pyarrow to be installed')
+
+        return file_format
+
+    def _sample(self, params):
+        file_format = self._get_format(params)
+        data = self.server.model_server.sample(
+            params.get('model'), params.get('table'), params.get('num_rows'),
+            params.get('random_state'))
+
+        self.send_response(200)
+        self.send_header('Content-Type', FORMATS[file_format])
+        self.end_headers()
+        WRITERS[file_format](data, self.wfile)
+
+    def _sample_all(self, params):
+        file_format = self._get_format(params)
+        sampled = self.server.model_server.sample_all(
+            params.get('model'), params.get('num_rows'), params.get('random_state'))
+
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            for table_name, data in sampled.items():
+                table_output = io.BytesIO()
+                WRITERS[file_format](data, table_output)
+                zip_file.writestr('{}.{}'.format(table_name, file_format),
+                                  table_output.getvalue())
+
+        body = output.getvalue()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/zip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Dispatch a ``GET`` request to its endpoint."""
+        url = urlparse(self.path)
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            for name in ('num_rows', 'random_state'):
+                if name in params:
+                    params[name] = int(params[name])
+
+            if url.path == '/models':
+                self._send_json(200, self.server.model_server.describe())
+            elif url.path == '/sample':
+                self._sample(params)
+            elif url.path == '/sample_all':
+                self._sample_all(params)
+            else:
+                self._send_json(404, {'error': 'Unknown endpoint `{}`'.format(url.path)})
+
+        except KeyError as error:
+            self._send_json(404, {'error': str(error.args[0])})
+        except ValueError as error:
+            self._send_json(400, {'error': str(error)})
+        except Exception as error:
+            LOGGER.exception('Error serving %s', self.path)
+            self._send_json(500, {'error': 'Internal error: {}'.format(error)})
+
+    def log_message(self, format, *args):
+        """Log the requests through the module logger instead of ``stderr``."""
+        LOGGER.info('%s - %s', self.address_string(), format % args)
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(model_server, host='127.0.0.1', port=8000, socket_path=None):
+    """Create the HTTP server of a ``ModelServer``.
+
+    Args:
+        model_server (ModelServer):
+            Models to serve.
+        host (str):
+            Host to listen on. Defaults to ``'127.0.0.1'``.
+        port (int):
+            Port to listen on. Defaults to ``8000``.
+        socket_path (str):
+            Path of a Unix socket to listen on instead of ``host`` and ``port``.
+            Defaults to ``None``.
+
+    Returns:
+        socketserver.BaseServer:
+            Server ready to ``serve_forever``.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+        server = _ThreadingUnixHTTPServer(socket_path, SamplingRequestHandler)
+    else:
+        server = _ThreadingHTTPServer((host, port), SamplingRequestHandler)
+
+    server.model_server = model_server
+    return server
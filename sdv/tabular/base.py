@@ -3,6 +3,10 @@
 import logging
 import pickle
 
+import copulas
+import numpy as np
+import pandas as pd
+
 from sdv.metadata import Table
 
 LOGGER = logging.getLogger(__name__)
@@ -58,8 +62,13 @@ class BaseTabularModel():
     """
 
     _DTYPE_TRANSFORMERS = None
+    MIN_ACCEPTANCE_RATE = 0.01
+    OVERSAMPLING_FACTOR = 1.1
+    MAX_BATCH_ROWS_FACTOR = 10
+    SAMPLE_BATCH_SIZE = 10000
 
     _metadata = None
+    _sampling_stats = None
 
     def __init__(self, field_names=None, field_types=None, field_transformers=None,
                  anonymize_fields=None, primary_key=None, constraints=None, table_metadata=None):
@@ -121,49 +130,297 @@ class BaseTabularModel():
         """
         return self._metadata
 
-    def sample(self, num_rows=None, max_retries=100):
+    def sample(self, num_rows=None, max_retries=100, random_state=None, output_file_path=None,
+               conditions=None, columns=None):
         """Sample rows from this table.
 
+        If ``conditions`` are given, models that can condition their distribution on
+        them, like the ``GaussianCopula``, sample only rows that have those values.
+        Otherwise, rows are sampled in batches and the ones that do not match the
+        ``conditions`` are rejected.
+
+        If ``columns`` are given, only the columns of the model and the transformers
+        needed to produce those fields, and to validate the rows, are evaluated.
+
         Args:
             num_rows (int):
                 Number of rows to sample. If not given the model
                 will generate as many rows as there were in the
                 data passed to the ``fit`` method.
             max_retries (int):
-                Number of times to retry sampling discarded rows.
-                Defaults to 100.
+                Maximum number of batches to sample while looking for valid rows.
+                The size of each batch is adapted to the acceptance rate of the
+                constraints observed so far. Defaults to 100.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. If given, the
+                global ``numpy`` random state is also seeded from it while sampling,
+                so the transformers that add noise are reproducible too.
+                If ``None``, the global ``numpy`` random state is used.
+            output_file_path (str):
+                If given, sample the rows in batches of ``SAMPLE_BATCH_SIZE`` rows with
+                ``sample_iter`` and append each batch to this CSV file as soon as it is
+                sampled, instead of returning them. Defaults to ``None``.
+            conditions (dict):
+                Dictionary with field names as keys and the values that all the sampled
+                rows must have in those fields as values. Defaults to ``None``.
+            columns (list[str]):
+                Names of the fields to sample. If ``None``, sample all of them.
+                Defaults to ``None``.
 
         Returns:
+            pandas.DataFrame or str:
+                Sampled data, or ``output_file_path`` if it was given.
+
+        Raises:
+            ValueError:
+                If ``conditions`` or ``columns`` contain unknown fields, or if not
+                enough valid rows are found within ``max_retries`` batches.
+        """
+        if output_file_path is not None:
+            batches = self.sample_iter(num_rows, self.SAMPLE_BATCH_SIZE, max_retries,
+                                       random_state, conditions, columns)
+            header = True
+            for batch in batches:
+                batch.to_csv(output_file_path, mode='w' if header else 'a',
+                             header=header, index=False)
+                header = False
+
+            return output_file_path
+
+        self._validate_fields(conditions, 'conditions')
+        self._validate_fields(columns, 'columns')
+        if random_state is not None:
+            random_state = np.random.default_rng(random_state)
+
+        return self._sample_seeded(num_rows, max_retries, random_state, None, conditions,
+                                   columns)
+
+    def sample_iter(self, num_rows=None, batch_size=None, max_retries=100,
+                    random_state=None, conditions=None, columns=None):
+        """Sample rows from this table in batches of bounded size.
+
+        Each batch is sampled, reverse transformed and validated against the
+        constraints before it is yielded, so only one batch is held in memory at
+        any time. The resampling needed to replace the invalid rows of a batch is
+        also done in calls of at most ``batch_size`` rows.
+
+        Args:
+            num_rows (int):
+                Number of rows to sample. If not given the model
+                will generate as many rows as there were in the
+                data passed to the ``fit`` method.
+            batch_size (int):
+                Maximum number of rows of each batch. If ``None``, use
+                ``SAMPLE_BATCH_SIZE``. Defaults to ``None``.
+            max_retries (int):
+                Maximum number of calls to the model made for each batch while
+                looking for valid rows. Defaults to 100.
+            random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+                Seed or generator to draw the random numbers from. See ``sample``.
+            conditions (dict):
+                Values that all the sampled rows must have. See ``sample``.
+            columns (list[str]):
+                Names of the fields to sample. See ``sample``.
+
+        Yields:
             pandas.DataFrame:
-                Sampled data.
+                Batches of sampled rows, indexed by their position in the output.
+                The id fields are numbered across all the batches.
         """
+        self._validate_fields(conditions, 'conditions')
+        self._validate_fields(columns, 'columns')
         num_rows = num_rows or self._num_rows
-        num_to_sample = num_rows
-        sampled = self._sample(num_to_sample)
-        sampled = self._metadata.reverse_transform(sampled)
-        sampled = self._metadata.filter_valid(sampled)
-        num_valid = len(sampled)
+        batch_size = batch_size or self.SAMPLE_BATCH_SIZE
+        if random_state is not None:
+            random_state = np.random.default_rng(random_state)
+
+        id_fields = [
+            name
+            for name, field in self._metadata.get_fields().items()
+            if field['type'] == 'id'
+        ]
+        if id_fields:
+            dtypes = self._metadata.get_dtypes(ids=True)
+
+        for start in range(0, num_rows, batch_size):
+            batch_rows = min(batch_size, num_rows - start)
+            batch = self._sample_seeded(batch_rows, max_retries, random_state, batch_size,
+                                        conditions, columns)
+            batch.index = pd.RangeIndex(start, start + len(batch))
+            for name in id_fields:
+                if name in batch:
+                    # Continue the ids of the previous batches instead of restarting them.
+                    batch[name] = batch.index.to_series().astype(dtypes[name])
+
+            yield batch
+
+    def _validate_fields(self, field_names, argument):
+        if field_names:
+            unknown = set(field_names) - set(self._metadata.get_fields())
+            if unknown:
+                raise ValueError('Unknown fields in {}: {}'.format(argument, sorted(unknown)))
+
+    def _sample_seeded(self, num_rows, max_retries, random_state, max_batch_rows=None,
+                       conditions=None, columns=None):
+        if random_state is None:
+            return self._sample_valid(num_rows, max_retries, None, max_batch_rows, conditions,
+                                      columns)
+
+        with copulas.random_seed(random_state.integers(2 ** 32)):
+            return self._sample_valid(num_rows, max_retries, random_state, max_batch_rows,
+                                      conditions, columns)
+
+    def _sample_fields(self, num_rows, field_names, random_state=None):
+        """Sample the transformed columns needed to reverse transform the given fields.
+
+        Subclasses that can skip the work of the columns that are not needed
+        override this method. By default, all the columns are sampled.
+
+        Args:
+            num_rows (int):
+                Amount of rows to sample.
+            field_names (list[str]):
+                Names of the fields to reverse transform afterwards.
+            random_state (numpy.random.Generator):
+                Generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled data, with at least the columns of the given fields.
+        """
+        return self._sample(num_rows, random_state)
+
+    def _sample_conditions(self, num_rows, conditions, random_state=None):
+        """Sample rows with the given values in some of the transformed columns.
+
+        Subclasses that can condition their distribution on the values of some
+        columns override this method. Otherwise, a ``NotImplementedError`` is raised
+        and the conditions are applied by rejecting the rows that do not match them.
 
-        counter = 0
+        Args:
+            num_rows (int):
+                Amount of rows to sample.
+            conditions (dict):
+                Dictionary with transformed column names as keys and their values.
+            random_state (numpy.random.Generator):
+                Generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
+
+        Raises:
+            NotImplementedError:
+                If the model cannot condition its distribution.
+        """
+        raise NotImplementedError()
+
+    def _sample_batch(self, num_rows, random_state, conditions=None, field_names=None):
+        """Sample a batch of rows, reverse transform them and keep the valid ones."""
+        sampled = None
+        if conditions:
+            transformed = self._metadata.transform_conditions(conditions)
+            if transformed is not None:
+                try:
+                    sampled = self._sample_conditions(num_rows, transformed, random_state)
+                except NotImplementedError:
+                    LOGGER.debug('%s cannot condition its distribution, falling back '
+                                 'to reject sampling', self.__class__.__name__)
+
+        if sampled is not None:
+            sampled = self._metadata.reverse_transform(sampled, field_names)
+            # Overwrite the values that the transformers may have rounded.
+            sampled = sampled.assign(**conditions)
+            return self._metadata.filter_valid(sampled)
+
+        if field_names is None:
+            sampled = self._sample(num_rows, random_state)
+        else:
+            sampled = self._sample_fields(num_rows, field_names, random_state)
+
+        sampled = self._metadata.reverse_transform(sampled, field_names)
+        if conditions:
+            matches = np.ones(len(sampled), dtype=bool)
+            for name, value in conditions.items():
+                matches &= (sampled[name] == value).to_numpy()
+
+            sampled = sampled[matches]
+
+        return self._metadata.filter_valid(sampled)
+
+    def _sample_valid(self, num_rows, max_retries, random_state, max_batch_rows=None,
+                      conditions=None, columns=None):
+        """Sample batches of rows until ``num_rows`` valid rows are found.
+
+        After each batch the acceptance rate is estimated from all the rows sampled so
+        far, and the next batch is sized to get the missing rows at that rate, with an
+        ``OVERSAMPLING_FACTOR`` margin. Each batch has at most ``MAX_BATCH_ROWS_FACTOR``
+        times ``num_rows`` rows, and at most ``max_batch_rows`` rows if given. Only the
+        rows of each new batch are validated, and the valid ones are concatenated once
+        at the end.
+        """
+        num_rows = num_rows or self._num_rows
+        field_names = None
+        if columns is not None:
+            field_names = self._metadata.get_required_fields(set(columns).union(conditions or ()))
+
+        num_to_sample = num_rows
+        valid_batches = list()
+        batches = list()
+        num_sampled = 0
+        num_valid = 0
         while num_valid < num_rows:
-            counter += 1
-            if counter >= max_retries:
-                raise ValueError('Could not get enough valid rows within %s trials', max_retries)
+            if len(batches) >= max_retries:
+                raise ValueError(
+                    'Could not get enough valid rows within {} trials'.format(max_retries))
+
+            valid = self._sample_batch(num_to_sample, random_state, conditions, field_names)
+            valid_batches.append(valid)
+            batches.append((num_to_sample, len(valid)))
+            num_sampled += num_to_sample
+            num_valid += len(valid)
 
-            invalid = num_rows - num_valid
             remaining = num_rows - num_valid
-            proportion = counter * num_rows / num_valid
-            num_to_sample = int(remaining * proportion)
+            if remaining > 0:
+                acceptance_rate = max(num_valid / num_sampled, self.MIN_ACCEPTANCE_RATE)
+                num_to_sample = int(np.ceil(
+                    remaining * self.OVERSAMPLING_FACTOR / acceptance_rate))
+                num_to_sample = min(num_to_sample, num_rows * self.MAX_BATCH_ROWS_FACTOR)
+                if max_batch_rows is not None:
+                    num_to_sample = min(num_to_sample, max_batch_rows)
+
+                LOGGER.info('%s invalid rows found. Resampling %s rows',
+                            num_sampled - num_valid, num_to_sample)
+
+        self._sampling_stats = {
+            'num_rows': num_rows,
+            'num_sampled': num_sampled,
+            'num_valid': num_valid,
+            'acceptance_rate': num_valid / num_sampled if num_sampled else 1.0,
+            'batches': batches,
+        }
+
+        if len(valid_batches) == 1:
+            sampled = valid_batches[0].head(num_rows)
+        else:
+            sampled = pd.concat(valid_batches).head(num_rows)
 
-            LOGGER.info('%s invalid rows found. Resampling %s rows', invalid, num_to_sample)
-            resampled = self._sample(num_to_sample)
-            resampled = self._metadata.reverse_transform(resampled)
+        if columns is not None:
+            sampled = sampled[list(columns)]
 
-            sampled = sampled.append(resampled)
-            sampled = self._metadata.filter_valid(sampled)
-            num_valid = len(sampled)
+        return sampled
 
-        return sampled.head(num_rows)
+    def get_sampling_stats(self):
+        """Get the acceptance statistics of the last call to ``sample``.
+
+        After ``sample_iter``, the statistics cover only its last batch.
+
+        Returns:
+            dict:
+                Number of rows requested, number of rows sampled, number of valid rows,
+                overall acceptance rate and the number of sampled and valid rows of
+                each batch, as ``(sampled, valid)`` tuples. ``None`` if this model
+                has not sampled any rows yet.
+        """
+        return self._sampling_stats
 
     def get_parameters(self):
         """Get the parameters learned from the data.
@@ -1,13 +1,23 @@
 """Wrappers around copulas models."""
 
 import copulas
+import copulas.multivariate
+import copulas.univariate
 import numpy as np
 
 from sdv.metadata import Table
 from sdv.tabular.base import BaseTabularModel
 from sdv.tabular.utils import (
-    check_matrix_symmetric_positive_definite, flatten_dict, make_positive_definite, square_matrix,
-    unflatten_dict)
+    check_matrix_symmetric_positive_definite, flatten_dict, make_positive_definite,
+    sample_conditional_multivariate, sample_multivariate, square_matrix, unflatten_dict)
+from sdv.utils import get_num_processes, get_pool_context
+
+
+def _fit_univariate(distribution, column):
+    """Fit a univariate distribution to the values of a column."""
+    univariate = copulas.get_instance(distribution)
+    univariate.fit(column)
+    return univariate
 
 
 class GaussianCopula(BaseTabularModel):
@@ -94,11 +104,19 @@ class GaussianCopula(BaseTabularModel):
                 * ``categorical_fuzzy``: Apply a CategoricalTransformer with the
                   ``fuzzy`` argument set to ``True``, which makes it add gaussian
                   noise around each value.
+
+        n_jobs (int):
+            Number of processes in which to fit the univariate distributions of
+            the columns. This is useful when ``copulas`` has to select the best
+            distribution for each column among several candidates. If ``-1``, use
+            all the available CPUs. Defaults to ``None``, which fits them in this
+            process.
     """
 
     _distribution = None
     _categorical_transformer = None
     _model = None
+    _n_jobs = None
 
     _DISTRIBUTIONS = {
         'univariate': copulas.univariate.Univariate,
@@ -171,7 +189,8 @@ class GaussianCopula(BaseTabularModel):
 
     def __init__(self, field_names=None, field_types=None, field_transformers=None,
                  anonymize_fields=None, primary_key=None, constraints=None,
-                 table_metadata=None, distribution=None, categorical_transformer=None):
+                 table_metadata=None, distribution=None, categorical_transformer=None,
+                 n_jobs=None):
 
         if isinstance(table_metadata, dict):
             table_metadata = Table.from_dict(table_metadata)
@@ -186,6 +205,7 @@ class GaussianCopula(BaseTabularModel):
                     categorical_transformer = model_kwargs['categorical_transformer']
 
         self._distribution = self._get_distribution(distribution)
+        self._n_jobs = n_jobs
 
         categorical_transformer = categorical_transformer or self._DEFAULT_TRANSFORMER
         self._categorical_transformer = categorical_transformer
@@ -223,29 +243,105 @@ class GaussianCopula(BaseTabularModel):
                 'categorical_transformer': self._categorical_transformer,
             })
 
+    @copulas.check_valid_values
+    def _fit_univariates(self, table_data, num_processes):
+        """Fit the univariate distribution of each column in a pool of processes.
+
+        The data is validated like ``GaussianMultivariate.fit`` does before fitting.
+        """
+        arguments = list()
+        for column_name, column in table_data.items():
+            distribution = self._distribution
+            if isinstance(distribution, dict):
+                distribution = distribution.get(column_name, copulas.univariate.Univariate)
+
+            arguments.append((distribution, column))
+
+        with get_pool_context().Pool(num_processes) as pool:
+            return pool.starmap(_fit_univariate, arguments)
+
     def _fit(self, table_data):
         """Fit the model to the table.
 
+        If ``n_jobs`` was given, the univariate distributions of the columns are
+        fitted in parallel and then the covariance of the copula is computed
+        from them, like ``GaussianMultivariate.fit`` does.
+
         Args:
             table_data (pandas.DataFrame):
                 Data to be fitted.
         """
         self._model = copulas.multivariate.GaussianMultivariate(distribution=self._distribution)
-        self._model.fit(table_data)
+        num_processes = min(get_num_processes(self._n_jobs), len(table_data.columns))
+        if num_processes > 1:
+            self._model.columns = list(table_data.columns)
+            self._model.univariates = self._fit_univariates(table_data, num_processes)
+            self._model.covariance = self._model._get_covariance(table_data)
+            self._model.fitted = True
+        else:
+            self._model.fit(table_data)
+
         self._update_metadata()
 
-    def _sample(self, num_rows):
+    def _sample(self, num_rows, random_state=None):
         """Sample the indicated number of rows from the model.
 
         Args:
             num_rows (int):
                 Amount of rows to sample.
+            random_state (numpy.random.Generator):
+                Generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled data.
+        """
+        if random_state is None:
+            return self._model.sample(num_rows)
+
+        return sample_multivariate(self._model, num_rows, random_state)
+
+    def _sample_fields(self, num_rows, field_names, random_state=None):
+        """Sample only the columns needed to reverse transform the given fields.
+
+        The latent normals of all the columns are drawn, so the sampled values
+        follow the same distribution as in ``_sample``, but only the univariates
+        of the columns of the given fields are evaluated.
+
+        Args:
+            num_rows (int):
+                Amount of rows to sample.
+            field_names (list[str]):
+                Names of the fields to reverse transform afterwards.
+            random_state (numpy.random.Generator):
+                Generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
+
+        Returns:
+            pandas.DataFrame:
+                Sampled data.
+        """
+        columns = set(self._metadata.get_field_columns(self._model.columns, field_names))
+        return sample_multivariate(self._model, num_rows, random_state, columns)
+
+    def _sample_conditions(self, num_rows, conditions, random_state=None):
+        """Sample rows from the model conditioned on the values of some columns.
+
+        Args:
+            num_rows (int):
+                Amount of rows to sample.
+            conditions (dict):
+                Dictionary with transformed column names as keys and their values.
+            random_state (numpy.random.Generator):
+                Generator to draw the random numbers from. If ``None``,
+                the global ``numpy`` random state is used.
 
         Returns:
             pandas.DataFrame:
                 Sampled data.
         """
-        return self._model.sample(num_rows)
+        return sample_conditional_multivariate(self._model, num_rows, conditions, random_state)
 
     def get_parameters(self):
         """Get copula model parameters.
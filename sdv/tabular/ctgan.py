@@ -126,15 +126,25 @@ class CTGAN(BaseTabularModel):
             log_frequency=self._log_frequency,
         )
 
-    def _sample(self, num_rows):
+    def _sample(self, num_rows, random_state=None):
         """Sample the indicated number of rows from the model.
 
         Args:
             num_rows (int):
                 Amount of rows to sample.
+            random_state (numpy.random.Generator):
+                Generator used to seed ``torch`` while sampling. If ``None``,
+                the global ``torch`` random state is used.
 
         Returns:
             pandas.DataFrame:
                 Sampled data.
         """
-        return self._model.sample(num_rows)
+        if random_state is None:
+            return self._model.sample(num_rows)
+
+        import torch  # Installed along with ctgan
+
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(int(random_state.integers(2 ** 63)))
+            return self._model.sample(num_rows)
@@ -1,6 +1,9 @@
 """Utility functions for tabular models."""
 
 import numpy as np
+import pandas as pd
+from copulas import EPSILON
+from scipy import stats
 
 IGNORED_DICT_KEYS = ['fitted', 'distribution', 'type']
 
@@ -220,3 +223,123 @@ def make_positive_definite(matrix):
         iterations += 1
 
     return A3
+
+
+def get_random_state(random_state):
+    """Get the source of random numbers to use for the given ``random_state``.
+
+    Args:
+        random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+            Seed or generator to use. If ``None``, the global ``numpy`` random
+            state is used.
+
+    Returns:
+        numpy.random.Generator or module:
+            A ``numpy.random.Generator`` built from ``random_state``, or the
+            ``numpy.random`` module if ``random_state`` is ``None``.
+    """
+    if random_state is None:
+        return np.random
+
+    return np.random.default_rng(random_state)
+
+
+def sample_multivariate(model, num_rows, random_state, columns=None):
+    """Sample rows from a fitted ``copulas.multivariate.GaussianMultivariate``.
+
+    This does the same as ``GaussianMultivariate.sample`` but draws the random
+    numbers from ``random_state`` instead of the global ``numpy`` random state.
+    If ``columns`` are given, the latent normals of all the columns are drawn,
+    but only the given ones are converted through their univariates.
+
+    Args:
+        model (copulas.multivariate.GaussianMultivariate):
+            Fitted model.
+        num_rows (int):
+            Number of rows to sample.
+        random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+            Seed or generator to use. If ``None``, the global ``numpy`` random
+            state is used.
+        columns (list[str]):
+            Names of the columns to return. If ``None``, return all of them.
+            Defaults to ``None``.
+
+    Returns:
+        pandas.DataFrame:
+            Sampled rows.
+    """
+    covariance = np.nan_to_num(np.asarray(model.covariance, dtype=float))
+    means = np.zeros(len(covariance))
+    if random_state is None:
+        generator = np.random
+    else:
+        generator = np.random.default_rng(random_state)
+
+    samples = generator.multivariate_normal(means, covariance, size=num_rows)
+
+    sampled = dict()
+    for position, (column, univariate) in enumerate(zip(model.columns, model.univariates)):
+        if columns is None or column in columns:
+            sampled[column] = univariate.percent_point(stats.norm.cdf(samples[:, position]))
+
+    return pd.DataFrame(sampled)
+
+
+def sample_conditional_multivariate(model, num_rows, conditions, random_state=None):
+    """Sample rows from a ``GaussianMultivariate`` with the values of some columns fixed.
+
+    The fixed values are converted to the latent standard normal space through the
+    ``cdf`` of their univariates, and the other latent columns are drawn from the
+    multivariate normal distribution conditioned on them, before converting them
+    back through the ``percent_point`` of their univariates.
+
+    Args:
+        model (copulas.multivariate.GaussianMultivariate):
+            Fitted model.
+        num_rows (int):
+            Number of rows to sample.
+        conditions (dict):
+            Dictionary with column names as keys and their fixed values.
+        random_state (int, numpy.random.SeedSequence or numpy.random.Generator):
+            Seed or generator to use. If ``None``, the global ``numpy`` random
+            state is used.
+
+    Returns:
+        pandas.DataFrame:
+            Sampled rows.
+    """
+    columns = list(model.columns)
+    univariates = dict(zip(columns, model.univariates))
+    fixed = [columns.index(column) for column in conditions]
+    free = [index for index in range(len(columns)) if index not in fixed]
+
+    fixed_normal = np.array([
+        stats.norm.ppf(np.clip(univariates[column].cdf(np.array([value]))[0],
+                               EPSILON, 1 - EPSILON))
+        for column, value in conditions.items()
+    ])
+
+    covariance = np.nan_to_num(np.asarray(model.covariance, dtype=float))
+    free_fixed = covariance[np.ix_(free, fixed)]
+    regression = free_fixed.dot(np.linalg.pinv(covariance[np.ix_(fixed, fixed)]))
+    means = regression.dot(fixed_normal)
+    conditional = covariance[np.ix_(free, free)] - regression.dot(free_fixed.T)
+    conditional = (conditional + conditional.T) / 2
+
+    if random_state is None:
+        generator = np.random
+    else:
+        generator = np.random.default_rng(random_state)
+
+    sampled = dict()
+    if free:
+        samples = generator.multivariate_normal(means, conditional, size=num_rows)
+        for position, index in enumerate(free):
+            univariate = univariates[columns[index]]
+            sampled[columns[index]] = univariate.percent_point(
+                stats.norm.cdf(samples[:, position]))
+
+    for column, value in conditions.items():
+        sampled[column] = np.full(num_rows, value)
+
+    return pd.DataFrame(sampled, columns=columns)
@@ -1,5 +1,44 @@
 """Miscellaneous utility functions."""
 
+import multiprocessing
+import threading
+
+
+def get_num_processes(n_jobs):
+    """Get the number of processes to use based on ``n_jobs``.
+
+    Args:
+        n_jobs (int):
+            Number of processes to use. Negative values count back from the number
+            of CPUs, so ``-1`` means all of them. ``None`` means a single process.
+
+    Returns:
+        int:
+            Number of processes, at least 1.
+    """
+    if n_jobs is None:
+        return 1
+
+    if n_jobs < 0:
+        return max(multiprocessing.cpu_count() + 1 + n_jobs, 1)
+
+    return max(n_jobs, 1)
+
+
+def get_pool_context():
+    """Get the ``multiprocessing`` context to start the pools of processes with.
+
+    Forking from a worker thread is unsafe, so the ``spawn`` context is used to start
+    fresh interpreters instead when this is not called from the main thread.
+
+    Returns:
+        multiprocessing.context.BaseContext
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return multiprocessing.get_context('spawn')
+
+    return multiprocessing.get_context()
+
 
 def display_tables(tables, max_rows=10, datetime_fmt='%Y-%m-%d %H:%M:%S'):
     """Display mutiple tables side by side on a Jupyter Notebook.
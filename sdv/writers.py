@@ -0,0 +1,174 @@
+"""Writers that store sampled tables on disk incrementally."""
+
+import os
+
+import pandas as pd
+
+
+class CSVWriter:
+    """Append the sampled rows of each table to its own CSV file.
+
+    Args:
+        path (str):
+            Directory where the files are written.
+        metadata (Metadata):
+            Metadata of the sampled dataset.
+    """
+
+    EXTENSION = 'csv'
+
+    def __init__(self, path, metadata):
+        self.path = path
+        self.metadata = metadata
+        self._written = set()
+
+    def get_file_name(self, table_name):
+        """Get the name of the file of the given table, relative to ``path``."""
+        return '{}.{}'.format(table_name, self.EXTENSION)
+
+    def _get_file_path(self, table_name):
+        return os.path.join(self.path, self.get_file_name(table_name))
+
+    def write(self, table_name, data):
+        """Append rows to the file of a table.
+
+        Args:
+            table_name (str):
+                Name of the table.
+            data (pandas.DataFrame):
+                Rows to append.
+        """
+        header = table_name not in self._written
+        data.to_csv(self._get_file_path(table_name), mode='w' if header else 'a',
+                    header=header, index=False)
+        self._written.add(table_name)
+
+    def close(self):
+        """Finish the files, creating an empty one for the tables without rows."""
+        for table_name in self.metadata.get_tables():
+            if table_name not in self._written:
+                fields = list(self.metadata.get_fields(table_name))
+                self.write(table_name, pd.DataFrame(columns=fields))
+
+
+class ParquetWriter(CSVWriter):
+    """Write the sampled rows of each table to its own Parquet file.
+
+    Each call to ``write`` adds a new row group to the file of the table. The
+    schema of each file is built from the field types in the metadata, so all
+    the row groups share it regardless of the values sampled in each of them.
+
+    Args:
+        path (str):
+            Directory where the files are written.
+        metadata (Metadata):
+            Metadata of the sampled dataset.
+    """
+
+    EXTENSION = 'parquet'
+
+    def __init__(self, path, metadata):
+        try:
+            import pyarrow  # Lazy import to make dependency optional
+            import pyarrow.parquet
+        except ImportError as ie:
+            ie.msg += (
+                '\n\nIt seems like `pyarrow` is not installed.\n'
+                'Please install it using:\n\n    pip install sdv[parquet]'
+            )
+            raise
+
+        super().__init__(path, metadata)
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self._writers = dict()
+
+    def _get_schema(self, table_name):
+        """Build the arrow schema of a table from its field types."""
+        pyarrow = self._pyarrow
+        fields = list()
+        for name, field in self.metadata.get_fields(table_name).items():
+            field_type = field['type']
+            subtype = field.get('subtype')
+            if field_type == 'categorical':
+                arrow_type = pyarrow.string()
+            elif field_type == 'boolean':
+                arrow_type = pyarrow.bool_()
+            elif field_type == 'datetime':
+                arrow_type = pyarrow.timestamp('ns')
+            elif field_type == 'numerical' and subtype == 'integer':
+                arrow_type = pyarrow.int64()
+            elif field_type == 'numerical':
+                arrow_type = pyarrow.float64()
+            elif field_type == 'id' and subtype == 'string':
+                arrow_type = pyarrow.string()
+            elif field_type == 'id':
+                arrow_type = pyarrow.int64()
+            else:
+                raise ValueError('Unsupported field type `{}` for parquet output'.format(
+                    field_type))
+
+            fields.append(pyarrow.field(name, arrow_type))
+
+        return pyarrow.schema(fields)
+
+    def write(self, table_name, data):
+        """Append rows to the file of a table as a new row group.
+
+        Args:
+            table_name (str):
+                Name of the table.
+            data (pandas.DataFrame):
+                Rows to append.
+        """
+        writer = self._writers.get(table_name)
+        if writer is None:
+            schema = self._get_schema(table_name)
+            writer = self._parquet.ParquetWriter(self._get_file_path(table_name), schema)
+            self._writers[table_name] = writer
+
+        table = self._pyarrow.Table.from_pandas(
+            data[writer.schema.names], schema=writer.schema, preserve_index=False)
+        writer.write_table(table)
+        self._written.add(table_name)
+
+    def close(self):
+        """Finish the files, creating an empty one for the tables without rows."""
+        super().close()
+        for writer in self._writers.values():
+            writer.close()
+
+        self._writers = dict()
+
+
+WRITERS = {
+    'csv': CSVWriter,
+    'parquet': ParquetWriter,
+}
+
+
+def get_writer(file_format, path, metadata):
+    """Get a writer for the given format.
+
+    Args:
+        file_format (str):
+            Format of the output files, ``'csv'`` or ``'parquet'``.
+        path (str):
+            Directory where the files are written.
+        metadata (Metadata):
+            Metadata of the sampled dataset.
+
+    Returns:
+        CSVWriter or ParquetWriter:
+            Writer instance.
+
+    Raises:
+        ValueError:
+            If the format is not supported.
+    """
+    writer_class = WRITERS.get(file_format)
+    if writer_class is None:
+        raise ValueError('Unknown format `{}`. Use one of {}'.format(
+            file_format, sorted(WRITERS)))
+
+    return writer_class(path, metadata)
@@ -13,7 +13,7 @@ with open('HISTORY.md', encoding='utf-8') as history_file:
 
 install_requires = [
     'exrex>=0.9.4,<0.11',
-    'numpy>=1.15.4,<2',
+    'numpy>=1.17.0,<2',
     'pandas>=0.23.4,<2',
     'graphviz>=0.13.2,<1',
     'copulas>=0.3.2,<0.4',
@@ -25,6 +25,10 @@ ctgan_requires = [
     'ctgan>=0.2.2.dev1,<0.3',
 ]
 
+parquet_requires = [
+    'pyarrow>=0.15.1,<15',
+]
+
 setup_requires = [
     'pytest-runner>=2.11.1',
 ]
@@ -87,10 +91,16 @@ setup(
         'Programming Language :: Python :: 3.8',
     ],
     description='Automated Generative Modeling and Sampling',
+    entry_points={
+        'console_scripts': [
+            'sdv=sdv.cli:main',
+        ],
+    },
     extras_require={
         'ctgan': ctgan_requires,
-        'test': tests_require + ctgan_requires,
-        'dev': development_requires + tests_require + ctgan_requires,
+        'parquet': parquet_requires,
+        'test': tests_require + ctgan_requires + parquet_requires,
+        'dev': development_requires + tests_require + ctgan_requires + parquet_requires,
     },
     include_package_data=True,
     install_requires=install_requires,
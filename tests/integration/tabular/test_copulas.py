@@ -1,3 +1,7 @@
+import numpy as np
+import pandas as pd
+import pytest
+
 from sdv.demo import load_demo
 from sdv.tabular.copulas import GaussianCopula
 
@@ -69,3 +73,48 @@ def test_gaussian_copula():
 
     assert 'model_kwargs' in metadata
     assert 'GaussianCopula' in metadata['model_kwargs']
+
+
+def test_gaussian_copula_random_state():
+    users = load_demo(metadata=False)['users']
+
+    gc = GaussianCopula(primary_key='user_id')
+    gc.fit(users)
+
+    sampled = gc.sample(20, random_state=0)
+
+    assert sampled.equals(gc.sample(20, random_state=0))
+    assert not sampled.equals(gc.sample(20, random_state=1))
+
+
+def test_gaussian_copula_n_jobs():
+    users = load_demo(metadata=False)['users']
+
+    gc = GaussianCopula(primary_key='user_id', distribution='parametric')
+    gc.fit(users)
+
+    parallel_gc = GaussianCopula(primary_key='user_id', distribution='parametric', n_jobs=2)
+    parallel_gc.fit(users)
+
+    model_kwargs = gc.get_metadata().get_model_kwargs('GaussianCopula')
+    parallel_model_kwargs = parallel_gc.get_metadata().get_model_kwargs('GaussianCopula')
+    assert parallel_model_kwargs == model_kwargs
+    assert parallel_gc.get_parameters() == gc.get_parameters()
+
+
+def test_gaussian_copula_n_jobs_invalid_values():
+    gc = GaussianCopula(n_jobs=2)
+
+    with pytest.raises(ValueError, match='nan values'):
+        gc._fit(pd.DataFrame({'a': [1.0, np.nan], 'b': [1.0, 2.0]}))
+
+
+@pytest.mark.parametrize('transformer', ['one_hot_encoding', 'categorical', 'label_encoding'])
+def test_gaussian_copula_sample_unseen_condition(transformer):
+    users = load_demo(metadata=False)['users']
+
+    gc = GaussianCopula(field_transformers={'country': transformer})
+    gc.fit(users)
+
+    with pytest.raises(ValueError, match="Invalid value 'XX' for field 'country'"):
+        gc.sample(5, conditions={'country': 'XX'})
@@ -0,0 +1,26 @@
+from sdv import Metadata, load_demo
+from sdv.cli import main
+
+
+def test_cli_fit_sample(tmp_path, capsys):
+    metadata, tables = load_demo(metadata=True)
+    metadata_dict = metadata.to_dict()
+    for table_name, table in tables.items():
+        table.to_csv(str(tmp_path / '{}.csv'.format(table_name)), index=False)
+        metadata_dict['tables'][table_name]['path'] = '{}.csv'.format(table_name)
+
+    metadata_path = str(tmp_path / 'metadata.json')
+    Metadata(metadata_dict).to_json(metadata_path)
+    model_path = str(tmp_path / 'model.pkl')
+    output_path = str(tmp_path / 'sampled')
+
+    main(['fit', metadata_path, '-o', model_path])
+    main(['sample', model_path, '-o', output_path, '-n', '25', '-c', '10', '-f', 'csv'])
+
+    output = capsys.readouterr().out
+    for phase in ('load', 'fit', 'save', 'sample'):
+        assert '{}: '.format(phase) in output
+
+    sampled = Metadata(output_path + '/metadata.json').load_tables()
+    assert len(sampled['users']) == 25
+    assert sampled['sessions']['user_id'].isin(sampled['users']['user_id']).all()
@@ -1,4 +1,9 @@
+import numpy as np
+import pandas as pd
+import pytest
+
 from sdv import SDV, load_demo
+from sdv.metadata import Metadata
 
 
 def test_sdv():
@@ -70,3 +75,234 @@ def test_sdv_multiparent():
 
     assert character_families.shape == tables['character_families'].shape
     assert set(character_families.columns) == set(tables['character_families'].columns)
+
+
+def test_sdv_n_jobs():
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    parallel_sdv = SDV()
+    parallel_sdv.fit(metadata, tables, n_jobs=2)
+
+    assert parallel_sdv.modeler.table_sizes == sdv.modeler.table_sizes
+    for table_name, model in sdv.modeler.models.items():
+        parallel_model = parallel_sdv.modeler.models[table_name].model
+        assert parallel_model.columns == model.model.columns
+        np.testing.assert_allclose(parallel_model.covariance, model.model.covariance)
+
+    sampled = parallel_sdv.sample_all()
+    assert set(sampled.keys()) == {'users', 'sessions', 'transactions'}
+
+
+def test_sdv_update():
+    metadata, tables = load_demo(metadata=True)
+    users = tables['users']
+    sessions = tables['sessions']
+    transactions = tables['transactions']
+    new_tables = {
+        'users': users.iloc[:3].assign(user_id=users.user_id.iloc[:3] + 100),
+        'sessions': sessions.iloc[:4].assign(
+            session_id=sessions.session_id.iloc[:4] + 100,
+            user_id=[100, 101, 3, 101]
+        ),
+        'transactions': transactions.iloc[:5].assign(
+            transaction_id=transactions.transaction_id.iloc[:5] + 100,
+            session_id=[100, 100, 102, 5, 101]
+        ),
+    }
+
+    sdv = SDV()
+    sdv.fit(metadata, tables, incremental=True)
+    sdv.update(new_tables)
+
+    full_tables = {
+        table_name: pd.concat([table, new_tables[table_name]], ignore_index=True)
+        for table_name, table in tables.items()
+    }
+    full_sdv = SDV()
+    full_sdv.fit(sdv.metadata, full_tables)
+
+    assert sdv.modeler.table_sizes == full_sdv.modeler.table_sizes
+    for table_name, model in full_sdv.modeler.models.items():
+        updated_model = sdv.modeler.models[table_name].model
+        assert updated_model.columns == model.model.columns
+        np.testing.assert_allclose(updated_model.covariance, model.model.covariance, atol=1e-8)
+        for updated, univariate in zip(updated_model.univariates, model.model.univariates):
+            updated = updated.to_dict()
+            univariate = univariate.to_dict()
+            assert updated['loc'] == pytest.approx(univariate['loc'], rel=1e-8)
+            assert updated['scale'] == pytest.approx(univariate['scale'], rel=1e-8)
+
+    sampled = sdv.sample_all()
+    assert set(sampled.keys()) == {'users', 'sessions', 'transactions'}
+
+
+def test_sdv_low_memory():
+    metadata, tables = load_demo('got_families', metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    low_memory_sdv = SDV()
+    low_memory_sdv.fit(metadata, tables, low_memory=True)
+
+    memory_stats = low_memory_sdv.modeler.memory_stats
+    assert set(memory_stats.peak_memory) == {'characters', 'families', 'character_families'}
+    assert memory_stats.total_peak_memory == max(memory_stats.peak_memory.values())
+    for table_name, model in sdv.modeler.models.items():
+        low_memory_model = low_memory_sdv.modeler.models[table_name].model
+        assert low_memory_model.columns == model.model.columns
+        np.testing.assert_allclose(low_memory_model.covariance, model.model.covariance)
+
+    sampled = low_memory_sdv.sample_all()
+    assert set(sampled.keys()) == {'characters', 'families', 'character_families'}
+
+
+def test_sdv_sample_iter():
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    chunks = list(sdv.sample_iter(25, chunk_size=10))
+
+    assert len(chunks) == 3
+    sampled = {
+        table_name: pd.concat([chunk[table_name] for chunk in chunks if table_name in chunk])
+        for table_name in ['users', 'sessions', 'transactions']
+    }
+    assert len(sampled['users']) == 25
+    assert sampled['users']['user_id'].is_unique
+    assert sampled['sessions']['session_id'].is_unique
+    assert sampled['transactions']['transaction_id'].is_unique
+    assert sampled['sessions']['user_id'].isin(sampled['users']['user_id']).all()
+
+
+@pytest.mark.parametrize('dataset', [None, 'got_families'])
+def test_sdv_random_state(dataset):
+    metadata, tables = load_demo(dataset, metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+    sdv.sampler.RANDOM_BLOCK_SIZE = 10
+
+    sampled = sdv.sample_all(45, reset_primary_keys=True, random_state=0)
+    chunks = list(sdv.sample_iter(45, chunk_size=20, reset_primary_keys=True, random_state=0))
+
+    for table_name, table in sampled.items():
+        pd.testing.assert_frame_equal(
+            table, sdv.sample_all(45, reset_primary_keys=True, random_state=0)[table_name])
+        chunked = pd.concat(
+            [chunk[table_name] for chunk in chunks if table_name in chunk], ignore_index=True)
+        pd.testing.assert_frame_equal(table, chunked)
+
+
+@pytest.mark.parametrize('dataset', [None, 'got_families'])
+def test_sdv_sample_all_n_jobs(dataset):
+    metadata, tables = load_demo(dataset, metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+    sdv.sampler.RANDOM_BLOCK_SIZE = 10
+
+    sampled = sdv.sample_all(95, reset_primary_keys=True, random_state=0)
+    parallel = sdv.sample_all(95, reset_primary_keys=True, random_state=0, n_jobs=2)
+
+    assert set(parallel) == set(sampled)
+    for table_name, table in sampled.items():
+        pd.testing.assert_frame_equal(table, parallel[table_name])
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_sdv_sample_to(tmp_path, file_format):
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    metadata_path = sdv.sample_to(str(tmp_path), 25, format=file_format, chunk_size=10)
+
+    sampled = Metadata(metadata_path).load_tables()
+    assert set(sampled) == {'users', 'sessions', 'transactions'}
+    assert len(sampled['users']) == 25
+    assert sampled['users']['user_id'].is_unique
+    assert sampled['sessions']['session_id'].is_unique
+    assert sampled['transactions']['transaction_id'].is_unique
+    assert sampled['sessions']['user_id'].isin(sampled['users']['user_id']).all()
+    assert (tmp_path / 'users.{}'.format(file_format)).exists()
+
+
+def test_sdv_sample_to_multiparent(tmp_path):
+    metadata, tables = load_demo('got_families', metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    metadata_path = sdv.sample_to(str(tmp_path), chunk_size=3)
+
+    sampled = Metadata(metadata_path).load_tables()
+    assert len(sampled['characters']) == 7
+    assert len(sampled['families']) == len(tables['families'])
+    assert sampled['character_families']['family_id'].isin(sampled['families']['family_id']).all()
+
+
+@pytest.mark.parametrize('file_name', ['model', 'model.zip'])
+def test_sdv_save_load_compact(tmp_path, file_name):
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    path = str(tmp_path / file_name)
+    sdv.save(path, format='compact')
+    loaded = SDV.load(path)
+
+    for table_name, model in sdv.sampler.models.items():
+        loaded_model = loaded.sampler.models[table_name]
+        np.testing.assert_allclose(loaded_model.model.covariance, model.model.covariance)
+        assert loaded_model.get_parameters() == pytest.approx(model.get_parameters())
+
+    sampled = loaded.sample_all(25, reset_primary_keys=True, random_state=0)
+    expected = sdv.sample_all(25, reset_primary_keys=True, random_state=0)
+    for table_name, table in expected.items():
+        pd.testing.assert_frame_equal(table, sampled[table_name])
+
+
+def test_sdv_load_lazy(tmp_path):
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+
+    path = str(tmp_path / 'model')
+    sdv.save(path, format='compact')
+    loaded = SDV.load(path, lazy=True)
+
+    assert not loaded.sampler.models.is_loaded('users')
+
+    loaded.prefetch('transactions')
+    assert loaded.sampler.models.is_loaded('transactions')
+    assert loaded.sampler.models.is_loaded('sessions')
+    assert not loaded.sampler.models.is_loaded('users')
+
+    sampled = loaded.sample('transactions', 5)
+    assert len(sampled['transactions']) == 5
+    assert not loaded.sampler.models.is_loaded('users')
+
+
+def test_sdv_sample_iter_n_jobs():
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+    sdv.sampler.RANDOM_BLOCK_SIZE = 10
+
+    sampled = sdv.sample_all(45, reset_primary_keys=True, random_state=0)
+    chunks = list(sdv.sample_iter(45, chunk_size=20, reset_primary_keys=True,
+                                  random_state=0, n_jobs=2))
+
+    for table_name, table in sampled.items():
+        chunked = pd.concat([chunk[table_name] for chunk in chunks], ignore_index=True)
+        pd.testing.assert_frame_equal(table, chunked)
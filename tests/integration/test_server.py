@@ -0,0 +1,62 @@
+import io
+import json
+import threading
+import zipfile
+from urllib.request import urlopen
+
+import pandas as pd
+import pytest
+
+from sdv import SDV, load_demo
+from sdv.server import ModelServer, make_server
+from sdv.tabular import GaussianCopula
+
+
+@pytest.fixture
+def server(tmp_path):
+    metadata, tables = load_demo(metadata=True)
+
+    sdv = SDV()
+    sdv.fit(metadata, tables)
+    sdv.save(str(tmp_path / 'sdv.pkl'))
+
+    users = GaussianCopula(primary_key='user_id')
+    users.fit(tables['users'])
+    users.save(str(tmp_path / 'users.pkl'))
+
+    model_server = ModelServer.load({
+        'demo': str(tmp_path / 'sdv.pkl'),
+        'users': str(tmp_path / 'users.pkl'),
+    })
+    server = make_server(model_server, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield 'http://127.0.0.1:{}'.format(server.server_address[1])
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_server(server):
+    with urlopen(server + '/models') as response:
+        models = json.loads(response.read().decode())
+
+    assert models['demo']['type'] == 'SDV'
+    assert set(models['demo']['tables']) == {'users', 'sessions', 'transactions'}
+
+    with urlopen(server + '/sample?model=users&num_rows=15') as response:
+        users = pd.read_csv(io.BytesIO(response.read()))
+
+    assert len(users) == 15
+
+    with urlopen(server + '/sample?model=demo&table=sessions&num_rows=5') as response:
+        sessions = pd.read_csv(io.BytesIO(response.read()))
+
+    assert len(sessions) == 5
+
+    with urlopen(server + '/sample_all?model=demo&num_rows=5') as response:
+        zip_file = zipfile.ZipFile(io.BytesIO(response.read()))
+
+    assert set(zip_file.namelist()) == {'users.csv', 'sessions.csv', 'transactions.csv'}
+    assert len(pd.read_csv(zip_file.open('users.csv'))) == 5
@@ -292,6 +292,22 @@ class TestMetadata(TestCase):
         metadata.get_table_meta.assert_called_once_with('test')
         mock_load_csv.assert_called_once_with('a/path', {'some': 'data'})
 
+    @patch('sdv.metadata._load_parquet')
+    def test_load_table_parquet(self, mock_load_parquet):
+        """Test load table from a parquet file"""
+        # Setup
+        metadata = Mock(spec_set=Metadata)
+        metadata.root_path = 'a/path'
+        metadata.get_table_meta.return_value = {'path': 'test.parquet'}
+        mock_load_parquet.return_value = 'data'
+
+        # Run
+        result = Metadata.load_table(metadata, 'test')
+
+        # Asserts
+        assert result == 'data'
+        mock_load_parquet.assert_called_once_with('a/path', {'path': 'test.parquet'})
+
     def test_get_dtypes_with_ids(self):
         """Test get data types including ids."""
         # Setup
@@ -2,6 +2,8 @@
 from unittest.mock import Mock
 
 import numpy as np
+import pandas as pd
+import pytest
 
 from sdv.models.copulas import GaussianCopula
 
@@ -50,3 +52,208 @@ def test__unflatten_gaussian_copula():
         'covariance': [[0.4, 0.2], [0.2, 0.0]]
     }
     assert result == expected
+
+
+def test_get_grouped_parameters():
+    """Grouped parameters match fitting one model per group."""
+    # Setup
+    groups = np.array([2, 0, 2, 1, 2, 0, 1, 1])
+    table_data = pd.DataFrame({
+        'a': [1.0, 2.0, 3.0, 4.0, 5.5, 6.0, 7.0, 9.0],
+        'b': [0.1, 0.5, 0.2, 0.3, np.nan, 0.7, 0.9, 0.3],
+        'c': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0],
+    })
+
+    # Run
+    result = GaussianCopula().get_grouped_parameters(table_data, groups)
+
+    # Asserts
+    assert list(result.index) == [2, 0, 1]
+    for group in [2, 0, 1]:
+        model = GaussianCopula()
+        model.fit(table_data[groups == group].copy())
+        expected = pd.Series(model.get_parameters())
+        assert list(result.columns) == list(expected.index)
+        np.testing.assert_allclose(result.loc[group], expected.astype(float), rtol=1e-6)
+
+
+@pytest.mark.parametrize('distribution', [
+    'copulas.univariate.GaussianUnivariate',
+    'copulas.univariate.GammaUnivariate',
+])
+def test_get_parameter_vector(distribution):
+    """The parameter vector matches the flatten parameters."""
+    # Setup
+    table_data = pd.DataFrame({
+        'a': [1.0, 2.0, 3.0, 4.0, 5.5, 6.0, 7.0, 9.0],
+        'b': [0.1, 0.5, 0.2, 0.3, 0.4, 0.7, 0.9, 0.3],
+    })
+    model = GaussianCopula(distribution=distribution)
+    model.fit(table_data)
+
+    # Run
+    names = model.get_parameter_names()
+    values = model.get_parameter_vector()
+
+    # Asserts
+    expected = model.get_parameters()
+    assert list(names) == list(expected)
+    np.testing.assert_allclose(values, list(expected.values()))
+
+
+def test_set_parameter_vector():
+    """Setting the parameter vector is the same as setting the flatten parameters."""
+    # Setup
+    names = (
+        'covariance__0__0', 'covariance__1__0', 'covariance__1__1',
+        'univariates__b__loc', 'univariates__b__scale',
+        'univariates__a__loc', 'univariates__a__scale', 'child_rows',
+    )
+    values = np.array([1.0, 1.5, 1.0, 0.0, np.log(2.0), 5.0, np.log(3.0), 10.0])
+    expected = GaussianCopula()
+    expected.set_parameters(dict(zip(names, values)))
+
+    # Run
+    model = GaussianCopula()
+    model.set_parameter_vector(values, names)
+
+    # Asserts
+    assert model.model.columns == expected.model.columns == ['a', 'b']
+    np.testing.assert_allclose(model.model.covariance, expected.model.covariance)
+    np.testing.assert_allclose(model.get_parameter_vector(), expected.get_parameter_vector())
+
+
+def test_get_grouped_parameters_not_gaussian():
+    """Grouped parameters are not supported without gaussian marginals."""
+    model = GaussianCopula(distribution='copulas.univariate.GammaUnivariate')
+
+    with pytest.raises(NotImplementedError):
+        model.get_grouped_parameters(pd.DataFrame({'a': [1, 2]}), [0, 0])
+
+
+def test_sample_grouped():
+    """Each group of rows follows the distribution of its own parameters."""
+    # Setup
+    parameters = pd.DataFrame({
+        'covariance__0__0': [1.0, 1.0],
+        'covariance__1__0': [0.8, -0.5],
+        'covariance__1__1': [1.0, 1.0],
+        'univariates__b__loc': [0.0, 10.0],
+        'univariates__b__scale': [np.log(1.0), np.log(2.0)],
+        'univariates__a__loc': [5.0, -5.0],
+        'univariates__a__scale': [np.log(3.0), np.log(0.5)],
+        'child_rows': [20000, 30000],
+    })
+
+    # Run
+    np.random.seed(0)
+    result = GaussianCopula().sample_grouped(parameters, [20000, 30000])
+
+    # Asserts
+    assert list(result.columns) == ['b', 'a']
+    assert len(result) == 50000
+
+    first = result.iloc[:20000]
+    np.testing.assert_allclose(first.mean(), [0.0, 5.0], atol=0.05)
+    np.testing.assert_allclose(first.std(), [1.0, 3.0], rtol=0.02)
+    np.testing.assert_allclose(first.corr().iloc[1, 0], 0.8, atol=0.01)
+
+    second = result.iloc[20000:]
+    np.testing.assert_allclose(second.mean(), [10.0, -5.0], atol=0.05)
+    np.testing.assert_allclose(second.std(), [2.0, 0.5], rtol=0.02)
+    np.testing.assert_allclose(second.corr().iloc[1, 0], -0.5, atol=0.01)
+
+
+def test_sample_grouped_random_state():
+    """The same random state gives the same rows, without using the global state."""
+    # Setup
+    parameters = pd.DataFrame({
+        'covariance__0__0': [1.0],
+        'univariates__a__loc': [5.0],
+        'univariates__a__scale': [np.log(3.0)],
+    })
+    model = GaussianCopula()
+
+    # Run
+    np.random.seed(0)
+    first = model.sample_grouped(parameters, [10], random_state=1)
+    second = model.sample_grouped(parameters, [10], random_state=np.random.default_rng(1))
+    global_state = np.random.standard_normal()
+
+    # Asserts
+    pd.testing.assert_frame_equal(first, second)
+    np.random.seed(0)
+    assert global_state == np.random.standard_normal()
+
+
+def test_sample_grouped_not_positive_definite():
+    """Covariance matrices that are not positive-definite are fixed before sampling."""
+    # Setup
+    parameters = pd.DataFrame({
+        'covariance__0__0': [1.0],
+        'covariance__1__0': [1.5],
+        'covariance__1__1': [1.0],
+        'univariates__a__loc': [0.0],
+        'univariates__a__scale': [0.0],
+        'univariates__b__loc': [1.0],
+        'univariates__b__scale': [0.0],
+    })
+
+    # Run
+    result = GaussianCopula().sample_grouped(parameters, [10])
+
+    # Asserts
+    assert result.shape == (10, 2)
+    assert not result.isnull().any().any()
+
+
+def test_sample_groups():
+    """Rows are assigned to each model proportionally to their likelihood."""
+    # Setup
+    parameters = pd.DataFrame({
+        'covariance__0__0': [1.0, 1.0, 1.0],
+        'covariance__1__0': [0.5, -0.5, 0.0],
+        'covariance__1__1': [1.0, 1.0, 1.0],
+        'univariates__a__loc': [0.0, 1.0, -1.0],
+        'univariates__a__scale': np.log([1.0, 2.0, 1.0]),
+        'univariates__b__loc': [0.0, 0.5, 1.0],
+        'univariates__b__scale': np.log([1.0, 1.0, 3.0]),
+    })
+    table_data = pd.DataFrame({'a': [0.5, -1.0], 'b': [0.2, 2.0]})
+
+    expected = list()
+    for _, row in parameters.iterrows():
+        model = GaussianCopula()
+        model.set_parameters(row.to_dict())
+        expected.append(model.model.probability_density(table_data))
+
+    expected = np.array(expected).T
+    expected /= expected.sum(axis=1, keepdims=True)
+
+    # Run
+    np.random.seed(0)
+    model = GaussianCopula()
+    model.LIKELIHOOD_BLOCK_SIZE = 4
+    repeated = pd.concat([table_data] * 20000, ignore_index=True)
+    result = model.sample_groups(parameters, repeated, np.ones(3)).reshape(-1, 2)
+
+    # Asserts
+    for row in range(2):
+        frequencies = np.bincount(result[:, row], minlength=3) / len(result)
+        np.testing.assert_allclose(frequencies, expected[row], atol=0.015)
+
+
+def test_sample_groups_invalid():
+    """If no model is valid, the rows are assigned using the weights."""
+    # Setup
+    parameters = pd.DataFrame({
+        'covariance__0__0': [1.0, 1.0],
+        'univariates__a__loc': [np.nan, np.nan],
+        'univariates__a__scale': [0.0, 0.0],
+    })
+
+    # Run
+    result = GaussianCopula().sample_groups(parameters, pd.DataFrame({'a': [1.0] * 5}), [0, 1])
+
+    # Asserts
+    np.testing.assert_array_equal(result, [1, 1, 1, 1, 1])
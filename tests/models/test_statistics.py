@@ -0,0 +1,59 @@
+"""Tests for the sdv.models.statistics module."""
+import numpy as np
+import pandas as pd
+
+from sdv.models.copulas import GaussianCopula
+from sdv.models.statistics import GroupedStatistics
+
+
+def test_get_gaussian_parameters():
+    """Statistics folded in batches match a model fitted to each group."""
+    # Setup
+    data = pd.DataFrame({
+        'a': [1.0, 2.0, 4.0, 3.0, 3.0, 5.0, 1.0, 2.0],
+        'b': [2.0, 1.0, 0.5, 3.0, 3.0, 1.0, 1.0, 7.0],
+        'c': [3.0, 2.0, 3.0, 1.0, 1.0, 2.0, 0.0, 5.0],
+    })
+    groups = np.array(['x', 'x', 'x', 'x', 'y', 'y', 'y', 'y'])
+
+    # Run
+    statistics = GroupedStatistics(data.columns, [0, 0, 0], data.mean().values)
+    statistics.add(data.values[:4], groups[:4])
+    statistics.add(data.values[4:], groups[4:])
+    loc, scale, correlation = statistics.get_gaussian_parameters()
+
+    # Assert
+    assert list(statistics.keys) == ['x', 'y']
+    np.testing.assert_array_equal(statistics.get_sizes().values, [4, 4])
+    for position, group in enumerate(statistics.keys):
+        model = GaussianCopula()
+        model.fit(data[groups == group].copy())
+        univariates = model.model.univariates
+        np.testing.assert_allclose(loc[position], [u._params['loc'] for u in univariates])
+        np.testing.assert_allclose(scale[position], [u._params['scale'] for u in univariates])
+        expected = model.model.covariance[np.tril_indices(3)]
+        np.testing.assert_allclose(correlation[position], expected, atol=1e-12)
+
+
+def test_get_gaussian_parameters_impute():
+    """Missing blocks are imputed with the given values."""
+    # Setup
+    values = np.array([
+        [1.0, 2.0, 5.0],
+        [2.0, np.nan, np.nan],
+        [4.0, 3.0, 1.0],
+    ])
+    impute = np.array([0.0, 4.0, 6.0])
+
+    # Run
+    statistics = GroupedStatistics(['a', 'b', 'c'], [0, 1, 1], [2.0, 2.0, 2.0])
+    statistics.add(values)
+    loc, scale, correlation = statistics.get_gaussian_parameters(impute)
+
+    # Assert
+    imputed = np.where(np.isnan(values), impute, values)
+    np.testing.assert_allclose(loc[0], imputed.mean(axis=0))
+    np.testing.assert_allclose(scale[0], imputed.std(axis=0))
+    expected = np.corrcoef(imputed, rowvar=False)[np.tril_indices(3)]
+    np.testing.assert_allclose(correlation[0], expected)
+    np.testing.assert_allclose(statistics.get_means()[0], [7 / 3, 2.5, 3.0])
@@ -0,0 +1,214 @@
+"""Tests for the sdv.tabular.base module."""
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdv.tabular.base import BaseTabularModel
+
+
+class RangeModel(BaseTabularModel):
+    """Model that samples consecutive integers."""
+
+    def _fit(self, table_data):
+        pass
+
+    def _sample(self, num_rows, random_state=None):
+        return pd.DataFrame({'a': np.arange(num_rows)})
+
+
+def _get_model(filter_valid=None):
+    model = RangeModel()
+    model._num_rows = 10
+    model._metadata = Mock()
+    model._metadata.get_fields.return_value = {'a': {'type': 'numerical'}}
+    model._metadata.reverse_transform.side_effect = lambda data, field_names=None: data
+    model._metadata.filter_valid.side_effect = filter_valid or (lambda data: data)
+    return model
+
+
+def test__sample_valid_adapts_to_acceptance_rate():
+    """Resample the missing rows at the observed acceptance rate, validating only new rows."""
+    # Setup
+    validated = list()
+
+    def filter_valid(data):
+        validated.append(len(data))
+        return data[data.a % 4 == 0]
+
+    model = _get_model(filter_valid)
+
+    # Run
+    sampled = model._sample_valid(100, 100, None)
+
+    # Assert
+    assert len(sampled) == 100
+    assert validated == [100, 330]
+    assert model.get_sampling_stats() == {
+        'num_rows': 100,
+        'num_sampled': 430,
+        'num_valid': 108,
+        'acceptance_rate': 108 / 430,
+        'batches': [(100, 25), (330, 83)],
+    }
+
+
+def test__sample_valid_no_valid_rows():
+    """Raise a ``ValueError`` after ``max_retries`` batches without valid rows."""
+    # Setup
+    model = _get_model(lambda data: data.head(0))
+
+    # Run
+    with pytest.raises(ValueError):
+        model._sample_valid(10, 3, None)
+
+    # Assert
+    assert model._metadata.filter_valid.call_count == 3
+
+
+def test__sample_valid_caps_batch_rows():
+    """Size the batches after a batch without valid rows up to ``MAX_BATCH_ROWS_FACTOR``."""
+    # Setup
+    model = _get_model(lambda data: data.head(0))
+
+    # Run
+    with pytest.raises(ValueError):
+        model._sample_valid(10, 3, None)
+
+    # Assert
+    sampled_rows = [
+        call[0][0].shape[0]
+        for call in model._metadata.filter_valid.call_args_list
+    ]
+    assert sampled_rows == [10, 100, 100]
+
+
+def test_sample_iter():
+    """Yield validated batches of at most ``batch_size`` rows, indexed by position."""
+    # Setup
+    model = _get_model(lambda data: data[data.a % 2 == 0])
+
+    # Run
+    batches = list(model.sample_iter(25, batch_size=10))
+
+    # Assert
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert pd.concat(batches).index.tolist() == list(range(25))
+    sampled_rows = [
+        call[0][0].shape[0]
+        for call in model._metadata.filter_valid.call_args_list
+    ]
+    assert max(sampled_rows) == 10
+
+
+def test_sample_iter_ids():
+    """Number the id fields across all the batches."""
+    # Setup
+    model = _get_model()
+    model._metadata.get_fields.return_value = {'a': {'type': 'id'}}
+    model._metadata.get_dtypes.return_value = {'a': 'int'}
+
+    # Run
+    batches = list(model.sample_iter(10, batch_size=4))
+
+    # Assert
+    assert pd.concat(batches)['a'].tolist() == list(range(10))
+
+
+def test_sample_iter_default_batch_size():
+    """Use the ``SAMPLE_BATCH_SIZE`` of the instance if ``batch_size`` is not given."""
+    # Setup
+    model = _get_model()
+    model.SAMPLE_BATCH_SIZE = 4
+
+    # Run
+    batches = list(model.sample_iter(10))
+
+    # Assert
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+def test_sample_output_file_path(tmp_path):
+    """Write the sampled rows to a CSV file in batches and return its path."""
+    # Setup
+    model = _get_model()
+    model.SAMPLE_BATCH_SIZE = 4
+    path = str(tmp_path / 'sampled.csv')
+
+    # Run
+    output = model.sample(10, output_file_path=path)
+
+    # Assert
+    assert output == path
+    assert model._metadata.filter_valid.call_count == 3
+    expected = pd.DataFrame({'a': [0, 1, 2, 3, 0, 1, 2, 3, 0, 1]})
+    pd.testing.assert_frame_equal(pd.read_csv(path), expected)
+
+
+def test_sample_conditions_reject_sampling():
+    """Reject the rows that do not match the conditions if the model cannot condition."""
+    # Setup
+    model = _get_model()
+    model._metadata.get_fields.return_value = {'a': {'type': 'numerical'}}
+
+    # Run
+    sampled = model.sample(5, conditions={'a': 3})
+
+    # Assert
+    assert len(sampled) == 5
+    assert (sampled['a'] == 3).all()
+
+
+def test_sample_conditions_conditional_model():
+    """Sample from the conditioned model, restoring the exact values of the conditions."""
+    # Setup
+    model = _get_model()
+    model._metadata.get_fields.return_value = {'a': {'type': 'numerical'}}
+    model._metadata.transform_conditions.return_value = {'a': 0.5}
+    model._sample = Mock()
+    model._sample_conditions = Mock(return_value=pd.DataFrame({'a': [0.49] * 3}))
+
+    # Run
+    sampled = model.sample(3, conditions={'a': 1})
+
+    # Assert
+    model._sample.assert_not_called()
+    model._sample_conditions.assert_called_once_with(3, {'a': 0.5}, None)
+    assert sampled['a'].tolist() == [1, 1, 1]
+
+
+def test_sample_conditions_unknown_field():
+    """Raise a ``ValueError`` if the conditions contain unknown fields."""
+    # Setup
+    model = _get_model()
+    model._metadata.get_fields.return_value = {'a': {'type': 'numerical'}}
+
+    # Run
+    with pytest.raises(ValueError):
+        model.sample(3, conditions={'b': 1})
+
+
+def test_sample_columns():
+    """Sample and reverse transform only the fields needed for the given columns."""
+    # Setup
+    model = _get_model()
+    model._metadata.get_fields.return_value = {
+        'a': {'type': 'numerical'},
+        'b': {'type': 'numerical'},
+    }
+    model._metadata.get_required_fields.return_value = ['a']
+    model._metadata.reverse_transform.side_effect = lambda data, field_names: data
+    model._sample = Mock()
+    model._sample_fields = Mock(return_value=pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]}))
+
+    # Run
+    sampled = model.sample(3, columns=['a'])
+
+    # Assert
+    model._sample.assert_not_called()
+    model._metadata.get_required_fields.assert_called_once_with({'a'})
+    model._sample_fields.assert_called_once_with(3, ['a'], None)
+    model._metadata.reverse_transform.assert_called_once_with(
+        model._sample_fields.return_value, ['a'])
+    assert list(sampled.columns) == ['a']
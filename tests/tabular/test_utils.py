@@ -1,13 +1,15 @@
 """Tests for the sdv.models.utils module."""
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import numpy as np
 import pandas as pd
 import pytest
+from scipy import stats
 
 from sdv.tabular.utils import (
     _key_order, check_matrix_symmetric_positive_definite, flatten_array, flatten_dict, impute,
-    make_positive_definite, square_matrix, unflatten_dict)
+    make_positive_definite, sample_conditional_multivariate, sample_multivariate, square_matrix,
+    unflatten_dict)
 
 
 def test_flatten_array_default():
@@ -219,3 +221,48 @@ def test_unflatten_dict():
         'tar': 'tar value',
     }
     assert result == expected
+
+
+def test_sample_conditional_multivariate():
+    """Sample the free columns from the conditional normal and keep the fixed values."""
+    # Setup
+    univariate = Mock(cdf=stats.norm.cdf, percent_point=stats.norm.ppf)
+    model = Mock(
+        columns=['a', 'b', 'c'],
+        univariates=[univariate, univariate, univariate],
+        covariance=[[1, 0.8, 0.3], [0.8, 1, 0.1], [0.3, 0.1, 1]]
+    )
+
+    # Run
+    sampled = sample_conditional_multivariate(model, 100000, {'b': 1.0}, 0)
+
+    # Assert
+    assert list(sampled.columns) == ['a', 'b', 'c']
+    assert (sampled['b'] == 1.0).all()
+    np.testing.assert_allclose(sampled['a'].mean(), 0.8, atol=0.01)
+    np.testing.assert_allclose(sampled['a'].var(), 0.36, atol=0.01)
+    np.testing.assert_allclose(sampled['c'].mean(), 0.1, atol=0.01)
+
+
+def test_sample_multivariate_columns():
+    """Draw the latent normals of all the columns but convert only the given ones."""
+    # Setup
+    univariate = Mock(cdf=stats.norm.cdf, percent_point=stats.norm.ppf)
+    unused = Mock()
+    model = Mock(
+        columns=['a', 'b', 'c'],
+        univariates=[univariate, unused, univariate],
+        covariance=[[1, 0.5, 0.5], [0.5, 1, 0.5], [0.5, 0.5, 1]]
+    )
+
+    # Run
+    sampled = sample_multivariate(model, 10, 0, {'a', 'c'})
+    expected = sample_multivariate(Mock(
+        columns=['a', 'b', 'c'],
+        univariates=[univariate, univariate, univariate],
+        covariance=model.covariance
+    ), 10, 0)
+
+    # Assert
+    unused.percent_point.assert_not_called()
+    pd.testing.assert_frame_equal(sampled, expected[['a', 'c']])
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+import pytest
+
+from sdv.cli import main
+
+
+@patch('sdv.SDV')
+def test_sample(sdv_mock):
+    """The sample command streams the dataset to disk with the given options."""
+    # Run
+    main(['sample', 'model.pkl', '--out', 'output', '--rows', '100', '--chunk-size', '50',
+          '--format', 'csv', '--jobs', '2'])
+
+    # Assert
+    sdv_mock.load.assert_called_once_with('model.pkl')
+    sdv_mock.load.return_value.sample_to.assert_called_once_with(
+        'output', 100, format='csv', chunk_size=50, random_state=None, n_jobs=2)
+
+
+@patch('sdv.SDV')
+def test_sample_jobs_chunk_size(sdv_mock):
+    """With jobs and no chunk size, each chunk has several random blocks per process."""
+    # Run
+    main(['sample', 'model.pkl', '--out', 'output', '--jobs', '2'])
+
+    # Assert
+    sdv_mock.load.return_value.sample_to.assert_called_once_with(
+        'output', None, format='parquet', chunk_size=8000, random_state=None, n_jobs=2)
+
+
+@patch('sdv.SDV')
+@patch('sdv.Metadata')
+def test_fit(metadata_mock, sdv_mock):
+    """The fit command fits an SDV instance to the tables of the metadata and saves it."""
+    # Run
+    main(['fit', 'metadata.json', '-o', 'model', '--model-format', 'compact', '--jobs', '2'])
+
+    # Assert
+    metadata = metadata_mock.return_value
+    metadata_mock.assert_called_once_with('metadata.json', None)
+    sdv = sdv_mock.return_value
+    sdv.fit.assert_called_once_with(metadata, metadata.load_tables.return_value, n_jobs=2)
+    sdv.save.assert_called_once_with('model', format='compact')
+
+
+def test_serve_invalid_model():
+    """The models to serve must be given as name=path."""
+    with pytest.raises(SystemExit):
+        main(['serve', 'model.pkl'])
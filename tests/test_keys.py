@@ -0,0 +1,76 @@
+import itertools
+import pickle
+
+import exrex
+import numpy as np
+import pytest
+
+from sdv.keys import (
+    ExrexKeyGenerator, IntegerKeyGenerator, RegexKeyGenerator, get_string_key_generator)
+
+
+def test_integer_key_generator():
+    """Check that the integers continue from the previous call."""
+    generator = IntegerKeyGenerator()
+
+    np.testing.assert_array_equal(generator.generate(3), [0, 1, 2])
+    np.testing.assert_array_equal(generator.generate(2), [3, 4])
+
+
+def _count_regex(regex, max_count=10000):
+    """Count the distinct strings generated by ``exrex``.
+
+    ``exrex.count`` undercounts some regexes with optional groups, so the strings are
+    enumerated instead unless there are more than ``max_count`` of them.
+    """
+    values = set(itertools.islice(exrex.generate(regex), max_count + 1))
+    if len(values) <= max_count:
+        return len(values)
+
+    return exrex.count(regex)
+
+
+@pytest.mark.parametrize('regex', [
+    r'^[a-zA-Z]+$',
+    r'ID_[0-9]{3}',
+    r'\d{2}[A-C]?',
+    r'[ab]{1,2}x[cd]',
+    r'x[ab]?y{2}[cd]{0,2}z',
+    r'.{2}',
+])
+def test_regex_key_generator(regex):
+    """Check that the keys and their count match ``exrex``."""
+    generator = RegexKeyGenerator(regex)
+    count = _count_regex(regex)
+    num_rows = min(count, 2000)
+
+    first = num_rows // 3
+    values = list(generator.generate(first)) + list(generator.generate(num_rows - first))
+
+    assert generator.count == count
+    assert values == list(itertools.islice(exrex.generate(regex), num_rows))
+
+
+def test_regex_key_generator_empty():
+    """Check that no rows can be generated."""
+    generator = RegexKeyGenerator(r'[a-z]{3}')
+
+    assert len(generator.generate(0)) == 0
+
+
+def test_regex_key_generator_unsupported():
+    """Check that alternatives are not supported."""
+    with pytest.raises(ValueError):
+        RegexKeyGenerator(r'(a|b)c')
+
+
+def test_get_string_key_generator_fallback():
+    """Check that exrex is used for unsupported regular expressions."""
+    generator = get_string_key_generator(r'(a|b)[cd]')
+    generator.generate(1)
+
+    generator = pickle.loads(pickle.dumps(generator))
+
+    assert isinstance(generator, ExrexKeyGenerator)
+    assert generator.count == 4
+    assert list(generator.generate(3)) == ['ad', 'bc', 'bd']
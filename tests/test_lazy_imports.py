@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+import pytest
+
+IMPORT_TIME_BUDGET = 0.5
+
+TIME_IMPORT = '''
+import time
+
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+'''
+
+CHECK_IMPORT = '''
+import sys
+
+{statement}
+
+heavy = [
+    name for name in {heavy!r}
+    if name in sys.modules
+]
+print(','.join(heavy))
+'''
+
+
+def _run_import(statement, heavy):
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHECK_IMPORT.format(statement=statement, heavy=heavy)])
+    return output.decode().strip()
+
+
+def _time_import(statement, runs=3):
+    """Best time of importing in a fresh interpreter, to ignore the noise of a busy machine."""
+    times = list()
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-c', TIME_IMPORT.format(statement=statement)])
+        times.append(float(output.decode()))
+
+    return min(times)
+
+
+def test_import_sdv():
+    """``import sdv`` does not import any heavy dependency."""
+    heavy = ['numpy', 'pandas', 'copulas', 'rdt', 'faker', 'graphviz', 'sdmetrics']
+    imported = _run_import('import sdv', heavy)
+
+    assert imported == ''
+
+
+def test_import_sdv_time():
+    """``import sdv`` stays within ``IMPORT_TIME_BUDGET`` seconds."""
+    elapsed = _time_import('import sdv')
+
+    assert elapsed < IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize('statement', [
+    'from sdv import SDV',
+    'from sdv import Metadata',
+    'from sdv.tabular import GaussianCopula',
+])
+def test_import_does_not_load_optional_modules(statement):
+    """The entry points do not import the modules needed only by plots and reports."""
+    imported = _run_import(statement, ['graphviz', 'sdmetrics', 'ctgan', 'torch'])
+
+    assert imported == ''
+
+
+def test_lazy_symbols():
+    import sdv
+    from sdv.sdv import SDV
+
+    assert sdv.SDV is SDV
+    assert set(sdv.__all__) <= set(dir(sdv))
+
+    with pytest.raises(AttributeError):
+        sdv.missing
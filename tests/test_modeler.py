@@ -1,14 +1,25 @@
+import multiprocessing
 from unittest import TestCase
-from unittest.mock import Mock, call
+from unittest.mock import MagicMock, Mock, call, patch
 
+import numpy as np
 import pandas as pd
+import pytest
 
+from sdv.demo import load_demo
 from sdv.metadata import Metadata
 from sdv.modeler import Modeler
 from sdv.models.base import SDVModel
 from sdv.models.copulas import GaussianCopula
 
 
+class LoopCopula(GaussianCopula):
+    """GaussianCopula that is fitted one foreign key value at a time."""
+
+    def is_gaussian(self):
+        return False
+
+
 class TestModeler(TestCase):
 
     def test___init__default(self):
@@ -33,6 +44,20 @@ class TestModeler(TestCase):
         assert modeler.model == model
         assert modeler.model_kwargs == {'some': 'kwargs'}
 
+    def test___init__incremental_not_gaussian(self):
+        """Incremental modeling is only supported for GaussianUnivariate marginals."""
+        with pytest.raises(ValueError):
+            Modeler('test', model=LoopCopula, incremental=True)
+
+    def test_update_not_incremental(self):
+        """Modelers that do not keep their statistics cannot be updated."""
+        # Setup
+        modeler = Modeler('test')
+
+        # Run
+        with pytest.raises(ValueError):
+            modeler.update({'test': pd.DataFrame()})
+
     def test__get_extensions(self):
         """Test get list of extensions from childs"""
         # Setup
@@ -48,6 +73,8 @@ class TestModeler(TestCase):
         modeler.model = model
         modeler.model_kwargs = dict()
         modeler.metadata = Mock(spec=Metadata)
+        modeler._get_num_processes.return_value = 1
+        modeler._fits_grouped.return_value = False
 
         # Run
         child_table = pd.DataFrame({'foo': ['aaa', 'bbb', 'ccc']})
@@ -61,6 +88,70 @@ class TestModeler(TestCase):
         pd.testing.assert_frame_equal(result, expected)
         assert model.get_parameters.call_count == 3
 
+    def test__get_extension_grouped(self):
+        """Test the extension is fitted in a single pass for gaussian copulas."""
+        # Setup
+        modeler = Modeler(Mock(spec=Metadata))
+        modeler.metadata.get_primary_key.return_value = 'child_id'
+
+        # Run
+        child_table = pd.DataFrame({
+            'child_id': [0, 1, 2, 3],
+            'parent_id': ['b', 'a', 'b', 'a'],
+            'value': [1.0, 2.0, 3.0, 5.0],
+        })
+        result = modeler._get_extension('child', child_table, 'parent_id')
+
+        # Asserts
+        expected = pd.DataFrame({
+            '__child__covariance__0__0': [1.0, 1.0],
+            '__child__univariates__value__loc': [2.0, 3.5],
+            '__child__univariates__value__scale': [0.0, np.log(1.5)],
+            '__child__child_rows': [2, 2],
+        }, index=['b', 'a'])
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test__get_extension_n_jobs(self):
+        """Test the extension fitted in a process pool keeps the foreign key order."""
+        # Setup
+        modeler = Modeler(Mock(spec=Metadata), LoopCopula, n_jobs=2)
+        modeler.metadata.get_primary_key.return_value = 'child_id'
+        child_table = pd.DataFrame({
+            'child_id': range(12),
+            'parent_id': [3, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2, 4],
+            'value': [1.0, 2.0, 3.0, 5.0, 4.0, 1.5, 2.5, 3.5, 4.0, 1.0, 7.0, 9.0],
+        })
+
+        # Run
+        result = modeler._get_extension('child', child_table, 'parent_id')
+
+        # Asserts
+        modeler.n_jobs = None
+        expected = modeler._get_extension('child', child_table, 'parent_id')
+        assert list(result.index) == [3, 1, 2, 0, 4]
+        pd.testing.assert_frame_equal(result, expected)
+        assert list(result['__child__child_rows']) == [3, 3, 3, 2, 1]
+
+    def test__extend_table(self):
+        """The extensions are aligned to the table and the missing child rows are 0."""
+        # Setup
+        extended = pd.DataFrame({'a': [1.0, 2.0, 3.0]}, index=pd.Index([10, 11, 12], name='id'))
+        extension = pd.DataFrame({
+            '__child__value': [5.0, 6.0],
+            '__child__child_rows': [2.0, 1.0],
+        }, index=[12, 10])
+
+        # Run
+        result = Modeler._extend_table(extended, [('child', extension)])
+
+        # Asserts
+        expected = pd.DataFrame({
+            'a': [1.0, 2.0, 3.0],
+            '__child__value': [6.0, np.nan, 5.0],
+            '__child__child_rows': [1.0, 0.0, 2.0],
+        }, index=pd.Index([10, 11, 12], name='id'))
+        pd.testing.assert_frame_equal(result, expected)
+
     def test_cpa_with_tables_no_primary_key(self):
         """Test CPA with tables and no primary key."""
         # Setup
@@ -70,6 +161,9 @@ class TestModeler(TestCase):
         modeler.model_kwargs = dict()
         modeler.models = dict()
         modeler.table_sizes = {'data': 5}
+        modeler.incremental = False
+        modeler.low_memory = False
+        modeler._track_memory.return_value = MagicMock()
         modeler.metadata.transform.return_value = pd.DataFrame({'data': [1, 2, 3]})
         modeler.metadata.get_primary_key.return_value = None
 
@@ -103,6 +197,7 @@ class TestModeler(TestCase):
         modeler.metadata.get_parents.side_effect = metadata_parents
         modeler.rcpa.side_effect = rcpa_side_effect
         modeler.models = dict()
+        modeler._get_num_processes.return_value = 1
 
         # Run
         Modeler.model_database(modeler)
@@ -112,3 +207,23 @@ class TestModeler(TestCase):
         expected_metadata_parents_call = [call('foo'), call('bar'), call('tar')]
         assert modeler.metadata.get_parents.call_count == expected_metadata_parents_call_count
         assert modeler.metadata.get_parents.call_args_list == expected_metadata_parents_call
+
+    @patch('sdv.modeler.get_pool_context')
+    def test_model_database_n_jobs_shared_pool(self, get_pool_context_mock):
+        """The threads share one pool, so there are never more than n_jobs processes."""
+        # Setup
+        get_pool_context_mock.return_value.Pool.side_effect = multiprocessing.get_context().Pool
+        metadata, tables = load_demo(metadata=True)
+        modeler = Modeler(metadata, LoopCopula, n_jobs=2)
+
+        # Run
+        modeler.model_database(tables)
+
+        # Asserts
+        processes = [
+            pool_call[0][0]
+            for pool_call in get_pool_context_mock.return_value.Pool.call_args_list
+        ]
+        assert processes == [2]
+        assert modeler._pool is None
+        assert set(modeler.models) == {'users', 'sessions', 'transactions'}
@@ -1,4 +1,4 @@
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 
 import numpy as np
 import pandas as pd
@@ -6,6 +6,7 @@ import pytest
 
 from sdv.metadata import Metadata
 from sdv.models.base import SDVModel
+from sdv.models.copulas import GaussianCopula
 from sdv.sampler import Sampler
 
 
@@ -166,19 +167,65 @@ class TestSampler:
         with pytest.raises(ValueError):
             Sampler._get_primary_keys(sampler, 'test', 5)
 
+    def test__get_primary_keys_string(self):
+        """Test that consecutive calls continue the sequence of the regex."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.metadata = Mock(spec=Metadata)
+        sampler.metadata.get_primary_key.return_value = 'pk_field'
+        sampler.metadata.get_fields.return_value = {
+            'pk_field': {
+                'type': 'id',
+                'subtype': 'string',
+                'regex': 'ID_[0-9]{2}'
+            }
+        }
+        sampler.primary_key = dict()
+        sampler.remaining_primary_key = dict()
+
+        # Run
+        first = Sampler._get_primary_keys(sampler, 'test', 2)
+        second = Sampler._get_primary_keys(sampler, 'test', 3)
+
+        # Asserts
+        assert first[0] == 'pk_field'
+        assert list(first[1]) == ['ID_00', 'ID_01']
+        assert list(second[1]) == ['ID_02', 'ID_03', 'ID_04']
+        assert sampler.remaining_primary_key == {'test': 95}
+
     def test__extract_parameters(self):
         """Test extract parameters"""
         # Setup
         sampler = Mock(spec=Sampler)
 
         # Run
-        parent_row = pd.Series([[0, 1], [1, 0]], index=['__foo__field', '__foo__field2'])
+        parent_row = pd.Series([1, 0.5, 2], index=['id', '__foo__field', '__foo__field2'])
         table_name = 'foo'
-        result = Sampler._extract_parameters(sampler, parent_row, table_name)
+        names, values = Sampler._extract_parameters(sampler, parent_row, table_name)
+
+        # Asserts
+        assert names == ('field', 'field2')
+        np.testing.assert_array_equal(values, [0.5, 2.0])
+
+    def test__get_extension_parameters(self):
+        """Only the extension columns of the child are selected and renamed."""
+        # Setup
+        parent_rows = pd.DataFrame({
+            'id': [0, 1],
+            '__foo__field': [0.5, 1.5],
+            '__bar__field': [2.5, 3.5],
+            '__foo__field2': [4.5, 5.5],
+        })
+
+        # Run
+        result = Sampler._get_extension_parameters(parent_rows, 'foo')
 
         # Asserts
-        expected = {'field': [0, 1], 'field2': [1, 0]}
-        assert result == expected
+        expected = pd.DataFrame({
+            'field': [0.5, 1.5],
+            'field2': [4.5, 5.5],
+        })
+        pd.testing.assert_frame_equal(result, expected)
 
     def test__sample_rows(self):
         """Test sample rows from model"""
@@ -203,6 +250,7 @@ class TestSampler:
         # Setup
         sampler = Mock(spec=Sampler)
         sampler.metadata.get_children.return_value = ['child A', 'child B', 'child C']
+        sampler._get_grouped_model.return_value = None
 
         # Run
         sampled_data = {
@@ -231,6 +279,42 @@ class TestSampler:
             assert result_call[0][3] == expected_call[3]
             pd.testing.assert_series_equal(result_call[0][2], expected_call[2])
 
+    def test__sample_grouped_child_rows(self):
+        """The child rows of all the parents are sampled at once."""
+        # Setup
+        model = Mock()
+        model.sample_grouped.return_value = pd.DataFrame({'value': [1, 2, 3]})
+
+        sampler = Mock(spec=Sampler)
+        sampler._get_primary_keys.return_value = ('child_id', pd.Series([10, 11, 12]))
+        sampler._get_extension_parameters = Sampler._get_extension_parameters
+        sampler.metadata.get_primary_key.return_value = 'id'
+        sampler.metadata.get_foreign_key.return_value = 'parent_id'
+
+        parent_rows = pd.DataFrame({
+            'id': [0, 1, 2],
+            '__test__univariates__value__loc': [1.0, 2.0, 3.0],
+            '__test__child_rows': [1.4, -1.0, 1.6],
+        })
+
+        # Run
+        sampled = {'test': pd.DataFrame({'value': [0], 'child_id': [9], 'parent_id': [5]})}
+        Sampler._sample_grouped_child_rows(sampler, model, 'test', 'parent', parent_rows, sampled)
+
+        # Asserts
+        parameters, num_rows = model.sample_grouped.call_args[0]
+        assert list(parameters.columns) == ['univariates__value__loc', 'child_rows']
+        np.testing.assert_array_equal(num_rows, [1, 0, 2])
+        sampler._get_primary_keys.assert_called_once_with('test', 3)
+
+        expected_sampled = pd.DataFrame({
+            'value': [0, 1, 2, 3],
+            'child_id': [9, 10, 11, 12],
+            'parent_id': [5, 0, 2, 2],
+        })
+        pd.testing.assert_frame_equal(sampled['test'], expected_sampled)
+        assert sampler._sample_children.call_args[0][0] == 'test'
+
     def test__sample_child_rows_sampled_empty(self):
         """Test sample table when sampled is still an empty dict."""
         # Setup
@@ -240,8 +324,9 @@ class TestSampler:
         sampler = Mock(spec=Sampler)
         sampler.model = model
         sampler.model_kwargs = dict()
+        sampler._get_child_model.return_value = model
 
-        sampler._extract_parameters.return_value = {'child_rows': 5}
+        sampler._extract_parameters.return_value = (('child_rows', ), np.array([5.0]))
 
         table_model_mock = Mock()
         sampler.models = {'test': table_model_mock}
@@ -282,7 +367,8 @@ class TestSampler:
         sampler = Mock(spec=Sampler)
         sampler.model = model
         sampler.model_kwargs = dict()
-        sampler._extract_parameters.return_value = {'child_rows': 5}
+        sampler._get_child_model.return_value = model
+        sampler._extract_parameters.return_value = (('child_rows', ), np.array([5.0]))
 
         table_model_mock = Mock()
         sampler.models = {'test': table_model_mock}
@@ -324,7 +410,7 @@ class TestSampler:
     def test_sample_all(self):
         """Test sample all regenerating the primary keys"""
         # Setup
-        def sample_side_effect(table, num_rows):
+        def sample_side_effect(table, num_rows, random_state=None):
             return {table: pd.DataFrame({'foo': range(num_rows)})}
 
         sampler = Mock(spec=Sampler)
@@ -341,6 +427,87 @@ class TestSampler:
         pd.testing.assert_frame_equal(result['table a'], pd.DataFrame({'foo': range(3)}))
         pd.testing.assert_frame_equal(result['table c'], pd.DataFrame({'foo': range(3)}))
 
+    def test_sample_iter(self):
+        """Test sample_iter samples the tables without parents in chunks."""
+        # Setup
+        def sample_side_effect(table, num_rows):
+            return {table: pd.DataFrame({'foo': range(num_rows)})}
+
+        sampler = Mock(spec=Sampler)
+        sampler.metadata.get_tables.return_value = ['table a', 'table b', 'table c']
+        sampler.metadata.get_parents.side_effect = [False, True, False]
+        sampler.metadata.get_children.return_value = []
+        sampler.table_sizes = {'table a': 5, 'table c': 2}
+        sampler.sample.side_effect = sample_side_effect
+
+        # Run
+        result = list(Sampler.sample_iter(sampler, chunk_size=2, reset_primary_keys=True))
+
+        # Asserts
+        assert sampler._reset_primary_keys_generators.call_count == 1
+        assert [list(chunk) for chunk in result] == [['table a']] * 3 + [['table c']]
+        assert [len(chunk[table]) for chunk in result for table in chunk] == [2, 2, 1, 2]
+
+    def test__get_child_model(self):
+        """Test the models that are not gaussian copulas get the parameters as a dict."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.model = Mock()
+        sampler.model_kwargs = {'distribution': 'beta'}
+
+        # Run
+        model = Sampler._get_child_model(sampler, 'test', ('a', ), [1.0])
+
+        # Asserts
+        assert model is sampler.model.return_value
+        sampler.model.assert_called_once_with(distribution='beta')
+        model.set_parameters.assert_called_once_with({'a': 1.0})
+
+    def test__get_child_model_parameter_vector(self):
+        """Test the gaussian copula models get the parameters as an array."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.model = GaussianCopula
+        sampler.model_kwargs = dict()
+        names = ('covariance__0__0', 'univariates__a__loc', 'univariates__a__scale',
+                 'child_rows')
+
+        # Run
+        model = Sampler._get_child_model(sampler, 'test', names, [1.0, 2.0, 0.0, 3.0])
+
+        # Asserts
+        assert model.model.columns == ['a']
+        assert model.model.univariates[0]._params == {'loc': 2.0, 'scale': 1.0}
+
+    def test__map_keys(self):
+        """Test the key positions of a table and its children are replaced with keys."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.metadata.get_primary_key.return_value = 'id'
+        sampler.metadata.get_children.return_value = ['child', 'other']
+        sampler.metadata.get_foreign_key.return_value = 'parent_id'
+        sampled_data = {
+            'parent': pd.DataFrame({'id': [0, 1]}),
+            'child': pd.DataFrame({'parent_id': [1, 1, 0]}),
+        }
+
+        # Run
+        Sampler._map_keys(sampler, sampled_data, 'parent', np.array(['a', 'b']))
+
+        # Asserts
+        assert list(sampled_data['parent']['id']) == ['a', 'b']
+        assert list(sampled_data['child']['parent_id']) == ['b', 'b', 'a']
+
+    def test_sample_iter_random_state_invalid_chunk_size(self):
+        """Test sample_iter requires whole random blocks in each chunk."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.RANDOM_BLOCK_SIZE = 10
+
+        # Run
+        with pytest.raises(ValueError):
+            next(Sampler.sample_iter(sampler, chunk_size=15, random_state=0))
+
     @patch('sdv.sampler.np.random.choice')
     def test__find_parent_id_all_0(self, choice_mock):
         """If all likelihoods are 0, use num_rows."""
@@ -410,3 +577,26 @@ class TestSampler:
         assert choice_mock.call_count == 1
         assert list(choice_mock.call_args[0][0]) == list(likelihoods.index)
         np.testing.assert_array_equal(choice_mock.call_args[1]['p'], expected_weights)
+
+    def test_prefetch(self):
+        """Load the table, its descendants and the parents of all of them."""
+        # Setup
+        sampler = Mock(spec=Sampler)
+        sampler.metadata = Mock(spec=Metadata)
+        sampler.metadata.get_children.side_effect = lambda name: {
+            'users': {'sessions'},
+            'shops': {'sessions'},
+        }.get(name, set())
+        sampler.metadata.get_parents.side_effect = lambda name: {
+            'users': {'countries'},
+            'sessions': {'users', 'shops'},
+        }.get(name, set())
+        sampler.metadata._hyper_transformers = {'users': 'transformer'}
+        sampler.models = MagicMock()
+
+        # Run
+        Sampler.prefetch(sampler, 'users')
+
+        # Asserts
+        accessed = [call[0][0] for call in sampler.models.__getitem__.call_args_list]
+        assert accessed == ['countries', 'sessions', 'shops', 'users']
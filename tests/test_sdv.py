@@ -1,6 +1,7 @@
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
 
 from sdv.sdv import DEFAULT_MODEL, DEFAULT_MODEL_KWARGS, SDV, NotFittedError
@@ -20,6 +21,30 @@ class TestSDV(TestCase):
         output = open_mock.return_value.__enter__.return_value
         pickle_mock.dump.assert_called_once_with(sdv, output)
 
+    @patch('sdv.sdv.serialization')
+    def test_save_compact(self, serialization_mock):
+        # Setup
+        sdv = SDV()
+        sdv.sampler = Mock()
+
+        # Run
+        sdv.save('save/path', format='compact')
+
+        # Asserts
+        serialization_mock.save.assert_called_once_with(sdv, 'save/path')
+
+    def test_save_compact_not_fitted(self):
+        # Run
+        sdv = SDV()
+        with pytest.raises(NotFittedError):
+            sdv.save('save/path', format='compact')
+
+    def test_save_unknown_format(self):
+        # Run
+        sdv = SDV()
+        with pytest.raises(ValueError):
+            sdv.save('save/path', format='json')
+
     @patch('sdv.sdv.open')
     @patch('sdv.sdv.pickle')
     def test_load(self, pickle_mock, open_mock):
@@ -32,6 +57,19 @@ class TestSDV(TestCase):
         pickle_mock.load.assert_called_once_with(output)
         assert returned is pickle_mock.load.return_value
 
+    @patch('sdv.sdv.serialization')
+    def test_load_compact(self, serialization_mock):
+        # Setup
+        serialization_mock.is_compact.return_value = True
+
+        # Run
+        returned = SDV.load('save/path', mmap_mode=None)
+
+        # Asserts
+        serialization_mock.load.assert_called_once_with(
+            SDV, 'save/path', mmap_mode=None, lazy=False)
+        assert returned is serialization_mock.load.return_value
+
     def test____init__default(self):
         """Create default instance"""
         # Run
@@ -63,7 +101,7 @@ class TestSDV(TestCase):
         # Asserts
         assert result == 'test'
         sdv.sampler.sample.assert_called_once_with(
-            'DEMO', 5, sample_children=True, reset_primary_keys=False)
+            'DEMO', 5, sample_children=True, reset_primary_keys=False, random_state=None)
 
     def test_sample_not_fitted(self):
         """Check that the sample raise an exception when is not fitted."""
@@ -86,7 +124,8 @@ class TestSDV(TestCase):
 
         # Asserts
         assert result == 'test'
-        sdv.sampler.sample_all.assert_called_once_with(None, reset_primary_keys=False)
+        sdv.sampler.sample_all.assert_called_once_with(
+            None, reset_primary_keys=False, random_state=None, n_jobs=None)
 
     def test_sample_all_not_fitted(self):
         """Check that the sample_all raise an exception when is not fitted."""
@@ -97,3 +136,47 @@ class TestSDV(TestCase):
         # Run
         with pytest.raises(NotFittedError):
             SDV.sample_all(sdv)
+
+    def test_sample_iter_fitted(self):
+        """Check that the sample_iter is called"""
+        # Setup
+        sdv = Mock()
+        sdv.sampler.sample_iter.return_value = 'test'
+
+        # Run
+        result = SDV.sample_iter(sdv, 10, chunk_size=5)
+
+        # Asserts
+        assert result == 'test'
+        sdv.sampler.sample_iter.assert_called_once_with(
+            10, chunk_size=5, reset_primary_keys=False, random_state=None, n_jobs=None)
+
+    def test_sample_iter_not_fitted(self):
+        """Check that the sample_iter raise an exception when is not fitted."""
+        # Setup
+        sdv = Mock()
+        sdv.sampler = None
+
+        # Run
+        with pytest.raises(NotFittedError):
+            SDV.sample_iter(sdv)
+
+    def test_sample_to_not_fitted(self):
+        """Check that the sample_to raise an exception when is not fitted."""
+        # Setup
+        sdv = Mock()
+        sdv.sampler = None
+
+        # Run
+        with pytest.raises(NotFittedError):
+            SDV.sample_to(sdv, 'some/path')
+
+    def test_update_not_fitted(self):
+        """Check that the update raise an exception when is not fitted."""
+        # Setup
+        sdv = Mock()
+        sdv.sampler = None
+
+        # Run
+        with pytest.raises(NotFittedError):
+            SDV.update(sdv, {'DEMO': pd.DataFrame()})
@@ -0,0 +1,89 @@
+import json
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+from copulas.univariate import GaussianKDE, GaussianUnivariate
+
+from sdv.serialization import (
+    LazyDict, _decode, _decode_univariate, _encode, _encode_univariate, _import_class, is_compact)
+
+
+def test__import_class():
+    assert _import_class('copulas.univariate.GaussianUnivariate') is GaussianUnivariate
+    assert _import_class('builtins.int') is int
+
+
+def test__import_class_not_allowed():
+    with pytest.raises(ValueError):
+        _import_class('os.system')
+
+
+def test__encode__decode():
+    value = {
+        'int': np.int64(3),
+        'tuple': (1.5, 'a'),
+        'dtype': np.dtype('float64'),
+        'array': np.array([1, 2]),
+        'timestamp': pd.Timestamp('2020-01-01'),
+        'keys': {1: 'a', 'b': None},
+        '__private': GaussianUnivariate,
+    }
+
+    encoded = json.loads(json.dumps(_encode(value)))
+    decoded = _decode(encoded)
+
+    assert decoded['int'] == 3
+    assert decoded['tuple'] == (1.5, 'a')
+    assert decoded['dtype'] == np.dtype('float64')
+    np.testing.assert_array_equal(decoded['array'], np.array([1, 2]))
+    assert decoded['timestamp'] == pd.Timestamp('2020-01-01')
+    assert decoded['keys'] == {1: 'a', 'b': None}
+    assert decoded['__private'] is GaussianUnivariate
+
+
+def test__encode_unknown_type():
+    with pytest.raises(ValueError):
+        _encode(pd.DataFrame())
+
+
+@pytest.mark.parametrize('univariate_class', [GaussianUnivariate, GaussianKDE])
+def test__encode_univariate(univariate_class):
+    univariate = univariate_class()
+    univariate.fit(np.array([1., 2., 3., 5., 8.]))
+
+    values = list()
+    encoded = json.loads(json.dumps(_encode_univariate(univariate, values)))
+    decoded = _decode_univariate(encoded, np.array(values))
+
+    data = np.array([0., 2.5, 10.])
+    np.testing.assert_allclose(decoded.cdf(data), univariate.cdf(data))
+
+
+def test_is_compact(tmp_path):
+    pickle_path = tmp_path / 'model.pkl'
+    pickle_path.write_bytes(b'not a compact model')
+
+    assert not is_compact(str(pickle_path))
+    assert not is_compact(str(tmp_path))
+
+    (tmp_path / 'model.json').write_text('{}')
+    assert is_compact(str(tmp_path))
+
+
+def test_lazy_dict():
+    loader = Mock(return_value='value')
+    lazy_dict = LazyDict({'a': loader, 'b': Mock()})
+
+    assert len(lazy_dict) == 2
+    assert not lazy_dict.is_loaded('a')
+    assert lazy_dict['a'] == 'value'
+    assert lazy_dict['a'] == 'value'
+    assert lazy_dict.is_loaded('a')
+    loader.assert_called_once_with()
+
+    lazy_dict['c'] = 'other'
+    del lazy_dict['b']
+    assert set(lazy_dict) == {'a', 'c'}
+    assert lazy_dict.get('d') is None
@@ -0,0 +1,108 @@
+import threading
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from sdv.server import ModelServer, SamplingRequestHandler
+
+
+def _sample(num_rows, random_state=None):
+    return pd.DataFrame({'a': range(num_rows)})
+
+
+class TestModelServer:
+
+    def test_sample_batches_concurrent_requests(self):
+        """Concurrent small requests of the same table are sampled in one call."""
+        # Setup
+        model = Mock()
+        model.sample.side_effect = _sample
+        model_server = ModelServer({'model': model}, batch_wait=0.2)
+        results = dict()
+
+        def request(num_rows):
+            results[num_rows] = model_server.sample('model', num_rows=num_rows)
+
+        # Run
+        threads = [threading.Thread(target=request, args=(num_rows, )) for num_rows in (2, 3, 5)]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        # Asserts
+        model.sample.assert_called_once_with(10, random_state=None)
+        assert {num_rows: len(rows) for num_rows, rows in results.items()} == {2: 2, 3: 3, 5: 5}
+        values = pd.concat(results.values())['a']
+        assert sorted(values) == list(range(10))
+
+    def test_sample_max_batch_rows(self):
+        """Requests that do not fit in the pending batch are sampled on their own."""
+        # Setup
+        model = Mock()
+        model.sample.side_effect = _sample
+        model_server = ModelServer({'model': model}, batch_wait=0, max_batch_rows=5)
+
+        # Run
+        sampled = model_server.sample('model', num_rows=7)
+
+        # Asserts
+        assert len(sampled) == 7
+        model.sample.assert_called_once_with(7, random_state=None)
+
+    def test_sample_random_state(self):
+        """Requests with a random_state are not batched."""
+        # Setup
+        model = Mock()
+        model.sample.side_effect = _sample
+        model_server = ModelServer({'model': model}, batch_wait=10)
+
+        # Run
+        model_server.sample('model', num_rows=3, random_state=0)
+
+        # Asserts
+        model.sample.assert_called_once_with(3, random_state=0)
+
+    def test_sample_error(self):
+        """The errors of a batch are raised to all its requests."""
+        # Setup
+        model = Mock()
+        model.sample.side_effect = ValueError('invalid')
+        model_server = ModelServer({'model': model}, batch_wait=0)
+
+        # Run
+        with pytest.raises(ValueError):
+            model_server.sample('model', num_rows=3)
+
+    def test_sample_unknown_model(self):
+        """Unknown models raise a KeyError."""
+        model_server = ModelServer({})
+
+        with pytest.raises(KeyError):
+            model_server.sample('model', num_rows=3)
+
+    def test_sample_all_single_table(self):
+        """Only SDV models can sample all the tables."""
+        model_server = ModelServer({'model': Mock()})
+
+        with pytest.raises(ValueError):
+            model_server.sample_all('model')
+
+
+class TestSamplingRequestHandler:
+
+    def test_do_get_unexpected_error(self):
+        """Unexpected errors are returned as a 500 JSON error."""
+        # Setup
+        handler = Mock(spec=SamplingRequestHandler)
+        handler.path = '/models'
+        handler.server = Mock()
+        handler.server.model_server.describe.side_effect = RuntimeError('broken')
+
+        # Run
+        SamplingRequestHandler.do_GET(handler)
+
+        # Asserts
+        handler._send_json.assert_called_once_with(500, {'error': 'Internal error: broken'})
@@ -0,0 +1,31 @@
+from unittest.mock import Mock
+
+import pandas as pd
+import pytest
+
+from sdv.writers import CSVWriter, get_writer
+
+
+def test_get_writer_unknown_format():
+    """Check that get_writer raises an error for unknown formats."""
+    with pytest.raises(ValueError):
+        get_writer('xlsx', 'some/path', Mock())
+
+
+def test_csv_writer(tmp_path):
+    """Check that the rows are appended and that the missing tables are created."""
+    # Setup
+    metadata = Mock()
+    metadata.get_tables.return_value = ['a', 'b']
+    metadata.get_fields.return_value = {'foo': {}, 'bar': {}}
+    writer = CSVWriter(str(tmp_path), metadata)
+
+    # Run
+    writer.write('a', pd.DataFrame({'foo': [1, 2]}))
+    writer.write('a', pd.DataFrame({'foo': [3]}))
+    writer.close()
+
+    # Asserts
+    pd.testing.assert_frame_equal(
+        pd.read_csv(str(tmp_path / 'a.csv')), pd.DataFrame({'foo': [1, 2, 3]}))
+    assert list(pd.read_csv(str(tmp_path / 'b.csv')).columns) == ['foo', 'bar']